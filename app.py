@@ -6,11 +6,45 @@ Author: CSE Student | Version: 2.0.0 | Port: 2344
 
 import os
 import json
+import hashlib
 import logging
+import math
+import tempfile
+import time
+import click
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from functools import wraps
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Request, abort, render_template, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
+from engines.steps import OP_NAMES, Deadline, ExecutionTimeout, StepStream, run_steps
+from engines.sorting import SORTING_ALGORITHMS, run_sort
+from engines.searching import SEARCHING_ALGORITHMS, run_search
+from engines.registry import check_array, check_target, has_engine, build_run
+from engines.sandbox import (run_sandboxed, STATUS_OK, STATUS_INVALID, STATUS_TIMEOUT,
+                             STATUS_STEP_BUDGET, STATUS_MEMORY, STATUS_CRASHED)
+from engines.benchmark import BENCHMARKABLE, DISTRIBUTIONS, MAX_REPEATS, DEFAULT_REPEATS, run_benchmark
+from engines.pool import call_before, get_pool, shutdown_pool
+from engines.complexity import check_catalog
+from engines.cache import CachedResult, ResultCache, cache_key
+from engines.trace import TraceRecorder, TraceTooLarge, encode_trace
+from engines.allpairs import check_weighted_edges, floyd_warshall, benchmark_floyd_warshall, HAVE_NUMPY
+from engines.graph import build_csr, parse_json_edges, parse_binary_edges
+from engines.graph_algorithms import GRAPH_ALGORITHMS, graph_direction, run_graph, run_graph_batch
+from engines.flow import benchmark_flow
+from engines.mst import MST_ALGORITHMS, run_mst
+from engines.grid import GRID_ALGORITHMS, BATCH_ALGORITHMS, Grid, run_grid_search, run_grid_batch
+from engines.automata import AutomatonCache, AutomatonScanner, AutomatonTooLarge
+from engines.textsearch import (LARGE_TEXT_ALGORITHMS, choose_matcher, scan_batches, spool_stream, spool_multipart,
+                                corpus_file)
+from engines.suffixarray import SuffixIndexStore, run_queries
+from engines.dp import DP_ALGORITHMS, check_dp_request, run_dp, benchmark_dp
+from engines.dp_tables import TABLE_PROBLEMS, DPTableStore, table_params
+from engines.bignum import (check_bignum_request, run_bignum, format_result, to_binary, to_decimal_string,
+                            parse_big_int)
+from engines.sieve import BasePrimeTable, count_primes, prime_batches
+from engines.factor import factor_numbers
 
 # ==================== CONFIGURATION ====================
 class Config:
@@ -21,6 +55,58 @@ class Config:
     SEND_FILE_MAX_AGE_DEFAULT = 31536000
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
     PERMANENT_SESSION_LIFETIME = 3600
+    CATALOG_CACHE_MAX_AGE = 3600
+    MAX_ARRAY_SIZE = 10000
+    MAX_GRID_SIZE = 2000
+    MAX_VISITED_CELLS = 250000  # visited cells listed per pathfinding response
+    MAX_BATCH_QUERIES = 10000
+    MAX_APSP_VERTICES = 1000
+    MAX_APSP_PYTHON_VERTICES = 300  # pure-Python backend is O(V^3) interpreted steps
+    MAX_GRAPH_VERTICES = 1000000
+    MAX_GRAPH_EDGES = 2000000
+    MST_PARALLEL_MIN_EDGES = 200000
+    ALGORITHM_TIMEOUT = 30000  # milliseconds
+    MAX_TRACE_STEPS = 5000000
+    MAX_STREAM_BATCH = 4096
+
+    COMPARE_WORKERS = None  # defaults to the CPU count
+    COMPARE_GRACE_MS = 1000  # past ALGORITHM_TIMEOUT, for results still being sent back
+    SANDBOX_MAX_STEPS = 100000000
+    SANDBOX_MAX_MEMORY_MB = 512
+    SANDBOX_GRACE_MS = 2000
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    RESULT_CACHE_PATH = os.getenv('RESULT_CACHE_PATH')  # SQLite file shared by workers
+    AUTOMATON_CACHE_MAX_BYTES = 128 * 1024 * 1024
+    MAX_PATTERNS = 100000
+    SCAN_CHUNK_BYTES = 64 * 1024
+    MAX_SPOOL_BYTES = 8 * 1024 * 1024 * 1024  # uploads spooled to disk, not memory
+    LARGE_TEXT_TIMEOUT = 50000  # milliseconds; below gunicorn's --timeout 60 (Procfile)
+    CORPUS_DIR = os.getenv('CORPUS_DIR')  # server-side texts searchable by relative name
+    SUFFIX_INDEX_DIR = os.getenv('SUFFIX_INDEX_DIR',
+                                 os.path.join(tempfile.gettempdir(), 'playground-suffix-index'))
+    MAX_SUFFIX_INDEX_BYTES = 8 * 1024 * 1024
+    MAX_QUERY_RESULTS = 10000
+    MAX_DP_LENGTH = 50000  # characters per lcs / edit_distance string
+    MAX_DP_CAPACITY = 10000000  # knapsack capacity / coin_change amount
+    MAX_DP_ITEMS = 10000
+    MAX_EXACT_FIB_N = 1000000  # stored big-int Fibonacci tables
+    DP_TABLE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    DP_TABLE_CACHE_PATH = os.getenv('DP_TABLE_CACHE_PATH')  # SQLite file shared by workers
+    MAX_FIB_N = 10000000  # fast-doubling Fibonacci (about 2.1 million digits)
+    MAX_BIGNUM_BITS = 16 * 1024 * 1024  # modulus-free powers
+    MAX_BIGNUM_INPUT_CHARS = 100000
+    MAX_MODPOW_COST = 2 ** 40  # modulus_bits**2 * exponent_bits; about 5 s of pow()
+    MAX_DECIMAL_DIGITS = 250000  # full decimal output; larger results use hex / head_tail / binary
+    MAX_SIEVE_LIMIT = 10000000000  # largest hi for prime_sieve ranges
+    MAX_SIEVE_SAMPLE = 10000  # primes listed with a count
+    SIEVE_TIMEOUT = 50000  # milliseconds; below gunicorn's --timeout 60 (Procfile)
+    MAX_SIEVE_SPAN_PER_WORKER = 2000000000  # one worker sieves 1e8 numbers in ~0.4-1.25 s
+    MAX_FACTOR_DIGITS = 60
+    MAX_FACTOR_BATCH = 1000
+
+    # Feature Flags
+    ENABLE_BENCHMARKING = True
+    ENABLE_COMPARISONS = True
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -49,7 +135,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ==================== FLASK APP INITIALIZATION ====================
+# Endpoints that spool their body to disk instead of reading it into memory
+SPOOLED_ENDPOINTS = {'search_large_text'}
+
+class PlaygroundRequest(Request):
+    """Request that lifts the body limit to MAX_SPOOL_BYTES for raw or file uploads to spooled endpoints.
+
+    JSON bodies keep MAX_CONTENT_LENGTH, since they are parsed in memory;
+    multipart fields other than the file are capped separately when parsed.
+    """
+
+    @property
+    def max_content_length(self):
+        if self.endpoint in SPOOLED_ENDPOINTS and not self.is_json:
+            return app.config['MAX_SPOOL_BYTES']
+        return super().max_content_length
+
 app = Flask(__name__, template_folder='templates')
+app.request_class = PlaygroundRequest
 
 # Set configuration
 env = os.getenv('FLASK_ENV', 'development')
@@ -62,7 +165,7 @@ else:
 CORS(app, resources={
     r"/api/*": {
         "origins": "*",
-        "methods": ["GET", "POST", "OPTIONS"],
+        "methods": ["GET", "POST", "DELETE", "OPTIONS"],
         "allow_headers": ["Content-Type"]
     }
 })
@@ -968,8 +1071,37 @@ ALGORITHMS_DATABASE = {
     }
 }
 
+# ==================== CATALOG RESPONSE CACHE ====================
+# The catalog is static, so each view is serialized once (on first hit) and
+# kept as immutable bytes plus a strong ETag derived from those bytes.
+_catalog_cache = {}
+
+def catalog_response(key, payload):
+    """Serve a catalog view from its pre-serialized bytes with ETag/304 support"""
+    cached = _catalog_cache.get(key)
+    if cached is None:
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        cached = (body, hashlib.sha256(body).hexdigest()[:32])
+        _catalog_cache[key] = cached
+    body, etag = cached
+
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['CATALOG_CACHE_MAX_AGE']
+    return response.make_conditional(request)
+
 # ==================== ROUTES ====================
 
+def request_object():
+    """The JSON request body as a dict ({} when absent or unparsable); any other JSON value is a 400"""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        abort(400, description='The request body must be a JSON object')
+    return data
+
 @app.route('/', methods=['GET'])
 def index():
     """Serve the main SPA"""
@@ -1006,13 +1138,13 @@ def app_info():
 @app.route('/api/algorithms', methods=['GET'])
 def get_all_algorithms():
     """Get all algorithm metadata"""
-    return jsonify(ALGORITHMS_DATABASE)
+    return catalog_response(('all',), ALGORITHMS_DATABASE)
 
 @app.route('/api/algorithms/<category>', methods=['GET'])
 def get_category_algorithms(category):
     """Get algorithms for specific category"""
     if category in ALGORITHMS_DATABASE:
-        return jsonify(ALGORITHMS_DATABASE[category])
+        return catalog_response(('category', category), ALGORITHMS_DATABASE[category])
     return jsonify({'error': f'Category {category} not found'}), 404
 
 @app.route('/api/algorithms/<category>/<algorithm>', methods=['GET'])
@@ -1020,7 +1152,8 @@ def get_algorithm_info(category, algorithm):
     """Get info for specific algorithm"""
     if category in ALGORITHMS_DATABASE:
         if algorithm in ALGORITHMS_DATABASE[category]:
-            return jsonify(ALGORITHMS_DATABASE[category][algorithm])
+            return catalog_response(('algorithm', category, algorithm),
+                                    ALGORITHMS_DATABASE[category][algorithm])
         return jsonify({'error': f'Algorithm {algorithm} not found'}), 404
     return jsonify({'error': f'Category {category} not found'}), 404
 
@@ -1037,8 +1170,1040 @@ def get_statistics():
         'algorithms_by_category': {k: len(v) for k, v in ALGORITHMS_DATABASE.items()}
     })
 
+# ==================== RESULT CACHE ====================
+result_cache = ResultCache.from_config(app.config['RESULT_CACHE_MAX_BYTES'],
+                                       app.config['RESULT_CACHE_PATH'])
+
+def cached_response(entry, status='HIT'):
+    """Build a response from a cached (or just-cached) result"""
+    response = Response(entry.body, mimetype=entry.mimetype)
+    response.headers.update(entry.headers)
+    response.headers['X-Cache'] = status
+    return response
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Get result cache size and hit/miss ratio"""
+    return jsonify(result_cache.stats())
+
+# ==================== EXECUTION ROUTES ====================
+
+def validate_array(values):
+    """Return an error message if values is not a bounded list of numbers"""
+    return check_array(values, app.config['MAX_ARRAY_SIZE'])
+
+SANDBOX_STATUS_CODES = {
+    STATUS_INVALID: 400,
+    STATUS_TIMEOUT: 408,
+    STATUS_STEP_BUDGET: 422,
+    STATUS_MEMORY: 422,
+    STATUS_CRASHED: 500
+}
+
+def sandboxed_run(category, algorithm):
+    """Execute one run in a sandbox worker and translate its outcome into a response"""
+    if not has_engine(category, algorithm):
+        return jsonify({'error': f'Algorithm {algorithm} not found'}), 404
+
+    data = request_object()
+    max_steps = app.config['SANDBOX_MAX_STEPS']
+    requested = data.get('max_steps')
+    if requested is not None:
+        if isinstance(requested, bool) or not isinstance(requested, int) or requested < 1:
+            return jsonify({'error': "'max_steps' must be a positive integer"}), 400
+        max_steps = min(requested, max_steps)
+
+    # Reject bad input here so it never costs a worker process
+    try:
+        build_run(category, algorithm, data, app.config['MAX_ARRAY_SIZE'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key(category, algorithm, data, ignore=('max_steps',))
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    outcome = run_sandboxed(category, algorithm, data,
+                            timeout_ms=app.config['ALGORITHM_TIMEOUT'],
+                            max_steps=max_steps,
+                            max_memory_mb=app.config['SANDBOX_MAX_MEMORY_MB'],
+                            max_array_size=app.config['MAX_ARRAY_SIZE'],
+                            grace_ms=app.config['SANDBOX_GRACE_MS'])
+    if outcome['status'] == STATUS_OK:
+        body = json.dumps(outcome['report'], separators=(',', ':')).encode('utf-8')
+        entry = CachedResult('application/json', body, {})
+        result_cache.put(key, entry)
+        return cached_response(entry, 'MISS')
+
+    logger.warning(f"Run stopped ({outcome['status']}): {category}/{algorithm}")
+    outcome['limits'] = {
+        'timeout_ms': app.config['ALGORITHM_TIMEOUT'],
+        'max_steps': max_steps,
+        'max_memory_mb': app.config['SANDBOX_MAX_MEMORY_MB']
+    }
+    return jsonify(outcome), SANDBOX_STATUS_CODES[outcome['status']]
+
+@app.route('/api/run/sorting/<algorithm>', methods=['POST'])
+def run_sorting(algorithm):
+    """Execute a sorting algorithm server-side and return its counters"""
+    return sandboxed_run('sorting', algorithm)
+
+@app.route('/api/run/searching/<algorithm>', methods=['POST'])
+def run_searching(algorithm):
+    """Execute a searching algorithm server-side and return its counters"""
+    return sandboxed_run('searching', algorithm)
+
+@app.route('/api/run/backtracking/<algorithm>', methods=['POST'])
+def run_backtracking_search(algorithm):
+    """Execute a backtracking search server-side and return its counters"""
+    return sandboxed_run('backtracking', algorithm)
+
+@app.route('/api/run/bit/<algorithm>', methods=['POST'])
+def run_bit_enumeration(algorithm):
+    """Execute a bit enumeration server-side"""
+    return sandboxed_run('bit', algorithm)
+
+# ==================== PATHFINDING ROUTES ====================
+
+@app.route('/api/run/pathfinding/floyd_warshall', methods=['POST'])
+def run_floyd_warshall():
+    """Compute all-pairs shortest paths for a weighted edge list"""
+    data = request_object()
+    vertices, edges = data.get('vertices'), data.get('edges', [])
+    try:
+        check_weighted_edges(vertices, edges, app.config['MAX_APSP_VERTICES'])
+        result = floyd_warshall(vertices, edges, Deadline(app.config['ALGORITHM_TIMEOUT']),
+                                directed=bool(data.get('directed', True)),
+                                dtype=data.get('dtype', 'float64'),
+                                backend=data.get('backend'),
+                                max_python_vertices=app.config['MAX_APSP_PYTHON_VERTICES'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutionTimeout as e:
+        logger.warning(f"Floyd-Warshall timed out after {e.steps} of {vertices} passes")
+        return jsonify({'error': str(e)}), 408
+    return jsonify(result)
+
+@app.route('/api/run/pathfinding/<algorithm>', methods=['POST'])
+def run_pathfinding(algorithm):
+    """Find a path on a grid and return it with the visited order and counters"""
+    if algorithm in MST_ALGORITHMS:
+        return spanning_tree(algorithm)
+    if algorithm not in GRID_ALGORITHMS:
+        return jsonify({'error': f'Algorithm {algorithm} not found'}), 404
+
+    data = request_object()
+    try:
+        grid = Grid.from_request(data, app.config['MAX_GRID_SIZE'])
+        start = grid.cell(data.get('start'), 'start')
+        end = grid.cell(data.get('end'), 'end')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key('pathfinding', algorithm, data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    try:
+        result = run_grid_search(algorithm, grid, start, end,
+                                 timeout_ms=app.config['ALGORITHM_TIMEOUT'],
+                                 include_visited=bool(data.get('include_visited', True)),
+                                 max_visited=app.config['MAX_VISITED_CELLS'])
+    except ExecutionTimeout as e:
+        logger.warning(f"Pathfinding timed out: {algorithm} after {e.steps} cells")
+        return jsonify({'error': str(e), 'visited_count': e.steps}), 408
+
+    body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+@app.route('/api/pathfinding/batch', methods=['POST'])
+def pathfinding_batch():
+    """Answer many start/end queries against one grid or graph in a single request"""
+    data = request_object()
+    algorithm = data.get('algorithm', 'dijkstra')
+    if algorithm not in BATCH_ALGORITHMS:
+        return jsonify({'error': f"'algorithm' must be one of {sorted(BATCH_ALGORITHMS)}"}), 400
+
+    queries = data.get('queries')
+    max_queries = app.config['MAX_BATCH_QUERIES']
+    if not isinstance(queries, list) or not queries or len(queries) > max_queries:
+        return jsonify({'error': f"'queries' must be a list of 1 to {max_queries} [start, end] pairs"}), 400
+    try:
+        if 'edges' in data:
+            # Graph input: vertex ids instead of [row, col] cells
+            layout = build_csr(parse_json_edges(data, app.config['MAX_GRAPH_VERTICES'],
+                                                app.config['MAX_GRAPH_EDGES']),
+                               directed=bool(data.get('directed', True)))
+            locate, run_batch = layout.vertex, run_graph_batch
+        else:
+            layout = Grid.from_request(data, app.config['MAX_GRID_SIZE'])
+            locate, run_batch = layout.cell, run_grid_batch
+        pairs = []
+        for i, query in enumerate(queries):
+            if not isinstance(query, list) or len(query) != 2:
+                raise ValueError(f'Query {i} must be a [start, end] pair')
+            pairs.append((locate(query[0], f'queries[{i}] start'),
+                          locate(query[1], f'queries[{i}] end')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key('pathfinding', 'batch', data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    try:
+        result = run_batch(algorithm, layout, pairs,
+                           timeout_ms=app.config['ALGORITHM_TIMEOUT'],
+                           include_paths=bool(data.get('include_paths', True)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutionTimeout as e:
+        logger.warning(f"Pathfinding batch timed out: {algorithm} after {e.steps} cells")
+        return jsonify({'error': str(e)}), 408
+
+    body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+# ==================== GRAPH ROUTES ====================
+
+def graph_request_options():
+    """Options for a binary graph upload, taken from the query string"""
+    options = {}
+    for name, value in request.args.items():
+        if name == 'directed':
+            options[name] = value.lower() in ('1', 'true', 'yes')
+        elif value.lower() in ('true', 'false'):
+            options[name] = value.lower() == 'true'
+        else:
+            options[name] = int(value) if value.lstrip('-').isdigit() else value
+    return options
+
+def read_graph_input(category, algorithm):
+    """Parse a JSON edge list or binary (APGR) upload; returns (edges, options, cache key)"""
+    limits = (app.config['MAX_GRAPH_VERTICES'], app.config['MAX_GRAPH_EDGES'])
+    if request.mimetype == 'application/octet-stream':
+        payload = request.get_data()
+        options = graph_request_options()
+        key = cache_key(category, algorithm, {'sha256': hashlib.sha256(payload).hexdigest()}, options)
+        return parse_binary_edges(payload, *limits), options, key
+    options = request_object()
+    return parse_json_edges(options, *limits), options, cache_key(category, algorithm, options)
+
+@app.route('/api/run/graph/<algorithm>', methods=['POST'])
+def run_graph_algorithm(algorithm):
+    """Run a graph algorithm on a JSON edge list or a binary (APGR) upload"""
+    if algorithm not in GRAPH_ALGORITHMS:
+        return jsonify({'error': f'Algorithm {algorithm} not found'}), 404
+
+    try:
+        edges, options, key = read_graph_input('graph', algorithm)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    directed = graph_direction(algorithm, bool(options.get('directed', True)))
+    try:
+        result = run_graph(algorithm, build_csr(edges, directed), options,
+                           timeout_ms=app.config['ALGORITHM_TIMEOUT'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutionTimeout as e:
+        logger.warning(f"Graph run timed out: {algorithm} after {e.steps} steps")
+        return jsonify({'error': str(e)}), 408
+
+    body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+def spanning_tree(algorithm):
+    """Build a minimum spanning tree (forest) of an undirected weighted graph"""
+    try:
+        edges, options, key = read_graph_input('pathfinding', algorithm)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    # Only large Borůvka runs are worth splitting across the worker pool
+    pool, workers = None, 1
+    if algorithm == 'boruvka' and len(edges) >= app.config['MST_PARALLEL_MIN_EDGES'] \
+            and options.get('parallel', True):
+        workers = app.config['COMPARE_WORKERS'] or os.cpu_count() or 1
+        pool = get_pool(app.config['COMPARE_WORKERS'])
+    deadline = Deadline(app.config['ALGORITHM_TIMEOUT'])
+    include_edges = bool(options.get('include_edges', True))
+    try:
+        try:
+            result = run_mst(algorithm, edges, deadline, pool, workers, include_edges)
+        except BrokenProcessPool:
+            logger.error('MST worker pool died; retrying serially')
+            shutdown_pool()
+            result = run_mst(algorithm, edges, deadline, None, 1, include_edges)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutionTimeout as e:
+        logger.warning(f"MST timed out: {algorithm} after {e.steps} steps")
+        return jsonify({'error': str(e)}), 408
+
+    body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+# ==================== DP ROUTES ====================
+
+@app.route('/api/run/dp/<algorithm>', methods=['POST'])
+def run_dynamic_programming(algorithm):
+    """Run a DP algorithm in linear space; string DPs also offer accelerated kernels via 'mode'"""
+    if algorithm not in DP_ALGORITHMS:
+        return jsonify({'error': f'Algorithm {algorithm} not found'}), 404
+
+    data = request_object()
+    limits = (app.config['MAX_DP_LENGTH'], app.config['MAX_DP_CAPACITY'], app.config['MAX_DP_ITEMS'])
+    try:
+        mode = check_dp_request(algorithm, data, limits)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key('dp', algorithm, data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    try:
+        result = run_dp(algorithm, data, mode, Deadline(app.config['ALGORITHM_TIMEOUT']))
+    except ExecutionTimeout as e:
+        logger.warning(f"DP run timed out: {algorithm} ({mode}) after {e.steps} rows")
+        return jsonify({'error': str(e)}), 408
+
+    body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+dp_tables = DPTableStore(ResultCache.from_config(app.config['DP_TABLE_CACHE_MAX_BYTES'],
+                                                 app.config['DP_TABLE_CACHE_PATH']))
+
+@app.route('/api/dp/tables/<problem>', methods=['POST'])
+def solve_from_dp_table(problem):
+    """Answer from the stored table for these parameters, extending it to a larger target"""
+    if problem not in TABLE_PROBLEMS:
+        return jsonify({'error': f'No stored tables for {problem}'}), 404
+
+    data = request_object()
+    field = TABLE_PROBLEMS[problem][1]
+    target = data.get(field)
+    limit = app.config['MAX_DP_CAPACITY']
+    if problem == 'fib' and data.get('mod') is None:
+        limit = app.config['MAX_EXACT_FIB_N']
+    try:
+        params = table_params(problem, data, app.config['MAX_DP_ITEMS'])
+        if isinstance(target, bool) or not isinstance(target, int) or not 0 <= target <= limit:
+            raise ValueError(f"'{field}' must be an integer between 0 and {limit}")
+        result = dp_tables.solve(problem, params, target, Deadline(app.config['ALGORITHM_TIMEOUT']))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutionTimeout as e:
+        logger.warning(f"DP table extension timed out: {problem} at {e.steps}")
+        return jsonify({'error': str(e)}), 408
+
+    if isinstance(result['value'], int) and result['value'].bit_length() > 53:
+        result['value'] = to_decimal_string(result['value'])  # exact Fibonacci numbers outgrow JSON numbers
+    return jsonify(result)
+
+@app.route('/api/dp/tables/stats', methods=['GET'])
+def dp_table_stats():
+    """Get stored DP table sizes, extensions and lookups"""
+    return jsonify(dp_tables.stats())
+
+# ==================== MATH ROUTES ====================
+
+BIGNUM_ALGORITHMS = ('fibonacci_matrix', 'modular_exponentiation')
+
+@app.route('/api/run/math/<algorithm>', methods=['POST'])
+def run_big_number(algorithm):
+    """Compute a big Fibonacci number or power; 'format' picks digits, hex, head_tail, decimal or binary"""
+    if algorithm not in BIGNUM_ALGORITHMS:
+        return jsonify({'error': f'Algorithm {algorithm} not found'}), 404
+
+    data = request_object()
+    limits = (app.config['MAX_FIB_N'], app.config['MAX_BIGNUM_BITS'], app.config['MAX_BIGNUM_INPUT_CHARS'],
+              app.config['MAX_MODPOW_COST'])
+    try:
+        params, fmt, k = check_bignum_request(algorithm, data, limits)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key('math', algorithm, data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    try:
+        value, report, compute_ms = run_bignum(algorithm, params, Deadline(app.config['ALGORITHM_TIMEOUT']))
+    except ExecutionTimeout as e:
+        logger.warning(f"Big-number run timed out: {algorithm} after {e.steps} exponent bits")
+        return jsonify({'error': str(e)}), 408
+    if fmt == 'binary':
+        headers = {
+            'Content-Disposition': f'attachment; filename={algorithm}.bin',
+            'X-Bit-Length': str(value.bit_length()),
+            'X-Negative': str(value < 0).lower(),
+            'X-Compute-Ms': f'{compute_ms:.3f}'
+        }
+        entry = CachedResult('application/octet-stream', to_binary(value), headers)
+    else:
+        started = time.perf_counter()
+        try:
+            result = format_result(value, fmt, k, app.config['MAX_DECIMAL_DIGITS'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 413
+        result.update(report, algorithm=algorithm, format=fmt, compute_ms=round(compute_ms, 3),
+                      format_ms=round((time.perf_counter() - started) * 1000, 3))
+        body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+        entry = CachedResult('application/json', body, {})
+    logger.info(f"Big-number run: {algorithm} ({fmt}) {value.bit_length()} bits in {compute_ms:.1f} ms")
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+base_primes = BasePrimeTable()
+
+def read_sieve_range(data, workers=1):
+    """Validate 'lo' / 'hi' (inclusive) of a prime_sieve request sieved by ``workers`` processes"""
+    lo, hi = data.get('lo', 0), data.get('hi')
+    limit = app.config['MAX_SIEVE_LIMIT']
+    for name, value in (('lo', lo), ('hi', hi)):
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= limit:
+            raise ValueError(f"'{name}' must be an integer between 0 and {limit}")
+    if lo > hi:
+        raise ValueError("'lo' must not exceed 'hi'")
+    # Wider spans cannot finish within SIEVE_TIMEOUT
+    max_span = app.config['MAX_SIEVE_SPAN_PER_WORKER'] * workers
+    if hi - lo + 1 > max_span:
+        raise ValueError(f"[lo, hi] may span at most {max_span} numbers with {workers} sieve worker(s)")
+    return lo, hi
+
+@app.route('/api/run/math/prime_sieve', methods=['POST'])
+def run_prime_sieve():
+    """Count the primes in [lo, hi] with a segmented sieve; 'primes' lists the first few"""
+    data = request_object()
+    sample, parallel = data.get('primes', 0), data.get('parallel', True)
+    try:
+        if isinstance(sample, bool) or not isinstance(sample, int) or not 0 <= sample <= app.config['MAX_SIEVE_SAMPLE']:
+            raise ValueError(f"'primes' must be an integer between 0 and {app.config['MAX_SIEVE_SAMPLE']}")
+        if not isinstance(parallel, bool):
+            raise ValueError("'parallel' must be a boolean")
+        workers = (app.config['COMPARE_WORKERS'] or os.cpu_count() or 1) if parallel else 1
+        lo, hi = read_sieve_range(data, workers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key('math', 'prime_sieve', {'lo': lo, 'hi': hi, 'primes': sample})
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    pool = get_pool(app.config['COMPARE_WORKERS']) if workers > 1 else None
+    deadline = Deadline(app.config['SIEVE_TIMEOUT'])
+    try:
+        try:
+            result = count_primes(lo, hi, base_primes, deadline, pool, workers, sample)
+        except BrokenProcessPool:
+            logger.error('Sieve worker pool died; retrying serially')
+            shutdown_pool()
+            result = count_primes(lo, hi, base_primes, deadline, sample=sample)
+    except ExecutionTimeout as e:
+        logger.warning(f"Prime sieve timed out: [{lo}, {hi}] after {e.steps} segments")
+        return jsonify({'error': str(e)}), 408
+
+    body = json.dumps(result, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+@app.route('/api/math/prime_sieve/stream', methods=['POST'])
+def stream_primes():
+    """Stream the primes in [lo, hi] as NDJSON, one {"primes": [...]} line per sieve segment"""
+    data = request_object()
+    try:
+        lo, hi = read_sieve_range(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    base = base_primes.primes(math.isqrt(hi))
+    deadline = Deadline(app.config['SIEVE_TIMEOUT'])
+
+    def generate():
+        started = time.perf_counter()
+        count = 0
+        try:
+            for batch in prime_batches(lo, hi + 1, base, deadline):
+                count += len(batch)
+                yield json.dumps({'primes': batch}, separators=(',', ':')) + '\n'
+        except ExecutionTimeout as e:
+            logger.warning(f"Prime stream timed out: [{lo}, {hi}] after {e.steps} segments")
+            yield json.dumps({'error': str(e), 'count': count}) + '\n'
+            return
+        yield json.dumps({
+            'done': True,
+            'lo': lo,
+            'hi': hi,
+            'count': count,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+        }, separators=(',', ':')) + '\n'
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/math/prime_sieve/stats', methods=['GET'])
+def prime_sieve_stats():
+    """Get the cached base-prime table size and reuse counts"""
+    return jsonify(base_primes.stats())
+
+def json_safe_int(value):
+    """Integers beyond 2**53 are sent as strings so JSON clients keep every digit"""
+    return str(value) if value.bit_length() > 53 else value
+
+@app.route('/api/run/math/prime_factorization', methods=['POST'])
+def run_prime_factorization():
+    """Factor 'n', or every entry of 'numbers', by trial division, Miller-Rabin and Pollard-rho"""
+    data = request_object()
+    batch = 'numbers' in data
+    values = data.get('numbers') if batch else [data.get('n')]
+    max_batch = app.config['MAX_FACTOR_BATCH']
+    if not isinstance(values, list) or not 1 <= len(values) <= max_batch:
+        return jsonify({'error': f"'numbers' must be a list of 1 to {max_batch} integers"}), 400
+    try:
+        numbers = [parse_big_int(v, 'n', app.config['MAX_FACTOR_DIGITS']) for v in values]
+        if any(n < 1 for n in numbers):
+            raise ValueError('Only positive integers can be factored')
+        if any(n >= 10 ** app.config['MAX_FACTOR_DIGITS'] for n in numbers):
+            raise ValueError(f"Numbers may have at most {app.config['MAX_FACTOR_DIGITS']} digits")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    key = cache_key('math', 'prime_factorization', {'numbers': [str(n) for n in numbers]})
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached_response(cached)
+
+    started = time.perf_counter()
+    results = factor_numbers(numbers, base_primes, Deadline(app.config['ALGORITHM_TIMEOUT']))
+    for result in results:
+        result['n'] = json_safe_int(result['n'])
+        result['unfactored'] = [json_safe_int(m) for m in result['unfactored']]
+        for factor in result['factors']:
+            factor['prime'] = json_safe_int(factor['prime'])
+    complete = all(result['complete'] for result in results)
+    if not complete:
+        logger.warning(f"Factorization ran out of time with {len(numbers)} numbers")
+    if batch:
+        payload = {'algorithm': 'prime_factorization', 'count': len(results), 'results': results,
+                   'complete': complete}
+    else:
+        payload = dict(results[0], algorithm='prime_factorization')
+    payload['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    entry = CachedResult('application/json', body, {})
+    # Partial results depend on timing, so only complete ones are kept
+    if complete:
+        result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+# ==================== STRING ROUTES ====================
+automaton_cache = AutomatonCache(app.config['AUTOMATON_CACHE_MAX_BYTES'])
+
+def validate_patterns(data):
+    """Return an error message if the pattern set is not a bounded list of non-empty strings"""
+    patterns = data.get('patterns')
+    if not isinstance(patterns, list) or not patterns:
+        return "'patterns' must be a non-empty list of strings"
+    if len(patterns) > app.config['MAX_PATTERNS']:
+        return f"At most {app.config['MAX_PATTERNS']} patterns are allowed"
+    if not all(isinstance(p, str) and p for p in patterns):
+        return "'patterns' must be a non-empty list of strings"
+    if not isinstance(data.get('case_sensitive', True), bool):
+        return "'case_sensitive' must be a boolean"
+    return None
+
+@app.route('/api/string/aho_corasick/automata', methods=['POST'])
+def compile_automaton():
+    """Compile a pattern set once and return a handle for later scans"""
+    data = request_object()
+    error = validate_patterns(data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    try:
+        handle, automaton, reused = automaton_cache.compile(data['patterns'],
+                                                            data.get('case_sensitive', True))
+    except AutomatonTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    if not reused:
+        logger.info(f"Compiled automaton {handle}: {automaton.states} states in {automaton.compile_ms:.1f}ms")
+    return jsonify(dict(automaton.describe(handle), reused=reused)), 200 if reused else 201
+
+@app.route('/api/string/aho_corasick/automata/<handle>', methods=['GET'])
+def get_automaton(handle):
+    """Describe a cached automaton"""
+    automaton = automaton_cache.get(handle)
+    if automaton is None:
+        return jsonify({'error': f'Automaton {handle} not found; compile the patterns again'}), 404
+    return jsonify(automaton.describe(handle))
+
+@app.route('/api/string/aho_corasick/automata/<handle>', methods=['DELETE'])
+def delete_automaton(handle):
+    """Drop a cached automaton"""
+    if not automaton_cache.evict(handle):
+        return jsonify({'error': f'Automaton {handle} not found'}), 404
+    return jsonify({'handle': handle, 'deleted': True})
+
+@app.route('/api/string/aho_corasick/automata/<handle>/search', methods=['POST'])
+def search_automaton(handle):
+    """Stream a text body through a cached automaton as NDJSON match batches.
+
+    The raw request body is the text (a JSON body may instead give it as
+    'text'). Each line is ``{"matches": [[byte offset, pattern index], ...]}``
+    for one chunk; the last line summarises the scan.
+    """
+    automaton = automaton_cache.get(handle)
+    if automaton is None:
+        return jsonify({'error': f'Automaton {handle} not found; compile the patterns again'}), 404
+
+    if request.is_json:
+        text = request_object().get('text')
+        if not isinstance(text, str):
+            return jsonify({'error': "'text' must be a string"}), 400
+        body = text.encode('utf-8')
+        chunk_bytes = app.config['SCAN_CHUNK_BYTES']
+        chunks = (body[i:i + chunk_bytes] for i in range(0, len(body), chunk_bytes))
+    else:
+        stream, chunk_bytes = request.stream, app.config['SCAN_CHUNK_BYTES']
+        chunks = iter(lambda: stream.read(chunk_bytes), b'')
+
+    scanner = AutomatonScanner(automaton)
+    deadline = Deadline(app.config['ALGORITHM_TIMEOUT'])
+
+    def generate():
+        started = time.perf_counter()
+        try:
+            for chunk in chunks:
+                found = scanner.feed(chunk)
+                if found:
+                    yield json.dumps({'matches': found}, separators=(',', ':')) + '\n'
+                deadline.check(scanner.position)
+        except ExecutionTimeout as e:
+            logger.warning(f"Automaton scan timed out: {handle} after {e.steps} bytes")
+            yield json.dumps({'error': str(e), 'bytes': scanner.position}) + '\n'
+            return
+        yield json.dumps({
+            'done': True,
+            'handle': handle,
+            'bytes': scanner.position,
+            'matches': scanner.matches,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+        }, separators=(',', ':')) + '\n'
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/string/aho_corasick/stats', methods=['GET'])
+def automaton_stats():
+    """Get automaton cache size, hits and evictions"""
+    return jsonify(automaton_cache.stats())
+
+def open_large_text():
+    """Map the text for a large-text search; returns (mapped text, pattern, options)"""
+    if request.is_json:
+        options = request_object()
+        return corpus_file(app.config['CORPUS_DIR'], options.get('corpus')), options.get('pattern'), options
+    options = request.args.to_dict()
+    if request.mimetype == 'multipart/form-data':
+        boundary = request.mimetype_params.get('boundary')
+        if not boundary:
+            raise ValueError('Multipart body has no boundary')
+        # Parsed here rather than through request.form, which would hold every field in memory
+        text, fields = spool_multipart(request.stream, boundary.encode('latin-1'), app.config['MAX_CONTENT_LENGTH'])
+        options.update(fields)
+        return text, options.get('pattern'), options
+    return spool_stream(request.stream), options.get('pattern'), options
+
+@app.route('/api/string/<algorithm>/search', methods=['POST'])
+def search_large_text(algorithm):
+    """Search an uploaded file or a CORPUS_DIR text through mmap, streaming NDJSON offsets.
+
+    Upload the text as the raw body or a multipart 'file' part with
+    ?pattern=...; or post JSON {"corpus": name, "pattern": ...}. Each line
+    is ``{"matches": [byte offset, ...]}``; the last line summarises the scan.
+    """
+    if algorithm not in LARGE_TEXT_ALGORITHMS:
+        return jsonify({'error': f'Algorithm {algorithm} has no large-text mode'}), 404
+
+    try:
+        text, pattern, options = open_large_text()
+    except PermissionError as e:
+        return jsonify({'error': str(e)}), 403
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        if not isinstance(pattern, str) or not pattern:
+            raise ValueError("'pattern' must be a non-empty string")
+        limit = options.get('limit')
+        limit = int(limit) if limit is not None else None
+        if limit is not None and limit < 1:
+            raise ValueError("'limit' must be a positive integer")
+    except (TypeError, ValueError) as e:
+        text.close()
+        return jsonify({'error': str(e)}), 400
+
+    needle = pattern.encode('utf-8')
+    deadline = Deadline(app.config['LARGE_TEXT_TIMEOUT'])
+
+    def generate():
+        started = time.perf_counter()
+        matches = 0
+        try:
+            for batch in scan_batches(algorithm, text.buffer, needle, deadline, limit=limit):
+                matches += len(batch)
+                yield json.dumps({'matches': batch}, separators=(',', ':')) + '\n'
+        except ExecutionTimeout as e:
+            logger.warning(f"Large-text search timed out: {algorithm} at byte {e.steps}")
+            yield json.dumps({'error': str(e), 'matches': matches}) + '\n'
+            return
+        finally:
+            text.close()
+        yield json.dumps({
+            'done': True,
+            'algorithm': algorithm,
+            'backend': choose_matcher(algorithm, text.size)[1],
+            'bytes': text.size,
+            'matches': matches,
+            'truncated': matches == limit,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+        }, separators=(',', ':')) + '\n'
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+suffix_indexes = SuffixIndexStore(app.config['SUFFIX_INDEX_DIR'])
+
+@app.route('/api/string/suffix_array/index', methods=['POST'])
+def build_suffix_index():
+    """Build a suffix array + LCP index over the request text and store it on disk"""
+    if request.is_json:
+        text = request_object().get('text')
+        if not isinstance(text, str):
+            return jsonify({'error': "'text' must be a string"}), 400
+        text = text.encode('utf-8')
+    else:
+        text = request.get_data()
+    if len(text) > app.config['MAX_SUFFIX_INDEX_BYTES']:
+        return jsonify({'error': f"Text exceeds MAX_SUFFIX_INDEX_BYTES ({app.config['MAX_SUFFIX_INDEX_BYTES']})"}), 413
+
+    try:
+        handle, index, stats = suffix_indexes.build(text, Deadline(app.config['ALGORITHM_TIMEOUT']))
+    except ExecutionTimeout as e:
+        logger.warning(f"Suffix index build timed out after {len(text)} bytes")
+        return jsonify({'error': str(e)}), 408
+    if not stats['reused']:
+        logger.info(f"Built suffix index {handle}: {len(text)} bytes in {stats['build_ms']:.1f}ms")
+    return jsonify(dict(index.describe(handle), **stats)), 200 if stats['reused'] else 201
+
+@app.route('/api/string/suffix_array/index/<handle>', methods=['GET'])
+def get_suffix_index(handle):
+    """Describe a stored suffix index"""
+    index = suffix_indexes.get(handle)
+    if index is None:
+        return jsonify({'error': f'Suffix index {handle} not found'}), 404
+    return jsonify(index.describe(handle))
+
+@app.route('/api/string/suffix_array/index/<handle>', methods=['DELETE'])
+def delete_suffix_index(handle):
+    """Remove a stored suffix index"""
+    if not suffix_indexes.delete(handle):
+        return jsonify({'error': f'Suffix index {handle} not found'}), 404
+    return jsonify({'index': handle, 'deleted': True})
+
+@app.route('/api/string/suffix_array/index/<handle>/query', methods=['POST'])
+def query_suffix_index(handle):
+    """Answer find / count / longest_repeated queries from a stored index"""
+    index = suffix_indexes.get(handle)
+    if index is None:
+        return jsonify({'error': f'Suffix index {handle} not found'}), 404
+
+    data = request_object()
+    queries = data.get('queries')
+    limit = data.get('limit', 100)
+    if not isinstance(queries, list) or not queries:
+        return jsonify({'error': "'queries' must be a non-empty list"}), 400
+    if len(queries) > app.config['MAX_BATCH_QUERIES']:
+        return jsonify({'error': f"At most {app.config['MAX_BATCH_QUERIES']} queries per request"}), 400
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= app.config['MAX_QUERY_RESULTS']:
+        return jsonify({'error': f"'limit' must be an integer between 1 and {app.config['MAX_QUERY_RESULTS']}"}), 400
+
+    started = time.perf_counter()
+    try:
+        results = run_queries(index, queries, limit, Deadline(app.config['ALGORITHM_TIMEOUT']))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutionTimeout as e:
+        logger.warning(f"Suffix index queries timed out: {handle} after {e.steps} queries")
+        return jsonify({'error': str(e)}), 408
+    return jsonify({
+        'index': handle,
+        'queries': len(queries),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        'results': results
+    })
+
+# ==================== TRACE ROUTES ====================
+
+def build_steps(category, algorithm, data):
+    """Validate a run request and return its step generator (None if not traceable)"""
+    if not has_engine(category, algorithm):
+        return None
+    return build_run(category, algorithm, data, app.config['MAX_ARRAY_SIZE'])[0]
+
+TRACE_FORMATS = ('binary', 'json')
+
+@app.route('/api/trace/<category>/<algorithm>', methods=['POST'])
+def trace_algorithm(category, algorithm):
+    """Record a step trace, served packed (default) or as JSON with format=json"""
+    data = request_object()
+    options = {
+        'format': data.get('format', request.args.get('format', 'binary')),
+        'compress': bool(data.get('compress', True))
+    }
+    if not isinstance(options['format'], str) or options['format'] not in TRACE_FORMATS:
+        return jsonify({'error': f"Unknown trace format {options['format']!r}",
+                        'formats': list(TRACE_FORMATS)}), 400
+    key = cache_key(category, algorithm, data, options, ignore=('format', 'compress'))
+    try:
+        steps = build_steps(category, algorithm, data)
+        if steps is None:
+            return jsonify({'error': f'No trace available for {category}/{algorithm}'}), 404
+
+        cached = result_cache.get(key)
+        if cached is not None:
+            steps.close()
+            return cached_response(cached)
+
+        trace = TraceRecorder(app.config['MAX_TRACE_STEPS'])
+        result, counts, elapsed_ms = run_steps(steps, app.config['ALGORITHM_TIMEOUT'], trace)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except TraceTooLarge as e:
+        return jsonify({'error': str(e), 'max_steps': e.max_steps}), 413
+    except ExecutionTimeout as e:
+        return jsonify({'error': str(e), 'timeout_ms': e.timeout_ms, 'steps': e.steps}), 408
+
+    if options['format'] == 'json':
+        body = json.dumps({'algorithm': algorithm, 'result': result, 'steps': trace.to_json()},
+                          separators=(',', ':')).encode('utf-8')
+        entry = CachedResult('application/json', body, {})
+    else:
+        payload, encode_ms = encode_trace(trace, compress=options['compress'])
+        entry = CachedResult('application/octet-stream', payload, {
+            'X-Trace-Steps': str(len(trace)),
+            'X-Trace-Bytes': str(len(payload)),
+            'X-Trace-Encode-Ms': f'{encode_ms:.3f}',
+            'X-Run-Elapsed-Ms': f'{elapsed_ms:.3f}'
+        })
+    result_cache.put(key, entry)
+    return cached_response(entry, 'MISS')
+
+def sse_event(event, payload):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+@app.route('/api/stream/<category>/<algorithm>', methods=['POST'])
+def stream_algorithm(category, algorithm):
+    """Stream step events as Server-Sent Events while the algorithm runs"""
+    data = request_object()
+    try:
+        steps = build_steps(category, algorithm, data)
+        batch_size = min(max(int(data.get('batch_size', 256)), 1), app.config['MAX_STREAM_BATCH'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    if steps is None:
+        return jsonify({'error': f'No stream available for {category}/{algorithm}'}), 404
+
+    stream = StepStream(steps, batch_size, app.config['ALGORITHM_TIMEOUT'])
+
+    def generate():
+        try:
+            for batch in stream:
+                yield sse_event('steps', batch)
+        except ValueError as e:
+            yield sse_event('error', {'error': str(e)})
+            return
+        except ExecutionTimeout as e:
+            yield sse_event('error', {'error': str(e), 'timeout_ms': e.timeout_ms, 'steps': e.steps})
+            return
+        yield sse_event('done', {
+            'algorithm': algorithm,
+            'result': stream.result,
+            'counts': {OP_NAMES[op]: count for op, count in stream.counts.items() if count},
+            'elapsed_ms': round(stream.elapsed_ms, 3)
+        })
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# ==================== BENCHMARK ROUTES ====================
+
+@app.route('/api/benchmark', methods=['POST'])
+def benchmark():
+    """Time algorithms across input sizes and distributions"""
+    if not app.config['ENABLE_BENCHMARKING']:
+        return jsonify({'error': 'Benchmarking is disabled'}), 403
+
+    data = request_object()
+    category = data.get('category', 'sorting')
+    if category not in BENCHMARKABLE:
+        return jsonify({'error': f'Category {category} cannot be benchmarked',
+                        'categories': list(BENCHMARKABLE)}), 400
+
+    registry = BENCHMARKABLE[category][0]
+    algorithms = data.get('algorithms', list(registry))
+    sizes = data.get('sizes')
+    distributions = data.get('distributions')
+    repeats = data.get('repeats', DEFAULT_REPEATS)
+
+    if not isinstance(algorithms, list) or not algorithms or any(
+            not isinstance(a, str) or a not in registry for a in algorithms):
+        return jsonify({'error': f"'algorithms' must list one or more {category} algorithms",
+                        'available': list(registry)}), 400
+    if sizes is not None and (not isinstance(sizes, list) or not sizes or any(
+            isinstance(n, bool) or not isinstance(n, int) or not 1 <= n <= app.config['MAX_ARRAY_SIZE']
+            for n in sizes)):
+        return jsonify({'error': f"'sizes' must be integers between 1 and {app.config['MAX_ARRAY_SIZE']}"}), 400
+    if distributions is not None and (not isinstance(distributions, list) or not distributions or any(
+            not isinstance(d, str) or d not in DISTRIBUTIONS for d in distributions)):
+        return jsonify({'error': "'distributions' must be a list of known distributions",
+                        'available': list(DISTRIBUTIONS)}), 400
+    if isinstance(repeats, bool) or not isinstance(repeats, int) or not 1 <= repeats <= MAX_REPEATS:
+        return jsonify({'error': f"'repeats' must be an integer between 1 and {MAX_REPEATS}"}), 400
+
+    report = run_benchmark(category, algorithms, sizes, distributions, repeats,
+                           seed=data.get('seed', 0), budget_ms=app.config['ALGORITHM_TIMEOUT'])
+    for algorithm in algorithms:
+        info = ALGORITHMS_DATABASE[category][algorithm]
+        report['results'][algorithm]['catalog'] = {
+            key: info.get(key) for key in ('complexity', 'best', 'worst')
+        }
+    return jsonify(report)
+
+# ==================== COMPARISON ROUTES ====================
+
+COMPARABLE = {
+    'sorting': (SORTING_ALGORITHMS, 'sorted'),
+    'searching': (SEARCHING_ALGORITHMS, 'index')
+}
+
+@app.route('/api/compare', methods=['POST'])
+def compare_algorithms():
+    """Run several algorithms of one category on the same input in parallel"""
+    if not app.config['ENABLE_COMPARISONS']:
+        return jsonify({'error': 'Comparisons are disabled'}), 403
+
+    data = request_object()
+    category = data.get('category', 'sorting')
+    if category not in COMPARABLE:
+        return jsonify({'error': f'Category {category} cannot be compared',
+                        'categories': list(COMPARABLE)}), 400
+    registry, output_key = COMPARABLE[category]
+
+    algorithms = data.get('algorithms')
+    if (not isinstance(algorithms, list) or len(algorithms) < 2
+            or len(set(algorithms)) != len(algorithms) or any(a not in registry for a in algorithms)):
+        return jsonify({'error': f"'algorithms' must list two or more distinct {category} algorithms",
+                        'available': list(registry)}), 400
+
+    values, target = data.get('array'), data.get('target')
+    error = validate_array(values)
+    if category == 'searching':
+        error = error or check_target(target)
+    if error:
+        return jsonify({'error': error}), 400
+
+    # One budget for the whole comparison: queued runs get what is left of it,
+    # and every worker stops itself at the same wall-clock expiry
+    timeout_ms = app.config['ALGORITHM_TIMEOUT']
+    expires_at = time.time() + timeout_ms / 1000
+    pool = get_pool(app.config['COMPARE_WORKERS'])
+    started = datetime.utcnow()
+    if category == 'sorting':
+        futures = {a: pool.submit(call_before, run_sort, (a, values), timeout_ms, expires_at)
+                   for a in algorithms}
+    else:
+        futures = {a: pool.submit(call_before, run_search, (a, values, target), timeout_ms, expires_at)
+                   for a in algorithms}
+    _, pending = wait(futures.values(), timeout=(timeout_ms + app.config['COMPARE_GRACE_MS']) / 1000)
+
+    results, outputs = {}, []
+    for algorithm, future in futures.items():
+        if future in pending:
+            future.cancel()
+            results[algorithm] = {'error': 'No result before the comparison deadline', 'timed_out': True}
+            continue
+        try:
+            result = future.result()
+        except ExecutionTimeout as e:
+            results[algorithm] = {'error': str(e), 'timed_out': True, 'steps': e.steps}
+            continue
+        except ValueError as e:
+            results[algorithm] = {'error': str(e)}
+            continue
+        except BrokenProcessPool:
+            logger.error('Comparison worker pool died; it will be recreated')
+            shutdown_pool()
+            results[algorithm] = {'error': 'Worker process failed'}
+            continue
+        outputs.append(result.pop(output_key))
+        results[algorithm] = result
+
+    return jsonify({
+        'category': category,
+        'output_key': output_key,
+        'output': outputs[0] if outputs else None,
+        'consistent': all(output == outputs[0] for output in outputs),
+        'results': results,
+        'wall_ms': round((datetime.utcnow() - started).total_seconds() * 1000, 3)
+    })
+
 # ==================== ERROR HANDLERS ====================
 
+@app.errorhandler(400)
+def bad_request(error):
+    """Handle 400 errors"""
+    return jsonify({'error': error.description}), 400
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
@@ -1089,6 +2254,83 @@ def list_algorithms():
         for algo_name, algo_info in algos.items():
             print(f"  - {algo_info['name']} | {algo_info['complexity']}")
 
+@app.cli.command()
+@click.option('--category', 'categories', multiple=True, help='Limit to a runnable category')
+@click.option('--metric', type=click.Choice(['steps', 'time']), default='steps',
+              help='Fit operation counts (default) or wall-clock time')
+@click.option('--max-n', default=2048, show_default=True, help='Largest input size in the sweep')
+@click.option('--repeats', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Runs per size (median is kept)')
+def check_complexity(categories, metric, max_n, repeats):
+    """Check catalog Big-O claims against measured growth"""
+    try:
+        reports = check_catalog(ALGORITHMS_DATABASE, list(categories) or None,
+                                metric=metric, max_n=max_n, repeats=repeats)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    flagged = 0
+    for report in reports:
+        name = ALGORITHMS_DATABASE[report['category']][report['algorithm']]['name']
+        print(f"\n{name} ({report['category']}/{report['algorithm']}):")
+        for verdict in report['verdicts']:
+            if verdict['agrees'] is False:
+                flagged += 1
+                status = 'MISMATCH'
+            else:
+                status = 'ok' if verdict['agrees'] else 'unparsed'
+            print(f"  {verdict['field']:<10} claimed {verdict['claimed'] or '-':<12} "
+                  f"measured O({verdict['fitted']}) on {verdict['distribution']} input  [{status}]")
+    print(f"\n{flagged} claim(s) disagree with measured growth")
+
+@app.cli.command()
+@click.option('--sizes', default='100,500,1000', show_default=True, help='Comma-separated vertex counts')
+@click.option('--density', default=0.1, show_default=True, help='Edge probability per vertex pair')
+@click.option('--python-max', default=500, show_default=True,
+              help='Largest V timed with the pure-Python backend')
+def benchmark_apsp(sizes, density, python_max):
+    """Benchmark Floyd-Warshall backends (NumPy float64/float32 vs pure Python)"""
+    if not HAVE_NUMPY:
+        print('NumPy is not installed; only the pure-Python backend will run')
+    rows = benchmark_floyd_warshall([int(n) for n in sizes.split(',')], density, python_max=python_max)
+    baseline = {}
+    for row in rows:
+        if row['backend'] == 'python':
+            baseline[row['vertices']] = row['elapsed_ms']
+        speedup = baseline.get(row['vertices'])
+        speedup = f"{speedup / row['elapsed_ms']:.1f}x" if speedup and row['backend'] != 'python' else '-'
+        size = f"{row['matrix_bytes'] / 1e6:.1f} MB" if row['matrix_bytes'] else '-'
+        print(f"V={row['vertices']:<6} {row['backend']:<7} {row['dtype']:<8} "
+              f"{row['elapsed_ms']:>12.1f} ms  matrix {size:<9} speedup {speedup}")
+
+@app.cli.command()
+@click.option('--seed', default=0, show_default=True, help='Seed for the generated networks')
+def benchmark_maxflow(seed):
+    """Benchmark Edmonds-Karp, Dinic and push-relabel on generated networks"""
+    for row in benchmark_flow(seed=seed):
+        print(f"{row['workload']:<30} {row['method']:<13} flow {row['max_flow']:>8g}  "
+              f"phases {row['phases']:>6}  {row['flow_ms']:>10.1f} ms")
+
+@app.cli.command()
+@click.option('--sizes', default='1000,2000,10000', show_default=True, help='Comma-separated string lengths')
+@click.option('--baseline-max', default=2000, show_default=True,
+              help='Longest input timed with the cell-by-cell rolling baseline')
+@click.option('--seed', default=0, show_default=True, help='Seed for the random strings')
+def benchmark_dp_kernels(sizes, baseline_max, seed):
+    """Benchmark string-DP modes (rolling vs bit-parallel vs NumPy wavefront)"""
+    rows = benchmark_dp([int(n) for n in sizes.split(',')], seed=seed, baseline_max=baseline_max)
+    baseline = {}
+    mismatches = 0
+    for row in rows:
+        if row['mode'] == 'rolling':
+            baseline[row['algorithm'], row['n']] = row['elapsed_ms']
+        speedup = baseline.get((row['algorithm'], row['n']))
+        speedup = f"{speedup / row['elapsed_ms']:.1f}x" if speedup and row['mode'] != 'rolling' else '-'
+        mismatches += not row['identical']
+        print(f"{row['algorithm']:<14} n={row['n']:<7} {row['mode']:<12} value {row['value']:>8}  "
+              f"{row['elapsed_ms']:>11.1f} ms  peak {row['peak_bytes']:>9} B  speedup {speedup:<8} "
+              f"{'ok' if row['identical'] else 'MISMATCH'}")
+    print(f"\n{mismatches} result(s) differ from the reference mode")
+
 @app.cli.command()
 def count_algorithms():
     """Count total algorithms"""
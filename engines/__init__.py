@@ -0,0 +1,4 @@
+"""
+Server-side algorithm engines for Algorithm Playground
+Version: 2.0.0
+"""
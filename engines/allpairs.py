@@ -0,0 +1,162 @@
+"""
+All-pairs shortest paths for Algorithm Playground
+
+Floyd-Warshall runs as one whole-matrix ``numpy.minimum`` update per
+intermediate vertex k when NumPy is installed, and as row-wise list
+comprehensions otherwise. NumPy is optional; ``HAVE_NUMPY`` reports which
+backend is in use.
+"""
+
+import math
+import random
+import time
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - exercised on installs without NumPy
+    np = None
+    HAVE_NUMPY = False
+
+INF = math.inf
+DTYPES = ('float64', 'float32')
+BACKENDS = ('numpy', 'python')
+
+
+def check_weighted_edges(vertices, edges, max_vertices):
+    """Validate a vertex count and [u, v, weight] edge list"""
+    if isinstance(vertices, bool) or not isinstance(vertices, int) or not 1 <= vertices <= max_vertices:
+        raise ValueError(f"'vertices' must be an integer between 1 and {max_vertices}")
+    if not isinstance(edges, list):
+        raise ValueError("'edges' must be a list of [u, v, weight] triples")
+    for edge in edges:
+        if (not isinstance(edge, list) or len(edge) != 3
+                or any(isinstance(x, bool) or not isinstance(x, int) for x in edge[:2])
+                or isinstance(edge[2], bool) or not isinstance(edge[2], (int, float))):
+            raise ValueError(f'Invalid edge {edge}; expected [u, v, weight]')
+        if not (0 <= edge[0] < vertices and 0 <= edge[1] < vertices):
+            raise ValueError(f'Edge {edge} references a vertex outside 0..{vertices - 1}')
+
+
+def floyd_warshall_python(vertices, edges, directed=True, deadline=None):
+    """Pure-Python Floyd-Warshall over a list of row lists"""
+    dist = [[INF] * vertices for _ in range(vertices)]
+    for i in range(vertices):
+        dist[i][i] = 0.0
+    for u, v, w in edges:
+        if w < dist[u][v]:
+            dist[u][v] = w
+        if not directed and w < dist[v][u]:
+            dist[v][u] = w
+
+    for k in range(vertices):
+        row_k = dist[k]
+        for i in range(vertices):
+            row_i = dist[i]
+            through = row_i[k]
+            if through == INF:
+                continue
+            dist[i] = [a if a <= through + b else through + b for a, b in zip(row_i, row_k)]
+        if deadline is not None:
+            deadline.check(k)
+    return dist
+
+
+def floyd_warshall_numpy(vertices, edges, directed=True, dtype='float64', deadline=None):
+    """Vectorized Floyd-Warshall: one broadcast minimum per k, in place"""
+    dist = np.full((vertices, vertices), np.inf, dtype=dtype)
+    if edges:
+        u, v, w = (np.asarray(column) for column in zip(*edges))
+        # minimum.at keeps the cheapest of parallel edges
+        np.minimum.at(dist, (u, v), w.astype(dtype))
+        if not directed:
+            np.minimum.at(dist, (v, u), w.astype(dtype))
+    np.fill_diagonal(dist, np.minimum(dist.diagonal(), 0))
+
+    candidate = np.empty_like(dist)
+    for k in range(vertices):
+        np.add(dist[:, k, None], dist[None, k, :], out=candidate)
+        np.minimum(dist, candidate, out=dist)
+        if deadline is not None:
+            deadline.check(k)
+    return dist
+
+
+def floyd_warshall(vertices, edges, deadline, directed=True, dtype='float64', backend=None,
+                   max_python_vertices=None):
+    """Run Floyd-Warshall and report distances, negative cycles and timing.
+
+    ``backend`` is 'numpy' or 'python'; by default NumPy is used when present.
+    ``dtype`` only applies to the NumPy backend, where float32 halves memory.
+    The O(V^3) pure-Python loop is limited to ``max_python_vertices``.
+    """
+    backend = backend or ('numpy' if HAVE_NUMPY else 'python')
+    if backend not in BACKENDS:
+        raise ValueError(f"'backend' must be one of {list(BACKENDS)}")
+    if backend == 'numpy' and not HAVE_NUMPY:
+        raise ValueError('NumPy is not installed on this server')
+    if backend == 'python' and max_python_vertices is not None and vertices > max_python_vertices:
+        raise ValueError(f"The python backend is limited to {max_python_vertices} vertices")
+    if dtype not in DTYPES:
+        raise ValueError(f"'dtype' must be one of {list(DTYPES)}")
+
+    started = time.perf_counter()
+    if backend == 'numpy':
+        dist = floyd_warshall_numpy(vertices, edges, directed, dtype, deadline)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        negative_cycle = bool((dist.diagonal() < 0).any())
+        matrix = np.where(np.isinf(dist), None, dist).tolist()
+        matrix_bytes = dist.nbytes
+    else:
+        dist = floyd_warshall_python(vertices, edges, directed, deadline)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        negative_cycle = any(dist[i][i] < 0 for i in range(vertices))
+        matrix = [[None if d == INF else d for d in row] for row in dist]
+        matrix_bytes = None
+        dtype = 'float64'
+
+    return {
+        'algorithm': 'floyd_warshall',
+        'backend': backend,
+        'dtype': dtype,
+        'vertices': vertices,
+        'edges': len(edges),
+        'negative_cycle': negative_cycle,
+        'distances': matrix,
+        'matrix_bytes': matrix_bytes,
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+
+
+def random_weighted_graph(vertices, density, rng):
+    """Random directed graph with non-negative integer weights"""
+    return [[u, v, rng.randint(1, 100)]
+            for u in range(vertices) for v in range(vertices)
+            if u != v and rng.random() < density]
+
+
+def benchmark_floyd_warshall(sizes, density=0.1, seed=0, python_max=None):
+    """Time every backend and dtype per size; python_max skips slow pure-Python runs"""
+    rows = []
+    for n in sizes:
+        edges = random_weighted_graph(n, density, random.Random(f'{seed}:{n}'))
+        runs = [('python', 'float64')] if python_max is None or n <= python_max else []
+        if HAVE_NUMPY:
+            runs += [('numpy', 'float64'), ('numpy', 'float32')]
+        for backend, dtype in runs:
+            started = time.perf_counter()
+            if backend == 'numpy':
+                dist = floyd_warshall_numpy(n, edges, dtype=dtype)
+                nbytes = dist.nbytes
+            else:
+                floyd_warshall_python(n, edges)
+                nbytes = None
+            rows.append({
+                'vertices': n,
+                'edges': len(edges),
+                'backend': backend,
+                'dtype': dtype,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+                'matrix_bytes': nbytes
+            })
+    return rows
@@ -0,0 +1,218 @@
+"""
+Compiled Aho-Corasick automata for repeated multi-pattern search
+
+A pattern set is compiled once into a dense DFA over a compressed byte
+alphabet: bytes that occur in no pattern share class 0, so the transition
+table is ``states x (distinct pattern bytes + 1)`` int32 cells rather than
+``states x 256``. Transitions store the target row offset directly, so the
+scan loop is one array read per input byte.
+
+Compiled automata live in an in-process LRU keyed by a content hash of
+the pattern set (the handle), bounded by total table bytes. Matching runs
+over UTF-8 bytes; offsets in results are byte offsets into the text.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+
+
+class AutomatonTooLarge(Exception):
+    """Raised when one compiled automaton exceeds the whole cache budget"""
+
+    def __init__(self, size, max_bytes):
+        super().__init__(f'Compiled automaton needs {size} bytes; the cache budget is {max_bytes}')
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+def automaton_handle(patterns, case_sensitive):
+    """Content-addressed handle, so recompiling the same set reuses the cached one"""
+    canonical = json.dumps([patterns, case_sensitive], separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:24]
+
+
+class AhoCorasick:
+    """Immutable compiled automaton; scan state lives in AutomatonScanner"""
+
+    def __init__(self, patterns, case_sensitive=True, max_table_bytes=None):
+        started = time.perf_counter()
+        encoded = [p.encode('utf-8') for p in patterns]
+        if not case_sensitive:
+            encoded = [p.lower() for p in encoded]
+
+        classes = bytearray(256)
+        for i, byte in enumerate(sorted(set(b''.join(encoded))), 1):
+            classes[byte] = i
+        if not case_sensitive:
+            for byte in range(ord('A'), ord('Z') + 1):
+                classes[byte] = classes[byte + 32]
+        width = max(classes) + 1
+
+        # Trie with dict children, only while building
+        children, ends = [{}], [()]
+        for pattern_id, pattern in enumerate(encoded):
+            state = 0
+            for code in pattern.translate(classes):
+                nxt = children[state].get(code)
+                if nxt is None:
+                    nxt = len(children)
+                    children[state][code] = nxt
+                    children.append({})
+                    ends.append(())
+                state = nxt
+            ends[state] += (pattern_id,)
+
+        # BFS: each row starts as a copy of its failure state's row, then
+        # its own children overwrite their columns
+        states = len(children)
+        # Refuse before allocating: the table can run to gigabytes
+        if max_table_bytes is not None and 4 * states * width > max_table_bytes:
+            raise AutomatonTooLarge(4 * states * width, max_table_bytes)
+        delta = array('i', bytes(4 * states * width))
+        fail = array('i', bytes(4 * states))
+        dict_link = array('i', bytes(4 * states))
+        queue = deque()
+        for code, child in children[0].items():
+            delta[code] = child * width
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            row, fail_row = state * width, fail[state] * width
+            delta[row:row + width] = delta[fail_row:fail_row + width]
+            for code, child in children[state].items():
+                delta[row + code] = child * width
+                f = delta[fail_row + code] // width
+                fail[child] = f
+                dict_link[child] = f if ends[f] else dict_link[f]
+                queue.append(child)
+
+        # Row offset -> every pattern ending there, following dictionary links
+        outputs = {}
+        for state in range(1, states):
+            ids = ends[state]
+            s = dict_link[state]
+            while s:
+                ids += ends[s]
+                s = dict_link[s]
+            if ids:
+                outputs[state * width] = ids
+
+        self.patterns = list(patterns)
+        self.case_sensitive = case_sensitive
+        self.classes = bytes(classes)
+        self.width = width
+        self.states = states
+        self.delta = delta
+        self.outputs = outputs
+        self.lengths = array('i', (len(p) for p in encoded))
+        self.compile_ms = (time.perf_counter() - started) * 1000
+
+    def nbytes(self):
+        """Approximate resident size of the compiled tables"""
+        size = self.delta.itemsize * len(self.delta) + len(self.classes) + 4 * len(self.lengths)
+        size += sys.getsizeof(self.outputs) + sum(sys.getsizeof(ids) for ids in self.outputs.values())
+        return size + sum(sys.getsizeof(p) for p in self.patterns)
+
+    def describe(self, handle):
+        return {
+            'handle': handle,
+            'patterns': len(self.patterns),
+            'case_sensitive': self.case_sensitive,
+            'states': self.states,
+            'alphabet_classes': self.width,
+            'bytes': self.nbytes(),
+            'compile_ms': round(self.compile_ms, 3)
+        }
+
+
+class AutomatonScanner:
+    """Feeds text through an automaton chunk by chunk, carrying state across chunks"""
+
+    def __init__(self, automaton):
+        self.automaton = automaton
+        self.row = 0
+        self.position = 0
+        self.matches = 0
+
+    def feed(self, chunk):
+        """Scan the next bytes; returns [(start offset, pattern id), ...] found in them"""
+        automaton = self.automaton
+        delta, outputs, lengths = automaton.delta, automaton.outputs, automaton.lengths
+        found = []
+        row, base = self.row, self.position
+        for i, code in enumerate(chunk.translate(automaton.classes)):
+            row = delta[row + code]
+            if row in outputs:
+                end = base + i + 1
+                for pattern_id in outputs[row]:
+                    found.append((end - lengths[pattern_id], pattern_id))
+        self.row = row
+        self.position = base + len(chunk)
+        self.matches += len(found)
+        return found
+
+
+class AutomatonCache:
+    """Thread-safe LRU of compiled automata bounded by their table bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.compiles = 0
+        self.evictions = 0
+
+    def get(self, handle):
+        with self.lock:
+            automaton = self.entries.get(handle)
+            if automaton is not None:
+                self.entries.move_to_end(handle)
+            return automaton
+
+    def compile(self, patterns, case_sensitive=True):
+        """Return ``(handle, automaton, reused)``, compiling only on a miss"""
+        handle = automaton_handle(patterns, case_sensitive)
+        automaton = self.get(handle)
+        if automaton is not None:
+            self.hits += 1
+            return handle, automaton, True
+
+        automaton = AhoCorasick(patterns, case_sensitive, max_table_bytes=self.max_bytes)
+        size = automaton.nbytes()
+        if size > self.max_bytes:
+            raise AutomatonTooLarge(size, self.max_bytes)
+        with self.lock:
+            self.compiles += 1
+            if handle not in self.entries:
+                self.entries[handle] = automaton
+                self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted.nbytes()
+                self.evictions += 1
+        return handle, automaton, False
+
+    def evict(self, handle):
+        with self.lock:
+            automaton = self.entries.pop(handle, None)
+            if automaton is not None:
+                self.bytes -= automaton.nbytes()
+            return automaton is not None
+
+    def stats(self):
+        with self.lock:
+            return {
+                'automata': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'compiles': self.compiles,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,197 @@
+"""
+Backtracking engine for Algorithm Playground
+
+The ``backtracking`` catalog entries as step generators (see engines.steps).
+Boards are never copied into the steps: clients rebuild the state from
+PLACE/REMOVE/SWAP events and FOUND marks each complete solution.
+"""
+
+from engines.steps import SWAP, PLACE, REMOVE, FOUND
+
+MAX_QUEENS = 16
+MAX_PERMUTATION_SIZE = 12
+MAX_COMBINATION_SIZE = 30
+
+
+def nqueens(n, first_only=False):
+    """Place n queens row by row; PLACE/REMOVE carry (row, column)"""
+    cols, diag, anti = set(), set(), set()
+    board = [-1] * n
+    found = {'solutions': 0, 'first': None}
+
+    def place(row):
+        if row == n:
+            found['solutions'] += 1
+            if found['first'] is None:
+                found['first'] = list(board)
+            yield (FOUND, found['solutions'], 0)
+            return
+        for col in range(n):
+            if col in cols or row - col in diag or row + col in anti:
+                continue
+            board[row] = col
+            cols.add(col)
+            diag.add(row - col)
+            anti.add(row + col)
+            yield (PLACE, row, col)
+            yield from place(row + 1)
+            if first_only and found['first'] is not None:
+                return
+            cols.discard(col)
+            diag.discard(row - col)
+            anti.discard(row + col)
+            board[row] = -1
+            yield (REMOVE, row, col)
+
+    yield from place(0)
+    return found
+
+
+def sudoku(grid):
+    """Solve a 9x9 sudoku; PLACE/REMOVE carry (cell index, digit)"""
+    cells = [value for row in grid for value in row]
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i, value in enumerate(cells):
+        if value:
+            r, c = divmod(i, 9)
+            bit = 1 << value
+            if (rows[r] | cols[c] | boxes[r // 3 * 3 + c // 3]) & bit:
+                raise ValueError('Sudoku grid contradicts itself')
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[r // 3 * 3 + c // 3] |= bit
+    empty = [i for i, value in enumerate(cells) if not value]
+
+    def solve(k):
+        if k == len(empty):
+            return True
+        i = empty[k]
+        r, c = divmod(i, 9)
+        b = r // 3 * 3 + c // 3
+        used = rows[r] | cols[c] | boxes[b]
+        for digit in range(1, 10):
+            bit = 1 << digit
+            if used & bit:
+                continue
+            cells[i] = digit
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            yield (PLACE, i, digit)
+            if (yield from solve(k + 1)):
+                return True
+            rows[r] &= ~bit
+            cols[c] &= ~bit
+            boxes[b] &= ~bit
+            cells[i] = 0
+            yield (REMOVE, i, digit)
+        return False
+
+    def run():
+        solved = yield from solve(0)
+        if solved:
+            yield (FOUND, 1, 0)
+        return {
+            'solved': solved,
+            'grid': [cells[r * 9:r * 9 + 9] for r in range(9)] if solved else None
+        }
+
+    # The givens are checked above, before the first step is requested
+    return run()
+
+
+def permutations(a):
+    """Generate all permutations by swapping each element into place"""
+    n = len(a)
+    found = {'count': 0}
+
+    def permute(k):
+        if k == n:
+            found['count'] += 1
+            yield (FOUND, found['count'], 0)
+            return
+        for i in range(k, n):
+            if i != k:
+                a[k], a[i] = a[i], a[k]
+                yield (SWAP, k, i)
+            yield from permute(k + 1)
+            if i != k:
+                a[k], a[i] = a[i], a[k]
+                yield (SWAP, k, i)
+
+    yield from permute(0)
+    return found
+
+
+def combinations(a, r):
+    """Choose r of the array's positions; PLACE/REMOVE carry (slot, array index)"""
+    n = len(a)
+    found = {'count': 0}
+
+    def choose(slot, start):
+        if slot == r:
+            found['count'] += 1
+            yield (FOUND, found['count'], 0)
+            return
+        for i in range(start, n - (r - slot) + 1):
+            yield (PLACE, slot, i)
+            yield from choose(slot + 1, i + 1)
+            yield (REMOVE, slot, i)
+
+    yield from choose(0, 0)
+    return found
+
+
+# ==================== INPUT HANDLING ====================
+
+def _bounded_int(data, key, low, high):
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise ValueError(f"'{key}' must be an integer between {low} and {high}")
+    return value
+
+
+def _bounded_list(data, key, limit):
+    values = data.get(key)
+    if not isinstance(values, list) or len(values) > limit:
+        raise ValueError(f"'{key}' must be a list of at most {limit} items")
+    return values
+
+
+def _sudoku_grid(data):
+    grid = data.get('grid')
+    if (not isinstance(grid, list) or len(grid) != 9
+            or any(not isinstance(row, list) or len(row) != 9 for row in grid)
+            or any(isinstance(v, bool) or not isinstance(v, int) or not 0 <= v <= 9 for row in grid for v in row)):
+        raise ValueError("'grid' must be 9 lists of 9 digits (0 for blanks)")
+    return grid
+
+
+BACKTRACKING_ALGORITHMS = {
+    'nqueens': lambda data: nqueens(_bounded_int(data, 'n', 1, MAX_QUEENS),
+                                    bool(data.get('first_only', False))),
+    'sudoku': lambda data: sudoku(_sudoku_grid(data)),
+    'permutations': lambda data: permutations(_bounded_list(data, 'array', MAX_PERMUTATION_SIZE)),
+    'combinations': lambda data: combinations(
+        _bounded_list(data, 'array', MAX_COMBINATION_SIZE),
+        _bounded_int(data, 'r', 0, len(data.get('array') or ())))
+}
+
+
+def backtracking_steps(algorithm, data):
+    """Validate a request body and return the step generator for it"""
+    return BACKTRACKING_ALGORITHMS[algorithm](data)
+
+
+def backtracking_report(algorithm, result, counts, elapsed_ms):
+    """Shape a finished backtracking search for the API"""
+    return {
+        'algorithm': algorithm,
+        'result': result,
+        'placements': counts[PLACE] + counts[SWAP],
+        'backtracks': counts[REMOVE],
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+
@@ -0,0 +1,154 @@
+"""
+Benchmark runner for Algorithm Playground
+
+Times runnable catalog entries across a sweep of input sizes and input
+distributions, repeating each run and summarizing the timings.
+"""
+
+import math
+import random
+import statistics
+import time
+
+from engines.steps import ExecutionTimeout, run_steps
+from engines.sorting import SORTING_ALGORITHMS, sort_steps
+from engines.searching import SEARCHING_ALGORITHMS, search_steps
+
+DEFAULT_SIZES = [100, 500, 1000, 2000]
+DEFAULT_REPEATS = 5
+MAX_REPEATS = 25
+
+
+# ==================== INPUT GENERATORS ====================
+
+def _random(n, rng):
+    return [rng.randint(0, 10 * n) for _ in range(n)]
+
+
+def _sorted(n, rng):
+    return sorted(_random(n, rng))
+
+
+def _reversed(n, rng):
+    return sorted(_random(n, rng), reverse=True)
+
+
+def _few_unique(n, rng):
+    keys = [rng.randint(0, 10 * n) for _ in range(max(1, min(n, 8)))]
+    return [rng.choice(keys) for _ in range(n)]
+
+
+DISTRIBUTIONS = {
+    'random': _random,
+    'sorted': _sorted,
+    'reversed': _reversed,
+    'few_unique': _few_unique
+}
+
+
+def _sorting_steps(algorithm, values, rng):
+    return sort_steps(algorithm, values)
+
+
+def _searching_steps(algorithm, values, rng):
+    # Searches need sorted input; the distribution only shapes the key spread
+    values = sorted(values)
+    target = rng.choice(values) if values else 0
+    return search_steps(algorithm, values, target)
+
+
+BENCHMARKABLE = {
+    'sorting': (SORTING_ALGORITHMS, _sorting_steps),
+    'searching': (SEARCHING_ALGORITHMS, _searching_steps)
+}
+
+
+# ==================== STATISTICS ====================
+
+def summarize(samples):
+    """Median, p95 (nearest rank), mean and standard deviation of timings in ms"""
+    ordered = sorted(samples)
+    p95_rank = max(math.ceil(0.95 * len(ordered)) - 1, 0)
+    return {
+        'runs': len(ordered),
+        'median_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[p95_rank], 4),
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'stddev_ms': round(statistics.stdev(ordered), 4) if len(ordered) > 1 else 0.0
+    }
+
+
+def fit_power_law(sizes, times):
+    """Least-squares fit of t = c * n^k on a log-log scale.
+
+    Returns None when fewer than two usable points are available.
+    """
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    xs, ys = zip(*points)
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+    return {
+        'exponent': round(exponent, 3),
+        'coefficient': math.exp(mean_y - exponent * mean_x)
+    }
+
+
+# ==================== RUNNER ====================
+
+def run_benchmark(category, algorithms, sizes=None, distributions=None,
+                  repeats=DEFAULT_REPEATS, seed=0, budget_ms=None):
+    """Benchmark ``algorithms`` of one category.
+
+    Every (algorithm, distribution) series runs its sizes in ascending order
+    and stops early when a run exceeds what is left of ``budget_ms``.
+    """
+    registry, make_steps = BENCHMARKABLE[category]
+    sizes = sorted(set(sizes or DEFAULT_SIZES))
+    distributions = distributions or list(DISTRIBUTIONS)
+    deadline = time.perf_counter() + budget_ms / 1000 if budget_ms else None
+    truncated = False
+    results = {}
+
+    for algorithm in algorithms:
+        per_distribution = {}
+        for distribution in distributions:
+            rng = random.Random(f'{seed}:{distribution}')
+            series = []
+            for n in sizes:
+                samples = []
+                try:
+                    for _ in range(repeats):
+                        values = DISTRIBUTIONS[distribution](n, rng)
+                        remaining_ms = None
+                        if deadline is not None:
+                            remaining_ms = (deadline - time.perf_counter()) * 1000
+                            if remaining_ms <= 0:
+                                raise ExecutionTimeout(budget_ms, 0)
+                        _, _, elapsed_ms = run_steps(make_steps(algorithm, values, rng), remaining_ms)
+                        samples.append(elapsed_ms)
+                except ExecutionTimeout:
+                    truncated = True
+                    series.append({'n': n, 'timed_out': True})
+                    break
+                series.append({'n': n, **summarize(samples)})
+
+            timed = [point for point in series if not point.get('timed_out')]
+            per_distribution[distribution] = {
+                'series': series,
+                'growth': fit_power_law([p['n'] for p in timed], [p['median_ms'] for p in timed])
+            }
+        results[algorithm] = per_distribution
+
+    return {
+        'category': category,
+        'sizes': sizes,
+        'repeats': repeats,
+        'seed': seed,
+        'truncated': truncated,
+        'results': results
+    }
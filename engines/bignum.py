@@ -0,0 +1,246 @@
+"""
+Big-number engine for fibonacci_matrix and modular_exponentiation
+
+Fibonacci uses fast doubling, F(2k) = F(k)(2F(k+1) - F(k)) and
+F(2k+1) = F(k)^2 + F(k+1)^2, which is the matrix-power method with the
+redundant half of each 2x2 product removed: O(log n) big multiplications.
+Modular exponentiation uses the builtin three-argument ``pow`` or an
+explicit left-to-right sliding-window ladder whose square/multiply
+counts are reported.
+
+Results are never turned into a decimal string unless asked for, because
+int -> str is quadratic in CPython. ``format_result`` offers:
+
+    digits     decimal digit count (one power of ten, no conversion)
+    hex        hexadecimal (linear time)
+    head_tail  digit count plus the first and last k decimal digits
+    decimal    every digit, capped in size; produced through the decimal
+               module so the interpreter's int_max_str_digits guard is
+               left alone
+
+``to_binary`` gives the raw big-endian magnitude for downloads.
+"""
+
+import decimal
+import math
+import re
+import time
+
+LOG10_2 = math.log10(2)
+MAX_WINDOW = 8
+FORMATS = ('digits', 'hex', 'head_tail', 'decimal', 'binary')
+MAX_HEAD_TAIL_DIGITS = 1000
+DECIMAL_INT = re.compile(r'^[+-]?[0-9]+$')
+
+
+# ==================== FIBONACCI ====================
+
+def fibonacci(n, mod=None):
+    """F(n) by fast doubling over the bits of n, optionally reduced mod m"""
+    if n == 0:
+        return 0
+    bits = bin(n)[2:]
+    a, b = 0, 1  # F(k), F(k + 1) for k = the bits of n read so far
+    for bit in bits[:-1]:
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        if mod is not None:
+            c, d = c % mod, d % mod
+        a, b = (d, c + d) if bit == '1' else (c, d)
+    # The last step only needs one of F(2k), F(2k + 1): skip the largest product
+    value = a * a + b * b if bits[-1] == '1' else a * ((b << 1) - a)
+    return value % mod if mod is not None else value
+
+
+# ==================== MODULAR EXPONENTIATION ====================
+
+def default_window(exponent_bits):
+    """Window width minimising multiplications for an exponent of this size"""
+    for width, limit in ((1, 24), (3, 80), (4, 240), (5, 672), (6, 1792), (7, 4608)):
+        if exponent_bits <= limit:
+            return width
+    return MAX_WINDOW
+
+
+def sliding_window_pow(base, exponent, modulus, deadline, window=None):
+    """Left-to-right sliding-window exponentiation; returns (result, squarings, multiplications)"""
+    if exponent < 0:
+        base, exponent = pow(base, -1, modulus), -exponent
+    base %= modulus
+    bits = bin(exponent)[2:] if exponent else ''
+    window = window or default_window(len(bits))
+
+    # base^1, base^3, ..., base^(2^window - 1)
+    square = base * base % modulus
+    odd = [base]
+    for _ in range((1 << (window - 1)) - 1):
+        odd.append(odd[-1] * square % modulus)
+    multiplications = len(odd)
+    squarings = 1
+
+    result, i = 1 % modulus, 0
+    while i < len(bits):
+        deadline.check(i)
+        if bits[i] == '0':
+            result = result * result % modulus
+            squarings += 1
+            i += 1
+            continue
+        j = min(i + window, len(bits))
+        while bits[j - 1] == '0':
+            j -= 1
+        for _ in range(j - i):
+            result = result * result % modulus
+        squarings += j - i
+        result = result * odd[int(bits[i:j], 2) >> 1] % modulus
+        multiplications += 1
+        i = j
+    return result, squarings, multiplications
+
+
+# ==================== OUTPUT FORMATS ====================
+
+def decimal_digits(x):
+    """Number of decimal digits of |x| and 10**(digits - 1), without converting x"""
+    x = abs(x)
+    if x < 10:
+        return 1, 1
+    estimate = int((x.bit_length() - 1) * LOG10_2) + 1
+    power = 10 ** (estimate - 1)
+    if power > x:
+        return estimate - 1, power // 10
+    if power * 10 <= x:
+        return estimate + 1, power * 10
+    return estimate, power
+
+
+def _exact_context():
+    return decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+
+def to_decimal_string(x):
+    """Exact decimal text of x via the decimal module (not bound by int_max_str_digits)"""
+    return format(_exact_context().create_decimal(x), 'f')
+
+
+def format_result(x, fmt, k=20, max_decimal_digits=None):
+    """Shape a big result for JSON without a full decimal conversion unless fmt='decimal'"""
+    out = {'bit_length': x.bit_length(), 'negative': x < 0}
+    if fmt == 'hex':
+        out['hex'] = hex(x)
+        return out
+    digits, power = decimal_digits(x)
+    out['digits'] = digits
+    if fmt == 'head_tail':
+        magnitude = abs(x)
+        if digits <= 2 * k:
+            out['head'] = out['tail'] = str(magnitude)
+        else:
+            out['head'] = str(magnitude // (power // 10 ** (k - 1)))
+            out['tail'] = str(magnitude % 10 ** k).zfill(k)
+    elif fmt == 'decimal':
+        if max_decimal_digits is not None and digits > max_decimal_digits:
+            raise ValueError(f'Result has {digits} digits; decimal output is limited to '
+                             f'{max_decimal_digits} (use hex, head_tail or binary)')
+        out['decimal'] = to_decimal_string(x)
+    return out
+
+
+def to_binary(x):
+    """Big-endian magnitude bytes of x"""
+    magnitude = abs(x)
+    return magnitude.to_bytes(max(1, (magnitude.bit_length() + 7) // 8), 'big')
+
+
+# ==================== RUNS ====================
+
+def parse_big_int(value, name, max_chars):
+    """Accept a JSON integer or a decimal / 0x-hex string of bounded length"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and 0 < len(value) <= max_chars:
+        # Long decimal strings go through the decimal module: int() refuses
+        # more than sys.get_int_max_str_digits() of them
+        if DECIMAL_INT.match(value):
+            return int(_exact_context().create_decimal(value))
+        try:
+            return int(value, 0)
+        except ValueError:
+            pass
+    raise ValueError(f"'{name}' must be an integer or a decimal / 0x-hex string of at most {max_chars} characters")
+
+
+def check_bignum_request(algorithm, data, limits):
+    """Validate a request; returns (params, format, k).
+
+    ``max_cost`` bounds modulus_bits**2 * exponent_bits: CPython reduces
+    modulo a big number by schoolbook division, so that product tracks the
+    running time of one modular exponentiation.
+    """
+    max_fib_n, max_result_bits, max_chars, max_cost = limits
+    fmt = data.get('format', 'head_tail')
+    if fmt not in FORMATS:
+        raise ValueError(f"'format' must be one of {', '.join(FORMATS)}")
+    k = data.get('digits', 20)
+    if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_HEAD_TAIL_DIGITS:
+        raise ValueError(f"'digits' must be an integer between 1 and {MAX_HEAD_TAIL_DIGITS}")
+
+    if algorithm == 'fibonacci_matrix':
+        n = data.get('n')
+        if isinstance(n, bool) or not isinstance(n, int) or not 0 <= n <= max_fib_n:
+            raise ValueError(f"'n' must be an integer between 0 and {max_fib_n}")
+        params = {'n': n}
+        if data.get('mod') is not None:
+            params['mod'] = parse_big_int(data['mod'], 'mod', max_chars)
+            if params['mod'] < 1:
+                raise ValueError("'mod' must be positive")
+            # about five products reduced mod m per bit of n
+            if params['mod'].bit_length() ** 2 * 5 * n.bit_length() > max_cost:
+                raise ValueError("'mod' is too large for this n")
+        return params, fmt, k
+
+    params = {name: parse_big_int(data.get(name), name, max_chars) for name in ('base', 'exponent')}
+    params['method'] = data.get('method', 'builtin')
+    if params['method'] not in ('builtin', 'sliding_window'):
+        raise ValueError("'method' must be 'builtin' or 'sliding_window'")
+    window = data.get('window')
+    if window is not None:
+        if isinstance(window, bool) or not isinstance(window, int) or not 1 <= window <= MAX_WINDOW:
+            raise ValueError(f"'window' must be an integer between 1 and {MAX_WINDOW}")
+        params['window'] = window
+    if data.get('modulus') is not None:
+        params['modulus'] = parse_big_int(data['modulus'], 'modulus', max_chars)
+        if params['modulus'] < 1:
+            raise ValueError("'modulus' must be positive")
+        if params['exponent'] < 0 and math.gcd(params['base'], params['modulus']) != 1:
+            raise ValueError("A negative 'exponent' needs 'base' invertible modulo 'modulus'")
+        if params['modulus'].bit_length() ** 2 * abs(params['exponent']).bit_length() > max_cost:
+            raise ValueError(f'modulus_bits**2 * exponent_bits must not exceed {max_cost}')
+    else:
+        if params['exponent'] < 0:
+            raise ValueError("A negative 'exponent' needs a 'modulus'")
+        if abs(params['base']).bit_length() * params['exponent'] > max_result_bits:
+            raise ValueError(f'Result would exceed {max_result_bits} bits; pass a modulus')
+    return params, fmt, k
+
+
+def run_bignum(algorithm, params, deadline):
+    """Compute one result; returns (value, report fields, compute_ms)"""
+    started = time.perf_counter()
+    if algorithm == 'fibonacci_matrix':
+        value = fibonacci(params['n'], params.get('mod'))
+        report = {'n': params['n'], 'method': 'fast_doubling'}
+    else:
+        base, exponent, modulus = params['base'], params['exponent'], params.get('modulus')
+        report = {'method': params['method']}
+        if modulus is None:
+            value = base ** exponent
+            report['method'] = 'exact'
+        elif params['method'] == 'sliding_window':
+            value, squarings, multiplications = sliding_window_pow(base, exponent, modulus, deadline,
+                                                                   params.get('window'))
+            report.update(window=params.get('window') or default_window(abs(exponent).bit_length()),
+                          squarings=squarings, multiplications=multiplications)
+        else:
+            value = pow(base, exponent, modulus)
+    return value, report, (time.perf_counter() - started) * 1000
@@ -0,0 +1,70 @@
+"""
+Bit manipulation engine for Algorithm Playground
+
+The exponential ``bit`` catalog entries as step generators (see
+engines.steps). FOUND carries (sequence number, bitmask) for each output.
+"""
+
+from engines.steps import FOUND
+
+MAX_SUBSET_SIZE = 30
+MAX_GRAY_CODE_BITS = 30
+# Outputs are only returned in full up to this many entries
+MAX_LISTED_OUTPUTS = 1024
+
+
+def subset_generation(a):
+    """Enumerate every subset of ``a`` as the bitmask of chosen positions"""
+    n = len(a)
+    listed = []
+    for mask in range(1 << n):
+        yield (FOUND, mask, mask)
+        if len(listed) < MAX_LISTED_OUTPUTS:
+            listed.append([a[i] for i in range(n) if mask >> i & 1])
+    return {'count': 1 << n, 'subsets': listed, 'truncated': (1 << n) > len(listed)}
+
+
+def gray_code(bits):
+    """Reflected binary Gray code: code i is i ^ (i >> 1)"""
+    listed = []
+    for i in range(1 << bits):
+        code = i ^ (i >> 1)
+        yield (FOUND, i, code)
+        if len(listed) < MAX_LISTED_OUTPUTS:
+            listed.append(code)
+    return {'count': 1 << bits, 'codes': listed, 'truncated': (1 << bits) > len(listed)}
+
+
+def _subset_input(data):
+    values = data.get('array')
+    if not isinstance(values, list) or len(values) > MAX_SUBSET_SIZE:
+        raise ValueError(f"'array' must be a list of at most {MAX_SUBSET_SIZE} items")
+    return list(values)
+
+
+def _gray_code_bits(data):
+    bits = data.get('bits')
+    if isinstance(bits, bool) or not isinstance(bits, int) or not 0 <= bits <= MAX_GRAY_CODE_BITS:
+        raise ValueError(f"'bits' must be an integer between 0 and {MAX_GRAY_CODE_BITS}")
+    return bits
+
+
+BIT_ALGORITHMS = {
+    'subset_generation': lambda data: subset_generation(_subset_input(data)),
+    'gray_code': lambda data: gray_code(_gray_code_bits(data))
+}
+
+
+def bit_steps(algorithm, data):
+    """Validate a request body and return the step generator for it"""
+    return BIT_ALGORITHMS[algorithm](data)
+
+
+def bit_report(algorithm, result, counts, elapsed_ms):
+    """Shape a finished bit enumeration for the API"""
+    return {
+        'algorithm': algorithm,
+        'result': result,
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+
@@ -0,0 +1,176 @@
+"""
+Result cache for deterministic algorithm runs
+
+Finished responses (run reports and encoded traces) are cached as bytes,
+keyed by category, algorithm, a hash of the canonical input and the
+options that change the output. Entries are evicted least-recently-used
+once the cache holds more than its byte budget.
+
+Two backends are available: an in-process LRU, and a SQLite file that
+every gunicorn worker on the host can share.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CachedResult = namedtuple('CachedResult', ['mimetype', 'body', 'headers'])
+
+
+def cache_key(category, algorithm, data, options=None, ignore=()):
+    """Stable key for a run: canonical JSON of the input plus the output options"""
+    payload = {k: v for k, v in data.items() if k not in ignore}
+    canonical = json.dumps([category, algorithm, payload, options or {}],
+                           sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return f'{category}/{algorithm}/' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def entry_size(entry):
+    """Bytes an entry holds; a body kept as a live object declares its size in headers['nbytes']"""
+    return entry.headers['nbytes'] if 'nbytes' in entry.headers else len(entry.body)
+
+
+class MemoryBackend:
+    """In-process LRU of CachedResult entries bounded by total body bytes
+
+    Bodies are stored as given, so callers may keep objects other than
+    bytes here (see entry_size); they must not mutate a body once stored.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        size = entry_size(entry)
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= entry_size(old)
+            self.entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= entry_size(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def usage(self):
+        with self.lock:
+            return len(self.entries), self.bytes
+
+
+class SqliteBackend:
+    """LRU cache in a SQLite file shared by every worker process on the host"""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        with self._connection() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS results ('
+                       'key TEXT PRIMARY KEY, mimetype TEXT, headers TEXT, '
+                       'body BLOB, size INTEGER, accessed REAL)')
+            db.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    def _connection(self):
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self.local.db = db
+        return db
+
+    def get(self, key):
+        db = self._connection()
+        row = db.execute('SELECT mimetype, headers, body FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        with db:
+            db.execute('UPDATE results SET accessed = ? WHERE key = ?', (time.time(), key))
+        return CachedResult(row[0], bytes(row[2]), json.loads(row[1]))
+
+    def put(self, key, entry):
+        db = self._connection()
+        with db:
+            db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                       (key, entry.mimetype, json.dumps(entry.headers), entry.body,
+                        len(entry.body), time.time()))
+            total = db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total > self.max_bytes:
+                evicted = []
+                for old_key, size in db.execute('SELECT key, size FROM results ORDER BY accessed'):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((old_key,))
+                    total -= size
+                db.executemany('DELETE FROM results WHERE key = ?', evicted)
+
+    def clear(self):
+        db = self._connection()
+        with db:
+            db.execute('DELETE FROM results')
+
+    def usage(self):
+        row = self._connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        return row[0], row[1]
+
+
+class ResultCache:
+    """Byte-budgeted result cache with hit/miss accounting (per process)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, max_bytes, path=None):
+        if path:
+            return cls(SqliteBackend(path, max_bytes))
+        return cls(MemoryBackend(max_bytes))
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        if entry_size(entry) <= self.backend.max_bytes:
+            self.backend.put(key, entry)
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        entries, size = self.backend.usage()
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'sqlite' if isinstance(self.backend, SqliteBackend) else 'memory',
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.backend.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+        }
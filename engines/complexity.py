@@ -0,0 +1,190 @@
+"""
+Empirical complexity checker for Algorithm Playground
+
+Measures runnable catalog entries over a geometric sweep of n, fits the
+costs against candidate growth models and compares the best fit with the
+hand-written ``complexity``/``best``/``worst`` strings in the catalog.
+"""
+
+import math
+import random
+import re
+import statistics
+
+from engines.benchmark import DISTRIBUTIONS, BENCHMARKABLE
+from engines.steps import run_steps
+from engines.sorting import sort_steps
+from engines.searching import search_steps
+
+# Candidate models as log f(n), ordered from slowest to fastest growth
+MODELS = {
+    '1': lambda n: 0.0,
+    'log n': lambda n: math.log(math.log2(n)),
+    'sqrt n': lambda n: 0.5 * math.log(n),
+    'n': lambda n: math.log(n),
+    'n log n': lambda n: math.log(n) + math.log(math.log2(n)),
+    'n^2': lambda n: 2 * math.log(n),
+    'n^3': lambda n: 3 * math.log(n),
+    '2^n': lambda n: n * math.log(2)
+}
+
+# A claim still agrees when its fit is this close (in log units) to the best one
+AGREEMENT_TOLERANCE = 0.05
+
+DEFAULT_MIN_N = 64
+DEFAULT_MAX_N = 2048
+SEARCH_TARGETS_PER_SIZE = 32
+
+# A growth model needs at least this many sizes to be told apart from a constant
+MIN_SWEEP_SIZES = 3
+
+
+def parse_big_o(text):
+    """Map a catalog string such as 'O(n log n)' or 'O(n+k)' to a model name"""
+    if not text:
+        return None
+    match = re.search(r'O\((.*)\)', text)
+    if not match:
+        return None
+    expr = match.group(1).replace(' ', '').replace('²', '^2').replace('³', '^3')
+    expr = re.sub(r'log[₀-₉]*', 'log', expr)
+    aliases = {
+        '1': '1',
+        'logn': 'log n',
+        '√n': 'sqrt n',
+        'n': 'n',
+        'n+k': 'n',
+        'nk': 'n',
+        'nlogn': 'n log n',
+        'n^2': 'n^2',
+        'n^3': 'n^3',
+        '2^n': '2^n'
+    }
+    return aliases.get(expr)
+
+
+def fit_models(sizes, costs):
+    """Fit cost = c * f(n) for every model in log space.
+
+    Returns ``(best_model, residuals)`` where residuals are RMS errors of
+    log(cost) around each model's best constant.
+    """
+    residuals = {}
+    for name, log_f in MODELS.items():
+        try:
+            offsets = [math.log(cost) - log_f(n) for n, cost in zip(sizes, costs)]
+        except OverflowError:
+            continue
+        center = statistics.fmean(offsets)
+        residuals[name] = math.sqrt(statistics.fmean((o - center) ** 2 for o in offsets))
+    best = min(residuals, key=residuals.get)
+    return best, {name: round(r, 4) for name, r in residuals.items()}
+
+
+def _cost(steps, metric):
+    _, counts, elapsed_ms = run_steps(steps)
+    return elapsed_ms if metric == 'time' else max(sum(counts.values()), 1)
+
+
+def _sorting_series(algorithm, sizes, metric, repeats, seed):
+    """Cost per size for every input distribution"""
+    series = {}
+    for distribution, generate in DISTRIBUTIONS.items():
+        rng = random.Random(f'{seed}:{distribution}')
+        series[distribution] = [
+            statistics.median(_cost(sort_steps(algorithm, generate(n, rng)), metric)
+                              for _ in range(repeats))
+            for n in sizes
+        ]
+    return series
+
+
+def _searching_series(algorithm, sizes, metric, repeats, seed):
+    """Average cost per size over random present targets"""
+    rng = random.Random(seed)
+    costs = []
+    for n in sizes:
+        values = sorted(rng.randint(0, 10 * n) for _ in range(n))
+        samples = [_cost(search_steps(algorithm, values, rng.choice(values)), metric)
+                   for _ in range(SEARCH_TARGETS_PER_SIZE * repeats)]
+        costs.append(statistics.fmean(samples))
+    return {'random': costs}
+
+
+def _verdict(field, claim, sizes, costs):
+    fitted, residuals = fit_models(sizes, costs)
+    claimed = parse_big_o(claim)
+    agrees = None
+    if claimed in residuals:
+        agrees = residuals[claimed] <= residuals[fitted] + AGREEMENT_TOLERANCE
+    return {
+        'field': field,
+        'claimed': claim,
+        'claimed_model': claimed,
+        'fitted': fitted,
+        'agrees': agrees,
+        'residuals': residuals
+    }
+
+
+def sweep_sizes(min_n, max_n):
+    """min_n, 2 * min_n, ... up to max_n; ValueError if that is too few to fit"""
+    sizes = []
+    n = min_n
+    while 0 < n <= max_n:
+        sizes.append(n)
+        n *= 2
+    if len(sizes) < MIN_SWEEP_SIZES:
+        raise ValueError(f'max_n must be at least {max(min_n, 1) << (MIN_SWEEP_SIZES - 1)} '
+                         f'(min_n {min_n} doubled to {MIN_SWEEP_SIZES} sizes)')
+    return sizes
+
+
+def check_algorithm(category, algorithm, info, min_n=DEFAULT_MIN_N, max_n=DEFAULT_MAX_N,
+                    metric='steps', repeats=1, seed=0):
+    """Measure one algorithm and check its catalog claims.
+
+    Sorting claims are checked against the distributions: ``complexity``
+    against random input, ``best``/``worst`` against the cheapest and most
+    expensive distribution at the largest n. Searching only checks
+    ``complexity``, averaged over random targets that are present.
+    """
+    sizes = sweep_sizes(min_n, max_n)
+
+    if category == 'sorting':
+        series = _sorting_series(algorithm, sizes, metric, repeats, seed)
+        cheapest = min(series, key=lambda d: series[d][-1])
+        dearest = max(series, key=lambda d: series[d][-1])
+        cases = [('complexity', 'random'), ('best', cheapest), ('worst', dearest)]
+    else:
+        series = _searching_series(algorithm, sizes, metric, repeats, seed)
+        cases = [('complexity', 'random')]
+
+    verdicts = []
+    for field, distribution in cases:
+        verdict = _verdict(field, info.get(field), sizes, series[distribution])
+        verdict['distribution'] = distribution
+        verdicts.append(verdict)
+    return {'category': category, 'algorithm': algorithm, 'sizes': sizes, 'verdicts': verdicts}
+
+
+def check_catalog(database, categories=None, **options):
+    """Run check_algorithm over every runnable entry of the catalog.
+
+    Raises ValueError for an unknown category, a sweep too short to fit or
+    fewer than one repeat, before anything is measured.
+    """
+    categories = list(categories or BENCHMARKABLE)
+    unknown = [c for c in categories if c not in BENCHMARKABLE]
+    if unknown:
+        raise ValueError(f"Unknown category {', '.join(unknown)}; "
+                         f"choose from {', '.join(BENCHMARKABLE)}")
+    sweep_sizes(options.get('min_n', DEFAULT_MIN_N), options.get('max_n', DEFAULT_MAX_N))
+    repeats = options.get('repeats', 1)
+    if isinstance(repeats, bool) or not isinstance(repeats, int) or repeats < 1:
+        raise ValueError('repeats must be a positive integer')
+    reports = []
+    for category in categories:
+        for algorithm in BENCHMARKABLE[category][0]:
+            reports.append(check_algorithm(category, algorithm, database[category][algorithm], **options))
+    return reports
@@ -0,0 +1,210 @@
+"""
+Explicit-stack depth-first search engine for CSR graphs
+
+``dfs_walk`` replays a recursive DFS without recursion: a call stack of
+vertices plus a per-vertex cursor into the CSR adjacency stand in for the
+Python frames, so graph depth is limited by memory, not the recursion
+limit. It is a step generator (see engines.steps) emitting, in exactly the
+order a recursive DFS would:
+
+    (DISCOVER, v, parent)   v is entered (parent == v for a root)
+    (EDGE, u, v)            u sees the already discovered vertex v
+    (FINISH, v, parent)     v returns to its parent
+
+Tree edges are implied by DISCOVER. The algorithms below consume these
+events instead of each carrying its own traversal, and re-yield them so
+the whole run can be counted, traced or stopped like any other engine.
+"""
+
+from array import array
+
+from engines.steps import DISCOVER, EDGE, FINISH
+
+
+def dfs_walk(graph, roots=None, skip_parent_edge=None):
+    """Step generator over a DFS forest; returns the number of trees.
+
+    ``roots`` orders the start vertices (default: 0..V-1). On undirected
+    graphs the edge a vertex was discovered through is not reported back
+    to it; ``skip_parent_edge`` overrides that. Parallel edges have their
+    own ids, so they still appear as EDGE events.
+    """
+    offsets, targets, edge_ids = graph.offsets, graph.targets, graph.edge_ids
+    if skip_parent_edge is None:
+        skip_parent_edge = not graph.directed
+    cursor = graph.offsets[:-1]
+    seen = bytearray(graph.vertices)
+    parent_edge = array('i', [-1]) * graph.vertices
+    trees = 0
+
+    for root in range(graph.vertices) if roots is None else roots:
+        if seen[root]:
+            continue
+        seen[root] = 1
+        trees += 1
+        yield (DISCOVER, root, root)
+        call = [root]
+        while call:
+            u = call[-1]
+            slot = cursor[u]
+            if slot < offsets[u + 1]:
+                cursor[u] = slot + 1
+                if skip_parent_edge and edge_ids[slot] == parent_edge[u]:
+                    continue
+                v = targets[slot]
+                if seen[v]:
+                    yield (EDGE, u, v)
+                else:
+                    seen[v] = 1
+                    parent_edge[v] = edge_ids[slot]
+                    call.append(v)
+                    yield (DISCOVER, v, u)
+            else:
+                call.pop()
+                yield (FINISH, u, call[-1] if call else u)
+    return trees
+
+
+def _components(component, count):
+    members = [[] for _ in range(count)]
+    for v, c in enumerate(component):
+        members[c].append(v)
+    return {'count': count, 'components': members}
+
+
+def dfs_traversal(graph, options):
+    """Plain DFS: preorder, postorder and parents; stops early at an optional target"""
+    start = graph.vertex(options.get('start', 0), 'start')
+    target = options.get('target')
+    if target is not None:
+        target = graph.vertex(target, 'target')
+    parent = array('i', [-1]) * graph.vertices
+    preorder, postorder = array('i'), array('i')
+    roots = [start] if target is not None else [start] + list(range(graph.vertices))
+
+    walk = dfs_walk(graph, roots)
+    for step in walk:
+        yield step
+        op, a, b = step
+        if op == DISCOVER:
+            parent[a] = b
+            preorder.append(a)
+            if a == target:
+                walk.close()
+                break
+        elif op == FINISH:
+            postorder.append(a)
+
+    result = {'preorder': preorder.tolist(), 'postorder': postorder.tolist()}
+    if target is not None:
+        path = []
+        if parent[target] >= 0:
+            path.append(target)
+            while path[-1] != start:
+                path.append(parent[path[-1]])
+            path.reverse()
+        result.update(found=bool(path), path=path)
+    return result
+
+
+def scc_tarjan(graph, options):
+    """Tarjan's SCC: lowlinks over DISCOVER/EDGE/FINISH events"""
+    vertices = graph.vertices
+    index = array('i', [-1]) * vertices
+    low = array('i', bytes(4 * vertices))
+    on_stack = bytearray(vertices)
+    component = array('i', [-1]) * vertices
+    pending = []
+    counter = count = 0
+
+    for step in dfs_walk(graph):
+        yield step
+        op, a, b = step
+        if op == DISCOVER:
+            index[a] = low[a] = counter
+            counter += 1
+            pending.append(a)
+            on_stack[a] = 1
+        elif op == EDGE:
+            if on_stack[b] and index[b] < low[a]:
+                low[a] = index[b]
+        else:
+            if low[a] < low[b]:
+                low[b] = low[a]
+            if low[a] == index[a]:
+                while True:
+                    w = pending.pop()
+                    on_stack[w] = 0
+                    component[w] = count
+                    if w == a:
+                        break
+                count += 1
+    return _components(component, count)
+
+
+def scc_kosaraju(graph, options):
+    """Kosaraju's SCC: finish order on G, then DFS trees of the transpose"""
+    order = array('i')
+    for step in dfs_walk(graph):
+        yield step
+        if step[0] == FINISH:
+            order.append(step[1])
+
+    component = array('i', [-1]) * graph.vertices
+    count = -1
+    for step in dfs_walk(graph.transpose(), reversed(order)):
+        yield step
+        op, a, b = step
+        if op == DISCOVER:
+            if a == b:
+                count += 1
+            component[a] = count
+    return _components(component, count + 1)
+
+
+def lowlinks(graph):
+    """Step generator returning ``(bridges, is_cut)`` of an undirected graph"""
+    vertices = graph.vertices
+    disc = array('i', [-1]) * vertices
+    low = array('i', bytes(4 * vertices))
+    is_cut = bytearray(vertices)
+    bridges = []
+    clock = root = children = 0
+
+    for step in dfs_walk(graph):
+        yield step
+        op, a, b = step
+        if op == DISCOVER:
+            disc[a] = low[a] = clock
+            clock += 1
+            if a == b:
+                root, children = a, 0
+            elif b == root:
+                children += 1
+        elif op == EDGE:
+            if disc[b] < low[a]:
+                low[a] = disc[b]
+        elif a == b:
+            if children >= 2:
+                is_cut[a] = 1
+        else:
+            if low[a] < low[b]:
+                low[b] = low[a]
+            if low[a] > disc[b]:
+                bridges.append([b, a])
+            if b != root and low[a] >= disc[b]:
+                is_cut[b] = 1
+    return bridges, is_cut
+
+
+def bridge_finding(graph, options):
+    """Edges whose removal disconnects the graph"""
+    bridges, _ = yield from lowlinks(graph)
+    return {'count': len(bridges), 'bridges': bridges}
+
+
+def articulation_point(graph, options):
+    """Vertices whose removal disconnects the graph"""
+    _, is_cut = yield from lowlinks(graph)
+    points = [v for v in range(graph.vertices) if is_cut[v]]
+    return {'count': len(points), 'articulation_points': points}
@@ -0,0 +1,521 @@
+"""
+Linear-space dynamic programming engine
+
+The textbook tables for lcs, edit_distance, knapsack_01 and coin_change
+are O(mn) / O(nW); here every algorithm keeps only the rows its
+recurrence reads, in typed ``array`` buffers:
+
+    rolling     two rows (one for the knapsack family), value only
+    hirschberg  lcs / edit_distance: divide and conquer on the middle row,
+                reconstructing the full subsequence or edit script while
+                never holding more than three rows at once
+    bitparallel lcs / lps / edit_distance: one column per step over Python
+                big ints used as bit vectors (Allison-Dix / Hyyrö LCS,
+                Myers edit distance), O(mn / word size), value only
+    wavefront   lcs / lps with NumPy: every cell of an anti-diagonal (or,
+                for lps, of one substring length) in one vector operation
+
+Every run reports the high-water mark of DP storage live at any moment,
+next to what the full table would have needed. ``verify`` reruns the
+rolling baseline and reports whether the value is identical.
+"""
+
+import random
+import sys
+import time
+from array import array
+from itertools import repeat
+from operator import add
+
+from engines.steps import Deadline
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - exercised on installs without NumPy
+    np = None
+    HAVE_NUMPY = False
+
+
+class MemoryMeter:
+    """Byte accounting for DP rows: current live total and high-water mark"""
+
+    __slots__ = ('current', 'peak')
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def take(self, row):
+        self.current += _nbytes(row)
+        if self.current > self.peak:
+            self.peak = self.current
+        return row
+
+    def release(self, *rows):
+        for row in rows:
+            self.current -= _nbytes(row)
+
+    def charge(self, nbytes):
+        """Account for storage that is not a single row (e.g. bit-vector tables)"""
+        self.take(nbytes)
+
+
+def _nbytes(row):
+    if isinstance(row, int):
+        return row
+    if isinstance(row, array):
+        return row.itemsize * len(row)
+    if HAVE_NUMPY and isinstance(row, np.ndarray):
+        return row.nbytes
+    return sys.getsizeof(row) + sum(map(sys.getsizeof, row))
+
+
+def _zeros(n):
+    return array('i', bytes(4 * n))
+
+
+# ==================== LCS ====================
+
+def _lcs_row(a, b, meter, deadline):
+    """Last row of the LCS table of a against every prefix of b"""
+    n = len(b)
+    prev, cur = meter.take(_zeros(n + 1)), meter.take(_zeros(n + 1))
+    for i, x in enumerate(a):
+        for j, y in enumerate(b, 1):
+            if x == y:
+                cur[j] = prev[j - 1] + 1
+            elif prev[j] >= cur[j - 1]:
+                cur[j] = prev[j]
+            else:
+                cur[j] = cur[j - 1]
+        prev, cur = cur, prev
+        deadline.check(i)
+    meter.release(cur)
+    return prev
+
+
+def _lcs_split(a, b, out, meter, deadline):
+    if not a or not b:
+        return
+    if len(a) == 1:
+        if a in b:
+            out.append(a)
+        return
+    mid, n = len(a) // 2, len(b)
+    top = _lcs_row(a[:mid], b, meter, deadline)
+    bottom = _lcs_row(a[mid:][::-1], b[::-1], meter, deadline)
+    k = max(range(n + 1), key=lambda j: top[j] + bottom[n - j])
+    meter.release(top, bottom)
+    _lcs_split(a[:mid], b[:k], out, meter, deadline)
+    _lcs_split(a[mid:], b[k:], out, meter, deadline)
+
+
+def lcs(data, mode, meter, deadline):
+    a, b = data['a'], data['b']
+    if mode == 'rolling':
+        row = _lcs_row(a, b, meter, deadline)
+        return {'length': row[-1]}
+    if mode == 'bitparallel':
+        return {'length': _lcs_bits(a, b, meter, deadline)}
+    if mode == 'wavefront':
+        return {'length': _lcs_wavefront(a, b, meter, deadline)}
+    out = []
+    _lcs_split(a, b, out, meter, deadline)
+    subsequence = ''.join(out)
+    return {'length': len(subsequence), 'subsequence': subsequence}
+
+
+# ==================== EDIT DISTANCE ====================
+
+def _edit_row(a, b, meter, deadline):
+    """Last row of the Levenshtein table of a against every prefix of b"""
+    n = len(b)
+    prev, cur = meter.take(array('i', range(n + 1))), meter.take(_zeros(n + 1))
+    for i, x in enumerate(a, 1):
+        cur[0] = i
+        for j, y in enumerate(b, 1):
+            best = prev[j - 1] + (x != y)
+            if prev[j] + 1 < best:
+                best = prev[j] + 1
+            if cur[j - 1] + 1 < best:
+                best = cur[j - 1] + 1
+            cur[j] = best
+        prev, cur = cur, prev
+        deadline.check(i)
+    meter.release(cur)
+    return prev
+
+
+def _edit_split(a, b, out, meter, deadline):
+    """Append the edit script of a -> b: M match, S substitute, I insert, D delete"""
+    if not a:
+        out.append('I' * len(b))
+    elif not b:
+        out.append('D' * len(a))
+    elif len(a) == 1:
+        j = b.find(a)
+        if j < 0:
+            out.append('S' + 'I' * (len(b) - 1))
+        else:
+            out.append('I' * j + 'M' + 'I' * (len(b) - j - 1))
+    else:
+        mid, n = len(a) // 2, len(b)
+        top = _edit_row(a[:mid], b, meter, deadline)
+        bottom = _edit_row(a[mid:][::-1], b[::-1], meter, deadline)
+        k = min(range(n + 1), key=lambda j: top[j] + bottom[n - j])
+        meter.release(top, bottom)
+        _edit_split(a[:mid], b[:k], out, meter, deadline)
+        _edit_split(a[mid:], b[k:], out, meter, deadline)
+
+
+def edit_distance(data, mode, meter, deadline):
+    a, b = data['a'], data['b']
+    if mode == 'rolling':
+        row = _edit_row(a, b, meter, deadline)
+        return {'distance': row[-1]}
+    if mode == 'bitparallel':
+        return {'distance': _myers_distance(a, b, meter, deadline)}
+    out = []
+    _edit_split(a, b, out, meter, deadline)
+    script = ''.join(out)
+    counts = {op: script.count(op) for op in 'MSID'}
+    return {
+        'distance': counts['S'] + counts['I'] + counts['D'],
+        'operations': script,
+        'matches': counts['M'],
+        'substitutions': counts['S'],
+        'insertions': counts['I'],
+        'deletions': counts['D']
+    }
+
+
+# ==================== KNAPSACK / COINS ====================
+
+def _row_typecode(values):
+    return 'q' if all(isinstance(v, int) for v in values) else 'd'
+
+
+def knapsack_01(data, mode, meter, deadline):
+    """One row indexed by capacity; each item is a whole-row max against a shifted copy.
+
+    The shifted copy is taken from the old row before the row is updated,
+    which is what makes each item usable at most once.
+    """
+    weights, values, capacity = data['weights'], data['values'], data['capacity']
+    typecode = _row_typecode(values)
+    if HAVE_NUMPY:
+        best = meter.take(np.zeros(capacity + 1, dtype=np.int64 if typecode == 'q' else np.float64))
+        for i, (w, v) in enumerate(zip(weights, values)):
+            if w <= capacity:
+                shifted = meter.take(best[:capacity + 1 - w] + v)
+                np.maximum(best[w:], shifted, out=best[w:])
+                meter.release(shifted)
+            deadline.check(i)
+        return {'max_value': best[capacity].item()}
+
+    best = meter.take(array(typecode, bytes(8 * (capacity + 1))))
+    for i, (w, v) in enumerate(zip(weights, values)):
+        if w <= capacity:
+            shifted = meter.take(array(typecode, map(add, best[:capacity + 1 - w], repeat(v))))
+            best[w:] = array(typecode, [a if a >= b else b for a, b in zip(best[w:], shifted)])
+            meter.release(shifted)
+        deadline.check(i)
+    return {'max_value': best[capacity]}
+
+
+# Coins at least this large are swept a block of ``coin`` cells at a time
+BLOCK_SWEEP_MIN_COIN = 16
+
+
+def coin_change(data, mode, meter, deadline):
+    """Fewest coins (or number of ways) for every amount up to the target, in one row"""
+    coins, amount = data['coins'], data['amount']
+    if data.get('objective', 'min_coins') == 'ways':
+        ways = [1] + [0] * amount
+        for coin in coins:
+            for x in range(coin, amount + 1):
+                ways[x] += ways[x - coin]
+            deadline.check(coin)
+        meter.take(ways)
+        return {'ways': ways[amount]}
+
+    unreachable = amount + 1
+    fewest = meter.take(array('i', [unreachable]) * (amount + 1))
+    fewest[0] = 0
+    for coin in coins:
+        if coin > amount:
+            continue
+        if coin >= BLOCK_SWEEP_MIN_COIN:
+            # Cells in one block only read the block before, already final for this coin
+            for start in range(coin, amount + 1, coin):
+                end = min(start + coin, amount + 1)
+                fewest[start:end] = array('i', map(min, fewest[start:end],
+                                                   map(add, fewest[start - coin:end - coin], repeat(1))))
+        else:
+            for x in range(coin, amount + 1):
+                if fewest[x - coin] + 1 < fewest[x]:
+                    fewest[x] = fewest[x - coin] + 1
+        deadline.check(coin)
+    result = fewest[amount]
+    return {'min_coins': result if result < unreachable else None, 'reachable': result < unreachable}
+
+
+# ==================== BIT-PARALLEL KERNELS ====================
+
+def _match_masks(a, meter):
+    """Bit j of masks[c] is set where a[j] == c"""
+    bitmaps = {}
+    for j, c in enumerate(a):
+        bitmap = bitmaps.get(c)
+        if bitmap is None:
+            bitmap = bitmaps[c] = bytearray((len(a) + 7) // 8)
+        bitmap[j >> 3] |= 1 << (j & 7)
+    masks = {c: int.from_bytes(bitmap, 'little') for c, bitmap in bitmaps.items()}
+    meter.charge(sum(map(sys.getsizeof, masks.values())))
+    return masks
+
+
+def _lcs_bits(a, b, meter, deadline):
+    """Hyyrö's bit-vector LCS: zero bits of V count the LCS length"""
+    m = len(a)
+    if not m or not b:
+        return 0
+    masks = _match_masks(a, meter)
+    mask = (1 << m) - 1
+    v = mask
+    meter.charge(4 * sys.getsizeof(mask))  # v, u and the two sums
+    for k, y in enumerate(b):
+        u = v & masks.get(y, 0)
+        v = ((v + u) | (v - u)) & mask
+        if not k & 0xFF:
+            deadline.check(k)
+    return m - bin(v).count('1')
+
+
+def _myers_distance(a, b, meter, deadline):
+    """Myers / Hyyrö bit-parallel Levenshtein distance, one column of b per step"""
+    m = len(a)
+    if not m:
+        return len(b)
+    masks = _match_masks(a, meter)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    meter.charge(8 * sys.getsizeof(mask))  # pv, mv, eq, xv, xh, ph, mh, temporaries
+    for k, y in enumerate(b):
+        eq = masks.get(y, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # Row 0 of the table grows by one per column, hence the carried-in 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if not k & 0xFF:
+            deadline.check(k)
+    return score
+
+
+# ==================== WAVEFRONT KERNELS ====================
+
+def _codes(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _lcs_wavefront(a, b, meter, deadline):
+    """LCS by anti-diagonals d = i + j, each diagonal indexed by row i.
+
+    Cell (i, j) reads (i-1, j-1) on diagonal d-2 and (i-1, j), (i, j-1) on
+    d-1, so a whole diagonal is one vectorised step. Three diagonal
+    buffers rotate; their row-0 / column-0 cells are kept at zero.
+    """
+    m, n = len(a), len(b)
+    if not m or not n:
+        return 0
+    xa, xb = _codes(a), _codes(b[::-1])
+    older, old, cur = (meter.take(np.zeros(m + 1, dtype=np.int32)) for _ in range(3))
+    for d in range(2, m + n + 1):
+        lo, hi = max(1, d - n), min(m, d - 1)
+        # b[j - 1] for j = d - i is b reversed at n - d + i
+        equal = xa[lo - 1:hi] == xb[n - d + lo:n - d + hi + 1]
+        cur[lo:hi + 1] = np.where(equal, older[lo - 1:hi] + 1,
+                                  np.maximum(old[lo - 1:hi], old[lo:hi + 1]))
+        cur[0] = 0
+        if d <= m:
+            cur[d] = 0
+        older, old, cur = old, cur, older
+        if not d & 0xFF:
+            deadline.check(d)
+    return int(old[m])
+
+
+def _lps_wavefront(s, meter, deadline):
+    """Interval DP by substring length: L(i, l) from lengths l-1 and l-2 at once"""
+    n = len(s)
+    if n < 2:
+        return n
+    x = _codes(s)
+    shorter = meter.take(np.zeros(n + 1, dtype=np.int32))  # length l - 2
+    short = meter.take(np.ones(n + 1, dtype=np.int32))  # length l - 1
+    cur = meter.take(np.zeros(n + 1, dtype=np.int32))
+    for length in range(2, n + 1):
+        count = n - length + 1
+        equal = x[:count] == x[length - 1:]
+        cur[:count] = np.where(equal, shorter[1:count + 1] + 2,
+                               np.maximum(short[:count], short[1:count + 1]))
+        shorter, short, cur = short, cur, shorter
+        if not length & 0xFF:
+            deadline.check(length)
+    return int(short[0])
+
+
+def lps(data, mode, meter, deadline):
+    """Longest palindromic subsequence: LCS of s with its reverse, or the interval wavefront"""
+    s = data['s']
+    if mode == 'wavefront':
+        return {'length': _lps_wavefront(s, meter, deadline)}
+    if mode == 'bitparallel':
+        return {'length': _lcs_bits(s, s[::-1], meter, deadline)}
+    return {'length': _lcs_row(s, s[::-1], meter, deadline)[-1]}
+
+
+# ==================== REGISTRY ====================
+
+# Request fields holding the input strings, per string algorithm
+SEQUENCE_FIELDS = {'lcs': ('a', 'b'), 'edit_distance': ('a', 'b'), 'lps': ('s',)}
+
+# The scalar each algorithm is verified on
+VALUE_FIELDS = {'lcs': 'length', 'edit_distance': 'distance', 'lps': 'length',
+                'knapsack_01': 'max_value', 'coin_change': 'min_coins'}
+
+# name -> (function, supported modes; the first is the default)
+DP_ALGORITHMS = {
+    'lcs': (lcs, ('rolling', 'hirschberg', 'bitparallel', 'wavefront')),
+    'edit_distance': (edit_distance, ('rolling', 'hirschberg', 'bitparallel')),
+    'lps': (lps, ('rolling', 'bitparallel', 'wavefront')),
+    'knapsack_01': (knapsack_01, ('rolling',)),
+    'coin_change': (coin_change, ('rolling',))
+}
+
+
+def _non_negative_ints(values, name, max_length):
+    if not isinstance(values, list) or len(values) > max_length:
+        raise ValueError(f"'{name}' must be a list of at most {max_length} integers")
+    if any(isinstance(x, bool) or not isinstance(x, int) or x < 0 for x in values):
+        raise ValueError(f"'{name}' must contain only non-negative integers")
+
+
+def _bounded_int(value, name, limit):
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= limit:
+        raise ValueError(f"'{name}' must be an integer between 0 and {limit}")
+
+
+def check_dp_request(algorithm, data, limits):
+    """Validate a DP request; returns the mode. ``limits`` = (max length, max capacity, max items)"""
+    max_length, max_capacity, max_items = limits
+    modes = DP_ALGORITHMS[algorithm][1]
+    mode = data.get('mode', modes[0])
+    if mode not in modes:
+        raise ValueError(f"{algorithm} supports modes {', '.join(modes)}")
+    if mode == 'wavefront' and not HAVE_NUMPY:
+        raise ValueError('wavefront mode needs NumPy, which is not installed')
+    if not isinstance(data.get('verify', False), bool):
+        raise ValueError("'verify' must be a boolean")
+    if algorithm in SEQUENCE_FIELDS:
+        for name in SEQUENCE_FIELDS[algorithm]:
+            if not isinstance(data.get(name), str) or len(data[name]) > max_length:
+                raise ValueError(f"'{name}' must be a string of at most {max_length} characters")
+    elif algorithm == 'knapsack_01':
+        _non_negative_ints(data.get('weights'), 'weights', max_items)
+        values = data.get('values')
+        if not isinstance(values, list) or len(values) != len(data['weights']):
+            raise ValueError("'values' must be a list as long as 'weights'")
+        if any(isinstance(v, bool) or not isinstance(v, (int, float)) or v < 0 for v in values):
+            raise ValueError("'values' must contain only non-negative numbers")
+        if sum(values) >= 1 << 63:
+            raise ValueError("The total of 'values' must be below 2**63")
+        _bounded_int(data.get('capacity'), 'capacity', max_capacity)
+    else:
+        _non_negative_ints(data.get('coins'), 'coins', max_items)
+        if 0 in data['coins']:
+            raise ValueError("'coins' must be positive")
+        _bounded_int(data.get('amount'), 'amount', max_capacity)
+        if data.get('objective', 'min_coins') not in ('min_coins', 'ways'):
+            raise ValueError("'objective' must be 'min_coins' or 'ways'")
+    return mode
+
+
+def full_table_bytes(algorithm, data):
+    """Size of the textbook table this run avoided"""
+    if algorithm in ('lcs', 'edit_distance'):
+        return 4 * (len(data['a']) + 1) * (len(data['b']) + 1)
+    if algorithm == 'lps':
+        return 4 * (len(data['s']) + 1) ** 2
+    if algorithm == 'knapsack_01':
+        return 8 * (len(data['weights']) + 1) * (data['capacity'] + 1)
+    return 8 * (len(data['coins']) + 1) * (data['amount'] + 1)
+
+
+def _timed(algorithm, data, mode, deadline):
+    meter = MemoryMeter()
+    started = time.perf_counter()
+    result = DP_ALGORITHMS[algorithm][0](data, mode, meter, deadline)
+    return result, meter, (time.perf_counter() - started) * 1000
+
+
+def run_dp(algorithm, data, mode, deadline):
+    """Run one DP algorithm and report its value and memory high-water mark"""
+    result, meter, elapsed_ms = _timed(algorithm, data, mode, deadline)
+    report = dict({'algorithm': algorithm, 'mode': mode}, **result,
+                  memory={'peak_bytes': meter.peak, 'full_table_bytes': full_table_bytes(algorithm, data)},
+                  elapsed_ms=round(elapsed_ms, 3))
+    if data.get('verify') and mode != 'rolling':
+        baseline, _, baseline_ms = _timed(algorithm, data, 'rolling', deadline)
+        field = VALUE_FIELDS[algorithm]
+        report['verification'] = {
+            'baseline_mode': 'rolling',
+            'baseline_value': baseline[field],
+            'identical': baseline[field] == result[field],
+            'baseline_ms': round(baseline_ms, 3),
+            'speedup': round(baseline_ms / elapsed_ms, 2) if elapsed_ms else None
+        }
+    return report
+
+
+def _random_text(rng, length, alphabet):
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def benchmark_dp(sizes, alphabet='ACGT', seed=0, baseline_max=2000, timeout_ms=None):
+    """Time every string-DP mode on random n x n inputs, checking values against rolling.
+
+    The cell-by-cell rolling baseline only runs up to ``baseline_max``;
+    above it the accelerated modes are cross-checked against each other.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for n in sizes:
+        a, b = _random_text(rng, n, alphabet), _random_text(rng, n, alphabet)
+        inputs = {'lcs': {'a': a, 'b': b}, 'edit_distance': {'a': a, 'b': b}, 'lps': {'s': a}}
+        for algorithm, data in inputs.items():
+            field = VALUE_FIELDS[algorithm]
+            reference = None
+            for mode in DP_ALGORITHMS[algorithm][1]:
+                if mode == 'hirschberg' or (mode == 'wavefront' and not HAVE_NUMPY):
+                    continue
+                if mode == 'rolling' and n > baseline_max:
+                    continue
+                result, meter, elapsed_ms = _timed(algorithm, data, mode, Deadline(timeout_ms))
+                if reference is None:
+                    reference = result[field]
+                rows.append({'algorithm': algorithm, 'n': n, 'mode': mode, 'value': result[field],
+                             'identical': result[field] == reference,
+                             'elapsed_ms': round(elapsed_ms, 3), 'peak_bytes': meter.peak})
+    return rows
@@ -0,0 +1,356 @@
+"""
+Extendable DP tables for fib, coin_change and knapsack_unbounded
+
+Each table covers every target from 0 up to the largest one asked for so
+far, for one set of problem parameters (coins, items, modulus). A request
+inside the table is a lookup; a larger target extends the stored table
+from where it stops instead of starting again from zero. The recurrences
+are evaluated target-outer (amount / capacity / index ascending), so new
+cells only read cells that already exist.
+
+Tables are kept in a ResultCache backend (see engines.cache), so they
+share its byte-budgeted LRU eviction. The in-process backend holds the
+arrays themselves, so a lookup reads one cell and an extension copies the
+stored table before growing it; the SQLite backend holds them packed into
+bytes, so every worker on the host sees the same tables. An extension that
+runs out of time still stores the cells it finished.
+
+    fib with 'mod'      int64 array of F(i) mod m
+    fib without 'mod'   exact big ints: one (F(i), F(i+1)) pair every
+                        FIB_CHECKPOINT_SPACING indices, walked forward from
+                        the nearest checkpoint on lookup
+    coin_change         int32 array of fewest coins (2**31 - 2 = unreachable)
+    knapsack_unbounded  int64 (or float64) array of best value per capacity
+"""
+
+import struct
+import sys
+import time
+from array import array
+from itertools import repeat
+from operator import add
+
+from engines.cache import CachedResult, MemoryBackend, cache_key
+from engines.dp import BLOCK_SWEEP_MIN_COIN
+from engines.steps import ExecutionTimeout
+
+MIMETYPE = 'application/x-dp-table'
+FIB_CHECKPOINT_SPACING = 4096
+DEADLINE_CHECK_MASK = 0xFFFF
+
+
+def _pack(column):
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack(typecode, body):
+    column = array(typecode)
+    column.frombytes(body)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+# ==================== FIBONACCI ====================
+
+def _fib_mod(table, n, params, deadline):
+    mod = params['mod']
+    values = table if table is not None else _fresh('fib', params)
+    start = len(values)
+    a, b = values[-2], values[-1]
+    for i in range(start, n + 1):
+        a, b = b, (a + b) % mod
+        values.append(b)
+        if not i & DEADLINE_CHECK_MASK:
+            deadline.check(i)
+    return values, values[n], max(0, n + 1 - start)
+
+
+def _encode_pairs(pairs):
+    parts = []
+    for pair in pairs:
+        for value in pair:
+            raw = value.to_bytes((value.bit_length() + 7) // 8, 'little')
+            parts.append(struct.pack('<I', len(raw)))
+            parts.append(raw)
+    return b''.join(parts)
+
+
+def _decode_pairs(body):
+    values, offset = [], 0
+    while offset < len(body):
+        (size,) = struct.unpack_from('<I', body, offset)
+        offset += 4
+        values.append(int.from_bytes(body[offset:offset + size], 'little'))
+        offset += size
+    return list(zip(values[::2], values[1::2]))
+
+
+def _fib_exact(table, n, params, deadline):
+    """``table`` holds checkpoint pairs (F(ks), F(ks+1)) and the largest index covered"""
+    spacing = FIB_CHECKPOINT_SPACING
+    if table is None:
+        table = _fresh('fib', params)
+    checkpoints, last = table['checkpoints'], table['last']
+
+    if n <= last:
+        a, b = checkpoints[n // spacing]
+        for _ in range(n % spacing):
+            a, b = b, a + b
+        return table, a, 0
+
+    # The frontier pair is (F(last), F(last + 1)); rebuild it from the last checkpoint
+    a, b = checkpoints[-1]
+    for _ in range(last - (len(checkpoints) - 1) * spacing):
+        a, b = b, a + b
+    try:
+        for i in range(last + 1, n + 1):
+            a, b = b, a + b
+            if not i % spacing:
+                checkpoints.append((a, b))
+            if not i & DEADLINE_CHECK_MASK:
+                deadline.check(i)
+    except ExecutionTimeout:
+        # The table now covers up to its newest checkpoint
+        table['last'] = max(last, (len(checkpoints) - 1) * spacing)
+        raise
+    table['last'] = n
+    return table, a, n - last
+
+
+def fib(table, target, params, deadline):
+    if params.get('mod') is not None:
+        return _fib_mod(table, target, params, deadline)
+    return _fib_exact(table, target, params, deadline)
+
+
+# ==================== COINS / KNAPSACK ====================
+
+def _sweep(values, target, steps, combine, start, deadline):
+    """Extend ``values`` to ``target`` with values[x] = combine(values[x - w] + gain).
+
+    ``steps`` lists (w, gain). When the smallest w is large, each block of
+    that many cells only reads earlier blocks, so it is filled with whole
+    slice operations instead of cell by cell. The deadline is checked every
+    DEADLINE_CHECK_MASK + 1 cell updates (cells x steps), in either mode; on
+    timeout ``values`` is cut back to the cells below x, which are final.
+    """
+    smallest = min(w for w, _ in steps)
+    typecode = values.typecode
+    x = start
+    work = 0
+    try:
+        while x <= target:
+            if smallest >= BLOCK_SWEEP_MIN_COIN:
+                end = min(x + smallest, target + 1)
+                for w, gain in steps:
+                    if w > end - 1:
+                        continue
+                    lo = max(x, w)
+                    candidate = array(typecode, map(add, values[lo - w:end - w], repeat(gain)))
+                    current = values[lo:end]
+                    values[lo:end] = array(typecode, map(combine, current, candidate))
+                    work += end - lo
+                    if work > DEADLINE_CHECK_MASK:
+                        deadline.check(x)
+                        work = 0
+                x = end
+            else:
+                best = values[x]
+                for w, gain in steps:
+                    if w <= x:
+                        best = combine(best, values[x - w] + gain)
+                values[x] = best
+                x += 1
+                work += len(steps)
+                if work > DEADLINE_CHECK_MASK:
+                    deadline.check(x)
+                    work = 0
+    except ExecutionTimeout:
+        del values[x:]
+        raise
+
+
+def coin_change(table, amount, params, deadline):
+    """Fewest coins for every amount; unreachable amounts hold a large sentinel"""
+    # One below the int32 maximum, so sentinel + 1 still fits and never wins min()
+    unreachable = 2 ** 31 - 2
+    values = table if table is not None else _fresh('coin_change', params)
+    start = len(values)
+    if amount >= start:
+        values.extend(array('i', [unreachable]) * (amount + 1 - start))
+        steps = [(c, 1) for c in params['coins']]
+        _sweep(values, amount, steps, lambda a, b: b if b < a else a, start, deadline)
+    result = values[amount]
+    return values, (result if result != unreachable else None), max(0, amount + 1 - start)
+
+
+def knapsack_unbounded(table, capacity, params, deadline):
+    """Best value for every capacity with unlimited copies of each item"""
+    items = params['items']
+    if _value_typecode(items) == 'q' and capacity * max(v for _, v in items) >= 2 ** 63:
+        raise ValueError('capacity x largest value must stay below 2**63')
+    values = table if table is not None else _fresh('knapsack_unbounded', params)
+    start = len(values)
+    if capacity >= start:
+        values.extend(array(values.typecode, [0]) * (capacity + 1 - start))
+        _sweep(values, capacity, items, lambda a, b: b if b > a else a, start, deadline)
+    return values, values[capacity], max(0, capacity + 1 - start)
+
+
+# ==================== STORE ====================
+
+def _value_typecode(items):
+    return 'q' if all(isinstance(v, int) for _, v in items) else 'd'
+
+
+def _fresh(problem, params):
+    """A table holding only its base cells"""
+    if problem == 'fib':
+        if params['mod'] is None:
+            return {'checkpoints': [(0, 1)], 'last': 0}
+        return array('q', [0, 1 % params['mod']])
+    if problem == 'coin_change':
+        return array('i', [0])
+    return array(_value_typecode(params['items']), [0])
+
+
+def _copy(table):
+    if isinstance(table, array):
+        return table[:]
+    return {'checkpoints': list(table['checkpoints']), 'last': table['last']}
+
+
+def _length(table):
+    """Number of targets (0, 1, ...) a table covers"""
+    if isinstance(table, array):
+        return len(table)
+    return table['last'] + 1
+
+
+def _nbytes(table):
+    if isinstance(table, array):
+        return len(table) * table.itemsize
+    return sum(8 + (a.bit_length() + b.bit_length() + 14) // 8 for a, b in table['checkpoints'])
+
+
+# name -> (extend function, field holding the target)
+TABLE_PROBLEMS = {
+    'fib': (fib, 'n'),
+    'coin_change': (coin_change, 'amount'),
+    'knapsack_unbounded': (knapsack_unbounded, 'capacity')
+}
+
+
+def table_params(problem, data, max_items):
+    """Canonical table parameters: order-free, duplicate-free, validated"""
+    if problem == 'fib':
+        mod = data.get('mod')
+        if mod is not None and (isinstance(mod, bool) or not isinstance(mod, int) or not 2 <= mod < 2 ** 62):
+            raise ValueError("'mod' must be an integer between 2 and 2**62")
+        return {'mod': mod}
+    if problem == 'coin_change':
+        coins = data.get('coins')
+        if not isinstance(coins, list) or not coins or len(coins) > max_items \
+                or any(isinstance(c, bool) or not isinstance(c, int) or c < 1 for c in coins):
+            raise ValueError(f"'coins' must be a list of 1 to {max_items} positive integers")
+        if data.get('objective', 'min_coins') != 'min_coins':
+            raise ValueError("Stored coin_change tables hold 'min_coins' only")
+        return {'coins': sorted(set(coins))}
+    items = data.get('items')
+    if not isinstance(items, list) or not items or len(items) > max_items:
+        raise ValueError(f"'items' must be a list of 1 to {max_items} [weight, value] pairs")
+    for item in items:
+        if (not isinstance(item, list) or len(item) != 2
+                or isinstance(item[0], bool) or not isinstance(item[0], int) or item[0] < 1
+                or isinstance(item[1], bool) or not isinstance(item[1], (int, float)) or item[1] < 0):
+            raise ValueError(f'Invalid item {item}; expected [positive weight, non-negative value]')
+    # Per weight only the most valuable item can matter
+    best = {}
+    for w, v in items:
+        if v > best.get(w, -1):
+            best[w] = v
+    return {'items': sorted([w, v] for w, v in best.items())}
+
+
+def _serialize(problem, table, params):
+    if problem == 'fib' and params['mod'] is None:
+        pairs = table['checkpoints']
+        return CachedResult(MIMETYPE, _encode_pairs(pairs), {'last': table['last'], 'length': _length(table)})
+    return CachedResult(MIMETYPE, _pack(table), {'typecode': table.typecode, 'length': _length(table)})
+
+
+def _deserialize(problem, entry, params):
+    if problem == 'fib' and params['mod'] is None:
+        return {'checkpoints': _decode_pairs(entry.body), 'last': entry.headers['last']}
+    return _unpack(entry.headers['typecode'], entry.body)
+
+
+class DPTableStore:
+    """Loads, extends and saves tables in a ResultCache (memory or shared SQLite)"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        # The in-process backend stores the tables themselves, unserialized
+        self.in_memory = isinstance(cache.backend, MemoryBackend)
+        self.extensions = 0
+        self.lookups = 0
+
+    def _load(self, problem, entry, params, target):
+        if entry is None:
+            return _fresh(problem, params)
+        if not self.in_memory:
+            return _deserialize(problem, entry, params)
+        # Other requests may be reading the stored table; only a copy is extended
+        return _copy(entry.body) if target >= entry.headers['length'] else entry.body
+
+    def _save(self, key, problem, table, params):
+        latest = self.cache.backend.get(key)
+        # Another worker may have stored a longer table meanwhile; keep that one
+        if latest is not None and latest.headers['length'] >= _length(table):
+            return
+        if self.in_memory:
+            entry = CachedResult(MIMETYPE, table, {'length': _length(table), 'nbytes': _nbytes(table)})
+        else:
+            entry = _serialize(problem, table, params)
+        self.cache.put(key, entry)
+
+    def solve(self, problem, params, target, deadline):
+        key = cache_key('dp-table', problem, params)
+        entry = self.cache.get(key)
+        table = self._load(problem, entry, params, target)
+        covered = entry.headers['length'] if entry is not None else 0
+
+        started = time.perf_counter()
+        try:
+            table, value, computed = TABLE_PROBLEMS[problem][0](table, target, params, deadline)
+        except ExecutionTimeout:
+            # Keep the cells finished in time; the next request extends from there
+            if _length(table) > covered:
+                self.extensions += 1
+                self._save(key, problem, table, params)
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if computed:
+            self.extensions += 1
+            self._save(key, problem, table, params)
+        else:
+            self.lookups += 1
+        return {
+            'problem': problem,
+            'value': value,
+            'table': {
+                'covered_before': covered,
+                'covered_after': max(covered, target + 1),
+                'cells_computed': computed,
+                'reused_cells': min(covered, target + 1),
+                'hit': entry is not None
+            },
+            'elapsed_ms': round(elapsed_ms, 3)
+        }
+
+    def stats(self):
+        return dict(self.cache.stats(), extensions=self.extensions, lookups=self.lookups)
@@ -0,0 +1,180 @@
+"""
+Integer factorization for prime_factorization
+
+Three stages, each recorded against the factors it finds:
+
+    trial_division     primes below TRIAL_DIVISION_LIMIT, taken from the
+                       shared BasePrimeTable (engines.sieve). One gcd
+                       with their product (a primorial wheel) skips the
+                       whole stage when n has no small factor.
+    miller_rabin       a cofactor that passes Miller-Rabin is prime.
+                       With the first 13 primes as bases the test is
+                       exact below 3.3 * 10^24; above that a pass is
+                       reported as probable.
+    pollard_rho_brent  composite cofactors are split by Pollard's rho with
+                       Brent's cycle detection, batching 128 differences
+                       per gcd. Each split is timed. Perfect squares
+                       are split by isqrt first, where rho does poorly.
+
+Rho draws its random starts from a generator seeded with n, so a number
+always factors the same way and results can be cached.
+"""
+
+import random
+import time
+from collections import deque
+from math import gcd, isqrt, prod
+
+from engines.steps import ExecutionTimeout
+
+TRIAL_DIVISION_LIMIT = 1 << 12
+
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+RHO_BATCH = 128
+
+
+# ==================== PRIMALITY ====================
+
+def is_probable_prime(n):
+    """Miller-Rabin over MR_BASES; exact for n < MR_DETERMINISTIC_LIMIT"""
+    if n < 2:
+        return False
+    for p in MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+# ==================== POLLARD RHO ====================
+
+def pollard_brent(n, deadline, rng):
+    """A non-trivial factor of odd composite n; returns (factor, iterations)"""
+    iterations = 0
+    while True:
+        y, c = rng.randrange(1, n), rng.randrange(1, n)
+        g = r = q = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(RHO_BATCH, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += RHO_BATCH
+                deadline.check(iterations + k)
+            iterations += r
+            r <<= 1
+        if g == n:
+            # The batch overshot: step back through it one difference at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g, iterations
+
+
+# ==================== FACTORIZATION ====================
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def factorize(n, small_primes, wheel, deadline):
+    """Factor n >= 1; returns (factors, unfactored).
+
+    ``factors`` is [{'prime', 'exponent', 'method', 'ms', 'certain'}] by
+    prime, ``wheel`` the product of ``small_primes``. Cofactors are taken
+    in the order they were split off, so a prime's method and ms belong to
+    the step that first isolated it. When the deadline passes mid-way, the
+    composite cofactors left over are ``unfactored``.
+    """
+    found = {}
+
+    def record(p, method, ms, exponent=1):
+        if p in found:
+            found[p]['exponent'] += exponent
+        else:
+            found[p] = {'prime': p, 'exponent': exponent, 'method': method, 'ms': ms,
+                        'certain': p < MR_DETERMINISTIC_LIMIT}
+
+    started = time.perf_counter()
+    g = gcd(n, wheel)
+    for p in small_primes:
+        if g == 1:
+            break
+        if g % p == 0:
+            g //= p
+            exponent = 0
+            while n % p == 0:
+                n //= p
+                exponent += 1
+            record(p, 'trial_division', _ms(started), exponent)
+
+    rng = random.Random(n)
+    # (cofactor, method that split it off, when that step started)
+    pending = deque([(n, 'miller_rabin', time.perf_counter())] if n > 1 else [])
+    unfactored = []
+    while pending:
+        m, method, since = pending.popleft()
+        if is_probable_prime(m):
+            record(m, method, _ms(since))
+            continue
+        split_started = time.perf_counter()
+        root = isqrt(m)
+        if root * root == m:
+            pending += [(root, 'perfect_square', split_started)] * 2
+            continue
+        try:
+            d, _ = pollard_brent(m, deadline, rng)
+        except ExecutionTimeout:
+            unfactored.append(m)
+            # Cofactors not reached yet may still be prime
+            for q, method, since in pending:
+                if is_probable_prime(q):
+                    record(q, method, _ms(since))
+                else:
+                    unfactored.append(q)
+            break
+        pending.append((d, 'pollard_rho_brent', split_started))
+        pending.append((m // d, 'pollard_rho_brent', split_started))
+    return sorted(found.values(), key=lambda f: f['prime']), sorted(unfactored)
+
+
+def factor_numbers(numbers, base_primes, deadline):
+    """Factor each number, sharing one small-prime table and wheel across the batch"""
+    small_primes = base_primes.primes(TRIAL_DIVISION_LIMIT)
+    wheel = prod(small_primes)
+    results = []
+    for n in numbers:
+        started = time.perf_counter()
+        factors, unfactored = factorize(n, small_primes, wheel, deadline)
+        results.append({
+            'n': n,
+            'factors': factors,
+            'complete': not unfactored,
+            'unfactored': unfactored,
+            'elapsed_ms': _ms(started)
+        })
+    return results
@@ -0,0 +1,419 @@
+"""
+Maximum flow engine for Algorithm Playground
+
+Three selectable methods on one array-backed residual network:
+
+    edmonds_karp   BFS shortest augmenting paths, O(VE^2)
+    dinic          BFS level graph + blocking flow per phase, O(V^2 E)
+    push_relabel   FIFO push-relabel with the gap heuristic, O(V^3)
+
+Every method reports the flow value, a minimum cut, per-edge flows and
+per-phase counters. A phase is one augmenting path for Edmonds-Karp, one
+level graph for Dinic and one FIFO pass over the active vertices for
+push-relabel.
+"""
+
+import random
+import time
+from array import array
+from collections import deque
+
+from engines.graph import EdgeList, build_csr
+from engines.steps import Deadline
+
+# Per-phase counters beyond this many are summarized, not listed
+MAX_REPORTED_PHASES = 1000
+
+# Residual capacity or excess at or below this counts as zero, so rounding
+# on fractional capacities cannot leave phantom arcs or excess behind
+EPSILON = 1e-9
+
+
+class ResidualGraph:
+    """Residual network of a directed CSR graph in flat arrays.
+
+    Input slot ``s`` becomes forward arc ``2s`` and its reverse ``2s + 1``,
+    so ``arc ^ 1`` is always the paired arc. ``arcs[offsets[u]:offsets[u + 1]]``
+    lists every arc leaving u; ``heads[arc]`` is where it leads.
+    """
+
+    __slots__ = ('vertices', 'offsets', 'arcs', 'heads', 'capacity', 'initial')
+
+    def __init__(self, graph):
+        vertices, slots = graph.vertices, len(graph.targets)
+        heads = array('i', bytes(8 * slots))
+        capacity = array('d', bytes(16 * slots))
+        offsets = array('i', bytes(4 * (vertices + 1)))
+        for u in range(vertices):
+            for slot in range(graph.offsets[u], graph.offsets[u + 1]):
+                v = graph.targets[slot]
+                heads[2 * slot] = v
+                heads[2 * slot + 1] = u
+                capacity[2 * slot] = graph.weight(slot)
+                offsets[u + 1] += 1
+                offsets[v + 1] += 1
+        for u in range(vertices):
+            offsets[u + 1] += offsets[u]
+        cursor = offsets[:-1]
+        arcs = array('i', bytes(8 * slots))
+        for arc in range(2 * slots):
+            tail = heads[arc ^ 1]
+            arcs[cursor[tail]] = arc
+            cursor[tail] += 1
+
+        self.vertices = vertices
+        self.offsets = offsets
+        self.arcs = arcs
+        self.heads = heads
+        self.capacity = capacity
+        self.initial = array('d', capacity)
+
+    def push(self, arc, amount):
+        self.capacity[arc] -= amount
+        self.capacity[arc ^ 1] += amount
+
+    def reachable(self, source):
+        """Bytearray marking vertices reachable from source over residual arcs"""
+        offsets, arcs, heads, capacity = self.offsets, self.arcs, self.heads, self.capacity
+        seen = bytearray(self.vertices)
+        seen[source] = 1
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for i in range(offsets[u], offsets[u + 1]):
+                arc = arcs[i]
+                v = heads[arc]
+                if not seen[v] and capacity[arc] > EPSILON:
+                    seen[v] = 1
+                    queue.append(v)
+        return seen
+
+
+class _Phases:
+    """Per-phase counter rows, listing only the first MAX_REPORTED_PHASES"""
+
+    def __init__(self):
+        self.rows = []
+        self.count = 0
+
+    def add(self, **counters):
+        self.count += 1
+        if len(self.rows) < MAX_REPORTED_PHASES:
+            self.rows.append(dict(phase=self.count, **counters))
+
+
+# ==================== METHODS ====================
+# Each method saturates the residual graph from source to sink and
+# returns (flow value, totals dict); per-phase rows go into ``phases``.
+
+def edmonds_karp(net, source, sink, phases, deadline):
+    """Augment along BFS shortest paths until the sink is unreachable"""
+    offsets, arcs, heads, capacity = net.offsets, net.arcs, net.heads, net.capacity
+    flow = 0
+    arcs_scanned = 0
+    while True:
+        via = array('i', [-1]) * net.vertices
+        via[source] = -2
+        queue = deque([source])
+        scanned = 0
+        while queue and via[sink] == -1:
+            u = queue.popleft()
+            for i in range(offsets[u], offsets[u + 1]):
+                arc = arcs[i]
+                v = heads[arc]
+                scanned += 1
+                if via[v] == -1 and capacity[arc] > EPSILON:
+                    via[v] = arc
+                    queue.append(v)
+        arcs_scanned += scanned
+        if via[sink] == -1:
+            break
+
+        bottleneck, length = float('inf'), 0
+        v = sink
+        while v != source:
+            arc = via[v]
+            bottleneck = min(bottleneck, capacity[arc])
+            v = heads[arc ^ 1]
+            length += 1
+        v = sink
+        while v != source:
+            net.push(via[v], bottleneck)
+            v = heads[via[v] ^ 1]
+        flow += bottleneck
+        phases.add(path_length=length, flow_added=bottleneck, arcs_scanned=scanned)
+        deadline.check(phases.count)
+    return flow, {'augmenting_paths': phases.count, 'arcs_scanned': arcs_scanned}
+
+
+def dinic(net, source, sink, phases, deadline):
+    """Build a BFS level graph, then push a blocking flow through it, per phase"""
+    offsets, arcs, heads, capacity = net.offsets, net.arcs, net.heads, net.capacity
+    flow = 0
+    total_paths = total_scanned = 0
+    while True:
+        level = array('i', [-1]) * net.vertices
+        level[source] = 0
+        queue = deque([source])
+        scanned = 0
+        while queue:
+            u = queue.popleft()
+            for i in range(offsets[u], offsets[u + 1]):
+                arc = arcs[i]
+                v = heads[arc]
+                scanned += 1
+                if level[v] < 0 and capacity[arc] > EPSILON:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            total_scanned += scanned
+            break
+
+        # Blocking flow: iterative DFS along level-increasing arcs; current[u]
+        # only moves forward, so each arc is abandoned at most once per phase
+        current = offsets[:-1]
+        added = paths = 0
+        path = []
+        u = source
+        while True:
+            end = offsets[u + 1]
+            i = current[u]
+            while i < end:
+                arc = arcs[i]
+                scanned += 1
+                if capacity[arc] > EPSILON and level[heads[arc]] == level[u] + 1:
+                    break
+                i += 1
+            current[u] = i
+            if i == end:
+                if u == source:
+                    break
+                level[u] = -1  # dead end for the rest of the phase
+                arc = path.pop()
+                u = heads[arc ^ 1]
+                current[u] += 1
+                continue
+            path.append(arc)
+            u = heads[arc]
+            if u != sink:
+                continue
+
+            bottleneck = min(capacity[a] for a in path)
+            for a in path:
+                net.push(a, bottleneck)
+            added += bottleneck
+            paths += 1
+            # Resume from the tail of the first arc this augmentation saturated
+            for depth, a in enumerate(path):
+                if capacity[a] <= EPSILON:
+                    del path[depth:]
+                    break
+            u = heads[path[-1]] if path else source
+            if not paths & 0xFF:
+                deadline.check(total_paths + paths)
+
+        flow += added
+        total_paths += paths
+        total_scanned += scanned
+        phases.add(sink_level=level[sink], augmenting_paths=paths,
+                   flow_added=added, arcs_scanned=scanned)
+        deadline.check(total_paths)
+    return flow, {'augmenting_paths': total_paths, 'arcs_scanned': total_scanned}
+
+
+def push_relabel(net, source, sink, phases, deadline):
+    """FIFO push-relabel with the gap heuristic.
+
+    Heights may rise past V, so excess that cannot reach the sink drains
+    back to the source and the result is a flow, not just a preflow.
+    """
+    offsets, arcs, heads, capacity = net.offsets, net.arcs, net.heads, net.capacity
+    n = net.vertices
+    height = array('i', bytes(4 * n))
+    excess = array('d', bytes(8 * n))
+    per_height = array('i', bytes(4 * (2 * n + 1)))
+    height[source] = n
+    per_height[0] = n - 1
+    per_height[n] = 1
+    current = offsets[:-1]
+    active = deque()
+    queued = bytearray(n)
+    queued[source] = queued[sink] = 1  # never discharged
+
+    for i in range(offsets[source], offsets[source + 1]):
+        arc = arcs[i]
+        amount = capacity[arc]
+        if amount > EPSILON:
+            v = heads[arc]
+            net.push(arc, amount)
+            excess[v] += amount
+            excess[source] -= amount
+            if not queued[v]:
+                queued[v] = 1
+                active.append(v)
+
+    totals = {'pushes': 0, 'relabels': 0, 'gap_relabels': 0, 'discharges': 0}
+    while active:
+        pushes = relabels = gaps = 0
+        pass_size = len(active)
+        for _ in range(pass_size):
+            u = active.popleft()
+            queued[u] = 0
+            totals['discharges'] += 1
+            end = offsets[u + 1]
+            while excess[u] > EPSILON:
+                i = current[u]
+                if i == end:
+                    # Relabel to one above the lowest residual neighbour
+                    old = height[u]
+                    new = 2 * n
+                    for j in range(offsets[u], end):
+                        arc = arcs[j]
+                        if capacity[arc] > EPSILON and height[heads[arc]] + 1 < new:
+                            new = height[heads[arc]] + 1
+                    per_height[old] -= 1
+                    height[u] = new
+                    per_height[new] += 1
+                    current[u] = offsets[u]
+                    relabels += 1
+                    if not per_height[old] and old < n:
+                        # Gap: nothing above ``old`` can reach the sink any more
+                        for w in range(n):
+                            if old < height[w] < n:
+                                per_height[height[w]] -= 1
+                                height[w] = n + 1
+                                per_height[n + 1] += 1
+                                gaps += 1
+                    continue
+                arc = arcs[i]
+                v = heads[arc]
+                if capacity[arc] > EPSILON and height[u] == height[v] + 1:
+                    amount = min(excess[u], capacity[arc])
+                    net.push(arc, amount)
+                    excess[u] -= amount
+                    excess[v] += amount
+                    pushes += 1
+                    if not queued[v]:
+                        queued[v] = 1
+                        active.append(v)
+                else:
+                    current[u] = i + 1
+        totals['pushes'] += pushes
+        totals['relabels'] += relabels
+        totals['gap_relabels'] += gaps
+        phases.add(active=pass_size, pushes=pushes, relabels=relabels, gap_relabels=gaps)
+        deadline.check(phases.count)
+    return excess[sink], totals
+
+
+FLOW_METHODS = {
+    'edmonds_karp': edmonds_karp,
+    'dinic': dinic,
+    'push_relabel': push_relabel
+}
+
+
+def check_flow_request(graph, options):
+    """Validate source, sink, method and capacities; returns (source, sink, method)"""
+    source = graph.vertex(options.get('source'), 'source')
+    sink = graph.vertex(options.get('sink'), 'sink')
+    if source == sink:
+        raise ValueError("'source' and 'sink' must differ")
+    method = options.get('method', 'edmonds_karp')
+    if method not in FLOW_METHODS:
+        raise ValueError(f"'method' must be one of {list(FLOW_METHODS)}")
+    if graph.weights is not None and min(graph.weights, default=0) < 0:
+        raise ValueError('Capacities must be non-negative')
+    return source, sink, method
+
+
+def max_flow(graph, options, deadline=None):
+    """Run the requested method on a directed CSR graph and shape the report"""
+    source, sink, method = check_flow_request(graph, options)
+    deadline = deadline or Deadline()
+    started = time.perf_counter()
+    net = ResidualGraph(graph)
+    build_ms = (time.perf_counter() - started) * 1000
+    phases = _Phases()
+    flow, totals = FLOW_METHODS[method](net, source, sink, phases, deadline)
+    flow_ms = (time.perf_counter() - started) * 1000 - build_ms
+
+    source_side = net.reachable(source)
+    cut_edges = []
+    edge_flows = [0] * graph.edge_count
+    for u in range(graph.vertices):
+        for slot in range(graph.offsets[u], graph.offsets[u + 1]):
+            arc = 2 * slot
+            edge_flows[graph.edge_ids[slot]] += net.initial[arc] - net.capacity[arc]
+            if source_side[u] and not source_side[graph.targets[slot]]:
+                cut_edges.append([u, graph.targets[slot]])
+
+    result = {
+        'method': method,
+        'max_flow': flow,
+        'source': source,
+        'sink': sink,
+        'min_cut_source_side': [v for v in range(graph.vertices) if source_side[v]],
+        'min_cut_edges': cut_edges,
+        'phase_count': phases.count,
+        'phases': phases.rows,
+        'residual_build_ms': round(build_ms, 3),
+        'flow_ms': round(flow_ms, 3),
+        **totals
+    }
+    if options.get('include_flows', True):
+        result['edge_flows'] = edge_flows
+    return result
+
+
+# ==================== BENCHMARK ====================
+
+def layered_network(layers, width, rng, density=0.5):
+    """Dense layered network: source -> layers of ``width`` vertices -> sink"""
+    vertices = layers * width + 2
+    sink = vertices - 1
+    sources, targets, weights = array('i'), array('i'), array('d')
+
+    def edge(u, v):
+        sources.append(u)
+        targets.append(v)
+        weights.append(rng.randint(1, 100))
+
+    for v in range(1, width + 1):
+        edge(0, v)
+    for layer in range(layers - 1):
+        for i in range(width):
+            for j in range(width):
+                if rng.random() < density:
+                    edge(1 + layer * width + i, 1 + (layer + 1) * width + j)
+    for v in range(vertices - 1 - width, vertices - 1):
+        edge(v, sink)
+    return EdgeList(vertices, sources, targets, weights), 0, sink
+
+
+def random_network(vertices, edges, rng):
+    """Sparse random network between vertex 0 and vertex V-1"""
+    sources = array('i', (rng.randrange(vertices) for _ in range(edges)))
+    targets = array('i', (rng.randrange(vertices) for _ in range(edges)))
+    weights = array('d', (rng.randint(1, 100) for _ in range(edges)))
+    return EdgeList(vertices, sources, targets, weights), 0, vertices - 1
+
+
+def benchmark_flow(workloads=None, seed=0):
+    """Time every method on each named workload; rows carry flow and counters"""
+    rng = random.Random(seed)
+    workloads = workloads or {
+        'layered 8x40 dense': layered_network(8, 40, rng),
+        'layered 4x100 dense': layered_network(4, 100, rng, density=0.3),
+        'random sparse V=5000 E=20000': random_network(5000, 20000, rng)
+    }
+    rows = []
+    for name, (edges, source, sink) in workloads.items():
+        graph = build_csr(edges, directed=True)
+        for method in FLOW_METHODS:
+            result = max_flow(graph, {'source': source, 'sink': sink, 'method': method,
+                                      'include_flows': False})
+            rows.append({'workload': name, 'vertices': graph.vertices, 'edges': graph.edge_count,
+                         'method': method, 'max_flow': result['max_flow'],
+                         'phases': result['phase_count'], 'flow_ms': result['flow_ms']})
+    return rows
@@ -0,0 +1,253 @@
+"""
+Graph ingestion and compressed sparse row (CSR) adjacency
+
+Edge lists arrive as JSON (``[[u, v], ...]`` or ``[[u, v, w], ...]``) or as a
+packed binary upload, and are converted once into CSR: the out-edges of
+vertex ``u`` are slots ``offsets[u]:offsets[u + 1]`` of the ``targets``,
+``weights`` and ``edge_ids`` columns. Every column is a typed ``array`` so a
+graph costs a few bytes per edge instead of a Python object per edge.
+
+Binary wire format (all integers little-endian)::
+
+    offset  size  field
+    0       4     magic b'APGR'
+    4       1     format version (1)
+    5       1     flags: bit 0 weighted
+    6       2     reserved (0)
+    8       4     vertex count V (uint32)
+    12      4     edge count E (uint32)
+    16      ...   sources E x uint32, targets E x uint32,
+                  then weights E x float64 when flag bit 0 is set
+
+Whether edges are directed is a property of the request, not the payload.
+"""
+
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - exercised on installs without NumPy
+    np = None
+    HAVE_NUMPY = False
+
+MAGIC = b'APGR'
+VERSION = 1
+FLAG_WEIGHTED = 0x01
+HEADER = struct.Struct('<4sBBHII')
+
+# Below this many edges the pure-array build beats NumPy's conversion overhead
+NUMPY_MIN_EDGES = 4096
+
+
+class EdgeList:
+    """Validated raw input: parallel source/target/weight columns"""
+
+    __slots__ = ('vertices', 'sources', 'targets', 'weights')
+
+    def __init__(self, vertices, sources, targets, weights=None):
+        self.vertices = vertices
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.sources)
+
+
+class CSRGraph:
+    """Adjacency in compressed sparse row form.
+
+    ``edge_ids`` maps every slot back to its input edge, so both directions
+    of an undirected edge share one id. ``edge_count`` counts input edges.
+    """
+
+    __slots__ = ('vertices', 'directed', 'edge_count', 'offsets', 'targets', 'weights', 'edge_ids')
+
+    def __init__(self, vertices, directed, edge_count, offsets, targets, weights, edge_ids):
+        self.vertices = vertices
+        self.directed = directed
+        self.edge_count = edge_count
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edge_ids = edge_ids
+
+    def vertex(self, value, name):
+        """Validate a vertex id from a request"""
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value < self.vertices:
+            raise ValueError(f"'{name}' must be a vertex between 0 and {self.vertices - 1}")
+        return value
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def weight(self, slot):
+        return self.weights[slot] if self.weights is not None else 1
+
+    def transpose(self):
+        """CSR of the graph with every edge reversed"""
+        tails = array('i', bytes(4 * len(self.targets)))
+        for u in range(self.vertices):
+            for slot in range(self.offsets[u], self.offsets[u + 1]):
+                tails[slot] = u
+        edges = EdgeList(self.vertices, self.targets, tails, self.weights)
+        return build_csr(edges, directed=True, edge_ids=self.edge_ids)
+
+    def nbytes(self):
+        columns = (self.offsets, self.targets, self.weights, self.edge_ids)
+        return sum(c.itemsize * len(c) for c in columns if c is not None)
+
+    def summary(self):
+        return {
+            'vertices': self.vertices,
+            'edges': self.edge_count,
+            'directed': self.directed,
+            'weighted': self.weights is not None,
+            'csr_bytes': self.nbytes()
+        }
+
+
+def _from_numpy(values, typecode):
+    column = array(typecode)
+    column.frombytes(values.tobytes())
+    return column
+
+
+def build_csr(edges, directed=True, edge_ids=None):
+    """Bucket an EdgeList by source into a CSRGraph in O(V + E).
+
+    Undirected graphs store each edge in both directions. ``edge_ids``
+    overrides the default ids (the input position of each edge).
+    """
+    sources, targets, weights = edges.sources, edges.targets, edges.weights
+    count = len(sources)
+    if edge_ids is None:
+        edge_ids = array('i', range(count))
+    if not directed:
+        sources, targets = sources + targets, targets + sources
+        weights = weights + weights if weights is not None else None
+        edge_ids = edge_ids + edge_ids
+    vertices, total = edges.vertices, len(sources)
+
+    if HAVE_NUMPY and total >= NUMPY_MIN_EDGES:
+        src = np.frombuffer(sources, dtype=np.int32)
+        order = np.argsort(src, kind='stable')
+        offsets = np.zeros(vertices + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=vertices), out=offsets[1:])
+        return CSRGraph(
+            vertices, directed, count,
+            _from_numpy(offsets, 'i'),
+            _from_numpy(np.frombuffer(targets, dtype=np.int32)[order], 'i'),
+            _from_numpy(np.frombuffer(weights, dtype=np.float64)[order], 'd') if weights is not None else None,
+            _from_numpy(np.frombuffer(edge_ids, dtype=np.int32)[order], 'i'))
+
+    offsets = array('i', bytes(4 * (vertices + 1)))
+    for u in sources:
+        offsets[u + 1] += 1
+    for u in range(vertices):
+        offsets[u + 1] += offsets[u]
+    cursor = offsets[:-1]
+    out_targets = array('i', bytes(4 * total))
+    out_ids = array('i', bytes(4 * total))
+    out_weights = array('d', bytes(8 * total)) if weights is not None else None
+    for i in range(total):
+        u = sources[i]
+        slot = cursor[u]
+        cursor[u] = slot + 1
+        out_targets[slot] = targets[i]
+        out_ids[slot] = edge_ids[i]
+        if out_weights is not None:
+            out_weights[slot] = weights[i]
+    return CSRGraph(vertices, directed, count, offsets, out_targets, out_weights, out_ids)
+
+
+# ==================== INGESTION ====================
+
+def _check_bounds(vertices, edges, max_vertices, max_edges):
+    if isinstance(vertices, bool) or not isinstance(vertices, int) or not 1 <= vertices <= max_vertices:
+        raise ValueError(f"'vertices' must be an integer between 1 and {max_vertices}")
+    if edges > max_edges:
+        raise ValueError(f'Graph exceeds MAX_GRAPH_EDGES ({max_edges})')
+
+
+def _check_endpoints(edges):
+    if len(edges) and (min(edges.sources) < 0 or min(edges.targets) < 0
+                       or max(edges.sources) >= edges.vertices or max(edges.targets) >= edges.vertices):
+        raise ValueError(f'Edges must reference vertices 0..{edges.vertices - 1}')
+
+
+def parse_json_edges(data, max_vertices, max_edges):
+    """EdgeList from {'vertices': V, 'edges': [[u, v] or [u, v, w], ...]}"""
+    raw = data.get('edges', [])
+    if not isinstance(raw, list):
+        raise ValueError("'edges' must be a list of [u, v] or [u, v, weight] entries")
+    vertices = data.get('vertices')
+    _check_bounds(vertices, len(raw), max_vertices, max_edges)
+
+    weighted = any(isinstance(edge, list) and len(edge) == 3 for edge in raw)
+    sources, targets = array('i'), array('i')
+    weights = array('d') if weighted else None
+    for edge in raw:
+        if (not isinstance(edge, list) or len(edge) not in (2, 3)
+                or any(isinstance(x, bool) or not isinstance(x, int) for x in edge[:2])
+                or (len(edge) == 3 and (isinstance(edge[2], bool) or not isinstance(edge[2], (int, float))))):
+            raise ValueError(f'Invalid edge {edge}; expected [u, v] or [u, v, weight]')
+        u, v = edge[0], edge[1]
+        if not (0 <= u < vertices and 0 <= v < vertices):
+            raise ValueError(f'Edge {edge} references a vertex outside 0..{vertices - 1}')
+        sources.append(u)
+        targets.append(v)
+        if weighted:
+            weights.append(edge[2] if len(edge) == 3 else 1)
+    return EdgeList(vertices, sources, targets, weights)
+
+
+def parse_binary_edges(payload, max_vertices, max_edges):
+    """EdgeList from an APGR upload (see the module docstring)"""
+    if len(payload) < HEADER.size:
+        raise ValueError('Graph upload is shorter than its header')
+    magic, version, flags, _, vertices, count = HEADER.unpack_from(payload)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not an APGR v1 graph upload')
+    _check_bounds(vertices, count, max_vertices, max_edges)
+    weighted = bool(flags & FLAG_WEIGHTED)
+    expected = HEADER.size + count * (8 + (8 if weighted else 0))
+    if len(payload) != expected:
+        raise ValueError(f'Graph upload should be {expected} bytes for {count} edges, got {len(payload)}')
+
+    # uint32 endpoints are read as int32; anything past 2^31 turns negative
+    # and fails the endpoint check like any other out-of-range vertex
+    body = memoryview(payload)[HEADER.size:]
+    columns = []
+    for typecode, start, end in (('i', 0, 4 * count), ('i', 4 * count, 8 * count), ('d', 8 * count, 16 * count)):
+        if typecode == 'd' and not weighted:
+            break
+        column = array(typecode)
+        column.frombytes(body[start:end])
+        if sys.byteorder != 'little':
+            column.byteswap()
+        columns.append(column)
+
+    edges = EdgeList(vertices, columns[0], columns[1], columns[2] if weighted else None)
+    _check_endpoints(edges)
+    return edges
+
+
+def encode_binary_edges(vertices, edges, weighted=False):
+    """Pack an edge list as an APGR upload (the inverse of parse_binary_edges)"""
+    sources = array('I', (edge[0] for edge in edges))
+    targets = array('I', (edge[1] for edge in edges))
+    parts = [HEADER.pack(MAGIC, VERSION, FLAG_WEIGHTED if weighted else 0, 0, vertices, len(edges)),
+             sources, targets]
+    if weighted:
+        parts.append(array('d', (edge[2] for edge in edges)))
+    if sys.byteorder != 'little':
+        for column in parts[1:]:
+            column.byteswap()
+    return b''.join(part if isinstance(part, bytes) else part.tobytes() for part in parts)
@@ -0,0 +1,241 @@
+"""
+Graph algorithms for Algorithm Playground
+
+Every entry of the ``graph`` catalog section, running directly on the CSR
+layout from engines.graph. Traversals use explicit stacks and per-vertex
+edge cursors, so depth is bounded by memory rather than the recursion limit;
+the DFS family (SCCs, bridges, articulation points) shares engines.dfs.
+"""
+
+import heapq
+import time
+from array import array
+from collections import deque
+
+from engines.dfs import (dfs_traversal, scc_kosaraju, scc_tarjan, bridge_finding,
+                         articulation_point)
+from engines.flow import max_flow
+from engines.steps import DISCOVER, EDGE, FINISH, OP_NAMES, Deadline, run_steps
+
+# How many loop iterations to run between wall-clock checks
+DEADLINE_CHECK_MASK = 0xFFF
+
+
+def _cursors(graph):
+    """Per-vertex next-slot cursor, initialised to each adjacency start"""
+    return graph.offsets[:-1]
+
+
+# ==================== ORDERING AND STRUCTURE ====================
+
+def topological_sort(graph, options, deadline):
+    """Kahn's algorithm; a partial order means the graph has a cycle"""
+    offsets, targets = graph.offsets, graph.targets
+    indegree = array('i', bytes(4 * graph.vertices))
+    for v in targets:
+        indegree[v] += 1
+    queue = deque(u for u in range(graph.vertices) if not indegree[u])
+    order = array('i')
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        if not len(order) & DEADLINE_CHECK_MASK:
+            deadline.check(len(order))
+        for slot in range(offsets[u], offsets[u + 1]):
+            v = targets[slot]
+            indegree[v] -= 1
+            if not indegree[v]:
+                queue.append(v)
+    return {'is_dag': len(order) == graph.vertices, 'order': order.tolist()}
+
+
+def bipartite_check(graph, options, deadline):
+    """BFS two-colouring; reports a conflicting edge when one exists"""
+    offsets, targets = graph.offsets, graph.targets
+    side = bytearray(graph.vertices)  # 0 = unseen, 1 / 2 = colour
+    steps = 0
+    for root in range(graph.vertices):
+        if side[root]:
+            continue
+        side[root] = 1
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            steps += 1
+            if not steps & DEADLINE_CHECK_MASK:
+                deadline.check(steps)
+            for slot in range(offsets[u], offsets[u + 1]):
+                v = targets[slot]
+                if not side[v]:
+                    side[v] = 3 - side[u]
+                    queue.append(v)
+                elif side[v] == side[u]:
+                    return {'bipartite': False, 'conflict': [u, v]}
+    return {'bipartite': True, 'partition': [s - 1 for s in side]}
+
+
+def cycle_detection(graph, options, deadline):
+    """DFS for a back edge; returns one cycle as a vertex list"""
+    offsets, targets, edge_ids = graph.offsets, graph.targets, graph.edge_ids
+    cursor = _cursors(graph)
+    state = bytearray(graph.vertices)  # 0 = unseen, 1 = on the DFS path, 2 = done
+    parent_edge = array('i', [-1]) * graph.vertices
+    steps = 0
+    for root in range(graph.vertices):
+        if state[root]:
+            continue
+        state[root] = 1
+        call = [root]
+        while call:
+            u = call[-1]
+            slot = cursor[u]
+            if slot < offsets[u + 1]:
+                cursor[u] = slot + 1
+                if not graph.directed and edge_ids[slot] == parent_edge[u]:
+                    continue
+                v = targets[slot]
+                if state[v] == 1:
+                    return {'has_cycle': True, 'cycle': call[call.index(v):] + [v]}
+                if not state[v]:
+                    state[v] = 1
+                    parent_edge[v] = edge_ids[slot]
+                    call.append(v)
+            else:
+                state[call.pop()] = 2
+            steps += 1
+            if not steps & DEADLINE_CHECK_MASK:
+                deadline.check(steps)
+    return {'has_cycle': False, 'cycle': []}
+
+
+# name -> (function, edge direction the algorithm works on: 'directed',
+#          'undirected', or 'either' to follow the request,
+#          whether it is a step generator built on engines.dfs)
+GRAPH_ALGORITHMS = {
+    'topological_sort': (topological_sort, 'directed', False),
+    'scc_kosaraju': (scc_kosaraju, 'directed', True),
+    'scc_tarjan': (scc_tarjan, 'directed', True),
+    'bridge_finding': (bridge_finding, 'undirected', True),
+    'articulation_point': (articulation_point, 'undirected', True),
+    'bipartite_check': (bipartite_check, 'undirected', False),
+    'cycle_detection': (cycle_detection, 'either', False),
+    'maximum_flow': (max_flow, 'directed', False),
+    'dfs': (dfs_traversal, 'either', True)
+}
+
+
+def graph_direction(algorithm, requested):
+    """Whether to build a directed CSR for this algorithm and request flag"""
+    mode = GRAPH_ALGORITHMS[algorithm][1]
+    return requested if mode == 'either' else mode == 'directed'
+
+
+def run_graph(algorithm, graph, options, timeout_ms=None):
+    """Run one graph algorithm on a CSR graph and add size and timing fields"""
+    function, _, stepwise = GRAPH_ALGORITHMS[algorithm]
+    if stepwise:
+        result, counts, elapsed_ms = run_steps(function(graph, options), timeout_ms)
+        result['steps'] = {OP_NAMES[op]: counts[op] for op in (DISCOVER, EDGE, FINISH)}
+    else:
+        started = time.perf_counter()
+        result = function(graph, options, Deadline(timeout_ms))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    return dict({'algorithm': algorithm}, **graph.summary(), **result, elapsed_ms=round(elapsed_ms, 3))
+
+
+# ==================== BATCH QUERIES ====================
+
+def shortest_path_tree(graph, source, targets, deadline, weighted):
+    """Grow a BFS or Dijkstra tree from source until every target is settled.
+
+    Returns ``(parent, via)``: parent vertex and the CSR slot used to reach
+    each vertex; unreached targets have parent -1.
+    """
+    offsets, heads, weights = graph.offsets, graph.targets, graph.weights
+    parent = array('i', [-1]) * graph.vertices
+    via = array('i', [-1]) * graph.vertices
+    parent[source] = source
+    remaining = set(targets)
+    remaining.discard(source)
+    settled = 1
+
+    if not weighted or weights is None:
+        queue = deque([source])
+        while queue and remaining:
+            u = queue.popleft()
+            for slot in range(offsets[u], offsets[u + 1]):
+                v = heads[slot]
+                if parent[v] < 0:
+                    parent[v] = u
+                    via[v] = slot
+                    queue.append(v)
+                    remaining.discard(v)
+            settled += 1
+            if not settled & DEADLINE_CHECK_MASK:
+                deadline.check(settled)
+        return parent, via
+
+    dist = array('d', [-1.0]) * graph.vertices
+    done = bytearray(graph.vertices)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap and remaining:
+        g, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        remaining.discard(u)
+        settled += 1
+        if not settled & DEADLINE_CHECK_MASK:
+            deadline.check(settled)
+        for slot in range(offsets[u], offsets[u + 1]):
+            v = heads[slot]
+            if done[v]:
+                continue
+            candidate = g + weights[slot]
+            if dist[v] < 0 or candidate < dist[v]:
+                dist[v] = candidate
+                parent[v] = u
+                via[v] = slot
+                heapq.heappush(heap, (candidate, v))
+    for target in remaining:
+        parent[target] = -1
+    return parent, via
+
+
+def run_graph_batch(algorithm, graph, queries, timeout_ms=None, include_paths=True):
+    """Answer (source, target) queries on a CSR graph, one tree per distinct source.
+
+    Graphs carry no coordinates, so A* has no heuristic here and runs as
+    Dijkstra; 'bfs' ignores weights and minimises edge count.
+    """
+    weighted = algorithm != 'bfs'
+    if weighted and graph.weights is not None and min(graph.weights, default=0) < 0:
+        raise ValueError(f'{algorithm} requires non-negative edge weights')
+    deadline = Deadline(timeout_ms)
+    started = time.perf_counter()
+    groups = {}
+    for position, (source, target) in enumerate(queries):
+        groups.setdefault(source, []).append((position, target))
+
+    results = [None] * len(queries)
+    for source, group in groups.items():
+        parent, via = shortest_path_tree(graph, source, [t for _, t in group], deadline, weighted)
+        for position, target in group:
+            if parent[target] < 0:
+                results[position] = {'found': False, 'path_length': None, 'path_cost': None}
+                if include_paths:
+                    results[position]['path'] = []
+                continue
+            path, cost = [target], 0
+            while path[-1] != source:
+                cost += graph.weight(via[path[-1]])
+                path.append(parent[path[-1]])
+            path.reverse()
+            results[position] = {'found': True, 'path_length': len(path) - 1, 'path_cost': cost}
+            if include_paths:
+                results[position]['path'] = path
+
+    return dict({'algorithm': algorithm}, **graph.summary(),
+                queries=len(queries), sources=len(groups), trees_built=len(groups),
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 3), results=results)
@@ -0,0 +1,451 @@
+"""
+Grid pathfinding engine for Algorithm Playground
+
+Grids live in flat buffers: a ``bytearray`` of walls and, for weighted
+maps, a ``bytearray`` of step costs (1-9). Both are padded with a one-cell
+wall border, so the four neighbours of padded cell ``i`` are always
+``i - W``, ``i + W``, ``i - 1`` and ``i + 1`` and need no bounds checks.
+Per-cell search state (parents, distances) is kept in typed ``array``
+buffers rather than Python lists of objects.
+"""
+
+import heapq
+import time
+from array import array
+from collections import deque
+
+from engines.steps import Deadline
+
+# How many cell expansions to run between wall-clock checks
+DEADLINE_CHECK_MASK = 0xFFF
+
+_ALLOWED_CELLS = b'.#0123456789'
+_WALL_TABLE = bytes.maketrans(_ALLOWED_CELLS, b'\x00\x01' + b'\x00' * 10)
+_WEIGHT_TABLE = bytes.maketrans(_ALLOWED_CELLS, bytes([1, 0, 1]) + bytes(range(1, 10)))
+
+
+class Grid:
+    """A rectangular 4-connected grid stored as padded flat buffers"""
+
+    __slots__ = ('width', 'height', 'stride', 'walls', 'weights')
+
+    def __init__(self, width, height, walls, weights=None):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.walls = walls
+        self.weights = weights
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from strings: '#' wall, '.' or '0' open, '1'-'9' step cost"""
+        height, width = len(rows), len(rows[0])
+        stride = width + 2
+        walls = bytearray(b'\x01') * (stride * (height + 2))
+        weights = bytearray(b'\x01') * (stride * (height + 2))
+        weighted = False
+        for r, row in enumerate(rows):
+            raw = row.encode('ascii', 'replace')
+            if len(raw) != width or raw.translate(None, _ALLOWED_CELLS):
+                raise ValueError(f"Row {r} must be {width} characters of '.', '#' or '0'-'9'")
+            start = (r + 1) * stride + 1
+            walls[start:start + width] = raw.translate(_WALL_TABLE)
+            cost = raw.translate(_WEIGHT_TABLE)
+            weights[start:start + width] = cost
+            weighted = weighted or cost.count(1) != width
+        return cls(width, height, walls, weights if weighted else None)
+
+    @classmethod
+    def from_cells(cls, width, height, wall_cells, weights=None):
+        """Build from a wall list of [row, col] pairs and optional flat weights"""
+        stride = width + 2
+        walls = bytearray(b'\x01') * (stride * (height + 2))
+        for r in range(height):
+            start = (r + 1) * stride + 1
+            walls[start:start + width] = bytes(width)
+        for cell in wall_cells:
+            r, c = cell
+            if not (0 <= r < height and 0 <= c < width):
+                raise ValueError(f'Wall {cell} is outside the grid')
+            walls[(r + 1) * stride + c + 1] = 1
+
+        padded_weights = None
+        if weights is not None:
+            if len(weights) != width * height or any(
+                    isinstance(w, bool) or not isinstance(w, int) or not 1 <= w <= 9 for w in weights):
+                raise ValueError("'weights' must hold width*height integers between 1 and 9")
+            padded_weights = bytearray(b'\x01') * (stride * (height + 2))
+            for r in range(height):
+                start = (r + 1) * stride + 1
+                padded_weights[start:start + width] = bytes(weights[r * width:(r + 1) * width])
+        return cls(width, height, walls, padded_weights)
+
+    @classmethod
+    def from_request(cls, data, max_size):
+        """Parse a grid request body; dimensions are capped at max_size"""
+        rows = data.get('rows')
+        if rows is not None:
+            if (not isinstance(rows, list) or not rows or any(not isinstance(r, str) for r in rows)
+                    or not rows[0]):
+                raise ValueError("'rows' must be a non-empty list of strings")
+            if len(rows) > max_size or len(rows[0]) > max_size:
+                raise ValueError(f'Grid dimensions exceed MAX_GRID_SIZE ({max_size})')
+            return cls.from_rows(rows)
+
+        width, height = data.get('width'), data.get('height')
+        for name, value in (('width', width), ('height', height)):
+            if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= max_size:
+                raise ValueError(f"'{name}' must be an integer between 1 and {max_size}")
+        walls = data.get('walls', [])
+        if not isinstance(walls, list) or any(
+                not isinstance(w, list) or len(w) != 2 or any(isinstance(v, bool) or not isinstance(v, int) for v in w)
+                for w in walls):
+            raise ValueError("'walls' must be a list of [row, col] pairs")
+        weights = data.get('weights')
+        if weights is not None and not isinstance(weights, list):
+            raise ValueError("'weights' must be a flat list of cell costs")
+        return cls.from_cells(width, height, walls, weights)
+
+    def cell(self, point, name):
+        """Padded index of an external [row, col] point, validated as open"""
+        if (not isinstance(point, (list, tuple)) or len(point) != 2
+                or any(isinstance(v, bool) or not isinstance(v, int) for v in point)):
+            raise ValueError(f"'{name}' must be a [row, col] pair")
+        r, c = point
+        if not (0 <= r < self.height and 0 <= c < self.width):
+            raise ValueError(f"'{name}' is outside the grid")
+        index = (r + 1) * self.stride + c + 1
+        if self.walls[index]:
+            raise ValueError(f"'{name}' is a wall")
+        return index
+
+    def point(self, index):
+        """External [row, col] of a padded index"""
+        r, c = divmod(index, self.stride)
+        return [r - 1, c - 1]
+
+    def flat(self, index):
+        """External row-major cell number of a padded index"""
+        r, c = divmod(index, self.stride)
+        return (r - 1) * self.width + c - 1
+
+    def cost(self, index):
+        return self.weights[index] if self.weights is not None else 1
+
+    def size(self):
+        return len(self.walls)
+
+
+def _walk_back(parent, goal):
+    path = [goal]
+    while parent[path[-1]] != path[-1]:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+# ==================== SEARCHES ====================
+# Each search returns (path or None, visited order, frontier pushes).
+
+def bfs(grid, start, goal, budget):
+    """Breadth-first search; shortest path in steps"""
+    W, walls = grid.stride, grid.walls
+    parent = array('i', [-1]) * grid.size()
+    parent[start] = start
+    visited = array('i')
+    queue = deque([start])
+    pushes = 1
+    while queue:
+        cell = queue.popleft()
+        visited.append(cell)
+        if cell == goal:
+            return _walk_back(parent, goal), visited, pushes
+        if not len(visited) & DEADLINE_CHECK_MASK:
+            budget.check(len(visited))
+        for nb in (cell - W, cell + 1, cell + W, cell - 1):
+            if not walls[nb] and parent[nb] < 0:
+                parent[nb] = cell
+                queue.append(nb)
+                pushes += 1
+    return None, visited, pushes
+
+
+def dfs(grid, start, goal, budget):
+    """Depth-first search with an explicit stack; finds a path, not the shortest"""
+    W, walls = grid.stride, grid.walls
+    parent = array('i', [-1]) * grid.size()
+    seen = bytearray(grid.size())
+    visited = array('i')
+    parent[start] = start
+    stack = [start]
+    pushes = 1
+    while stack:
+        cell = stack.pop()
+        if seen[cell]:
+            continue
+        seen[cell] = 1
+        visited.append(cell)
+        if cell == goal:
+            return _walk_back(parent, goal), visited, pushes
+        if not len(visited) & DEADLINE_CHECK_MASK:
+            budget.check(len(visited))
+        # Pushed in reverse so up is explored first
+        for nb in (cell - 1, cell + W, cell + 1, cell - W):
+            if not walls[nb] and not seen[nb]:
+                parent[nb] = cell
+                stack.append(nb)
+                pushes += 1
+    return None, visited, pushes
+
+
+def dijkstra(grid, start, goal, budget):
+    """Dijkstra's algorithm with a binary heap; entering a cell costs its weight"""
+    return _best_first(grid, start, goal, budget, heuristic=False)
+
+
+def astar(grid, start, goal, budget):
+    """A* with the Manhattan distance heuristic (admissible since costs are >= 1)"""
+    return _best_first(grid, start, goal, budget, heuristic=True)
+
+
+def _best_first(grid, start, goal, budget, heuristic):
+    W, walls, weights = grid.stride, grid.walls, grid.weights
+    size = grid.size()
+    dist = array('q', [-1]) * size
+    parent = array('i', [-1]) * size
+    done = bytearray(size)
+    visited = array('i')
+    goal_r, goal_c = divmod(goal, W)
+
+    dist[start] = 0
+    parent[start] = start
+    # Entries are (priority, -g, cell): equal priorities pop the deepest
+    # cell first, which keeps A* from flooding plateaus of equal f
+    heap = [(0, 0, start)]
+    pushes = 1
+    while heap:
+        _, g, cell = heapq.heappop(heap)
+        g = -g
+        if done[cell]:
+            continue
+        done[cell] = 1
+        visited.append(cell)
+        if cell == goal:
+            return _walk_back(parent, goal), visited, pushes
+        if not len(visited) & DEADLINE_CHECK_MASK:
+            budget.check(len(visited))
+        for nb in (cell - W, cell + 1, cell + W, cell - 1):
+            if walls[nb] or done[nb]:
+                continue
+            candidate = g + (weights[nb] if weights is not None else 1)
+            if dist[nb] < 0 or candidate < dist[nb]:
+                dist[nb] = candidate
+                parent[nb] = cell
+                if heuristic:
+                    r, c = divmod(nb, W)
+                    priority = candidate + abs(r - goal_r) + abs(c - goal_c)
+                else:
+                    priority = candidate
+                heapq.heappush(heap, (priority, -candidate, nb))
+                pushes += 1
+    return None, visited, pushes
+
+
+def bidir_search(grid, start, goal, budget):
+    """Bidirectional BFS, always expanding the smaller frontier one full level"""
+    W, walls = grid.stride, grid.walls
+    size = grid.size()
+    parents = (array('i', [-1]) * size, array('i', [-1]) * size)
+    depth = (array('i', [-1]) * size, array('i', [-1]) * size)
+    for side, origin in enumerate((start, goal)):
+        parents[side][origin] = origin
+        depth[side][origin] = 0
+    frontiers = [[start], [goal]]
+    visited = array('i')
+    pushes = 2
+
+    best, meet = -1, -1
+    if start == goal:
+        best, meet = 0, start
+    while best < 0 and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine_parent, mine_depth = parents[side], depth[side]
+        other_depth = depth[1 - side]
+        next_level = []
+        for cell in frontiers[side]:
+            visited.append(cell)
+            if not len(visited) & DEADLINE_CHECK_MASK:
+                budget.check(len(visited))
+            for nb in (cell - W, cell + 1, cell + W, cell - 1):
+                if walls[nb] or mine_depth[nb] >= 0:
+                    continue
+                mine_parent[nb] = cell
+                mine_depth[nb] = mine_depth[cell] + 1
+                next_level.append(nb)
+                pushes += 1
+                if other_depth[nb] >= 0:
+                    total = mine_depth[nb] + other_depth[nb]
+                    if best < 0 or total < best:
+                        best, meet = total, nb
+        frontiers[side] = next_level
+
+    if best < 0:
+        return None, visited, pushes
+    forward = _walk_back(parents[0], meet)
+    backward = _walk_back(parents[1], meet)
+    backward.reverse()
+    return forward + backward[1:], visited, pushes
+
+
+GRID_ALGORITHMS = {
+    'bfs': bfs,
+    'dfs': dfs,
+    'dijkstra': dijkstra,
+    'astar': astar,
+    'bidir_search': bidir_search
+}
+
+
+def run_grid_search(algorithm, grid, start, goal, timeout_ms=None, include_visited=True, max_visited=None):
+    """Run one search between padded cells and shape the result for the API.
+
+    ``max_visited`` caps the visited list (the first cells in visit order).
+    """
+    started = time.perf_counter()
+    path, visited, pushes = GRID_ALGORITHMS[algorithm](grid, start, goal, Deadline(timeout_ms))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    result = {
+        'algorithm': algorithm,
+        'width': grid.width,
+        'height': grid.height,
+        'found': path is not None,
+        'path': [grid.point(cell) for cell in path] if path else [],
+        'path_length': len(path) - 1 if path else None,
+        'path_cost': sum(grid.cost(cell) for cell in path[1:]) if path else None,
+        'visited_count': len(visited),
+        'frontier_pushes': pushes,
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+    if include_visited:
+        shown = visited[:max_visited] if max_visited is not None else visited
+        result['visited'] = [grid.flat(cell) for cell in shown]
+        result['visited_truncated'] = len(shown) < len(visited)
+    return result
+
+
+# ==================== BATCH QUERIES ====================
+
+# Searches the batch endpoint answers, and whether their trees use step costs
+BATCH_ALGORITHMS = {'bfs': False, 'dijkstra': True, 'astar': True}
+
+
+def shortest_path_tree(grid, source, targets, budget, weighted):
+    """Grow a shortest-path tree from source until every target is settled.
+
+    Returns ``(parent, settled)``; a target reached the tree iff its parent
+    is not -1. ``weighted`` selects Dijkstra over step costs instead of BFS.
+    """
+    W, walls, weights = grid.stride, grid.walls, grid.weights
+    size = grid.size()
+    parent = array('i', [-1]) * size
+    parent[source] = source
+    remaining = set(targets)
+    remaining.discard(source)
+    settled = 1
+
+    if not weighted or weights is None:
+        queue = deque([source])
+        while queue and remaining:
+            cell = queue.popleft()
+            for nb in (cell - W, cell + 1, cell + W, cell - 1):
+                if not walls[nb] and parent[nb] < 0:
+                    parent[nb] = cell
+                    queue.append(nb)
+                    remaining.discard(nb)
+            settled += 1
+            if not settled & DEADLINE_CHECK_MASK:
+                budget.check(settled)
+        return parent, settled
+
+    dist = array('q', [-1]) * size
+    done = bytearray(size)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap and remaining:
+        g, cell = heapq.heappop(heap)
+        if done[cell]:
+            continue
+        done[cell] = 1
+        remaining.discard(cell)
+        settled += 1
+        if not settled & DEADLINE_CHECK_MASK:
+            budget.check(settled)
+        for nb in (cell - W, cell + 1, cell + W, cell - 1):
+            if walls[nb] or done[nb]:
+                continue
+            candidate = g + weights[nb]
+            if dist[nb] < 0 or candidate < dist[nb]:
+                dist[nb] = candidate
+                parent[nb] = cell
+                heapq.heappush(heap, (candidate, nb))
+    # Cells still in the heap have tentative parents; only settled ones count
+    for target in remaining:
+        parent[target] = -1
+    return parent, settled
+
+
+def run_grid_batch(algorithm, grid, queries, timeout_ms=None, include_paths=True):
+    """Answer many (source, target) queries against one parsed grid.
+
+    Queries are grouped by source and each group shares one tree. A* keeps
+    its goal-directed search for sources with a single target, where a
+    tree would only add work.
+    """
+    budget = Deadline(timeout_ms)
+    started = time.perf_counter()
+    groups = {}
+    for position, (source, target) in enumerate(queries):
+        groups.setdefault(source, []).append((position, target))
+
+    answers = [None] * len(queries)
+    trees = searches = settled = 0
+    for source, group in groups.items():
+        if algorithm == 'astar' and len(group) == 1:
+            position, target = group[0]
+            path, visited, _ = astar(grid, source, target, budget)
+            answers[position] = path
+            searches += 1
+            settled += len(visited)
+            continue
+
+        parent, expanded = shortest_path_tree(grid, source, [t for _, t in group], budget,
+                                              BATCH_ALGORITHMS[algorithm])
+        trees += 1
+        settled += expanded
+        for position, target in group:
+            answers[position] = _walk_back(parent, target) if parent[target] >= 0 else None
+
+    results = []
+    for path in answers:
+        answer = {
+            'found': path is not None,
+            'path_length': len(path) - 1 if path else None,
+            'path_cost': sum(grid.cost(cell) for cell in path[1:]) if path else None
+        }
+        if include_paths:
+            answer['path'] = [grid.point(cell) for cell in path] if path else []
+        results.append(answer)
+
+    return {
+        'algorithm': algorithm,
+        'width': grid.width,
+        'height': grid.height,
+        'queries': len(queries),
+        'sources': len(groups),
+        'trees_built': trees,
+        'single_searches': searches,
+        'cells_settled': settled,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        'results': results
+    }
@@ -0,0 +1,316 @@
+"""
+Minimum spanning tree engine for Algorithm Playground
+
+Kruskal, Prim and Borůvka on the same undirected weighted input, sharing
+one array-backed disjoint-set forest. Disconnected inputs produce a
+minimum spanning forest. Each run reports the total weight, the chosen
+edges and timed phases: sort/scan for Kruskal, one row per tree for Prim
+and one row per round for Borůvka.
+
+Borůvka's cheapest-edge scan can be split across the shared process pool
+(engines.pool); equal weights are broken by edge index so every round
+picks a consistent, cycle-free set of edges.
+"""
+
+import time
+from array import array
+from itertools import compress
+
+from engines.graph import build_csr
+
+# Borůvka chunks smaller than this are not worth shipping to a worker
+MIN_CHUNK_EDGES = 50000
+
+# Prim lists at most this many per-tree rows (forests can have V trees)
+MAX_REPORTED_TREES = 1000
+
+
+class DisjointSet:
+    """Union-find over 0..n-1 with path compression and union by rank"""
+
+    __slots__ = ('parent', 'rank', 'finds', 'unions')
+
+    def __init__(self, n):
+        self.parent = array('i', range(n))
+        self.rank = bytearray(n)
+        self.finds = 0
+        self.unions = 0
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        self.finds += 1
+        return root
+
+    def union(self, a, b):
+        """Merge the sets of a and b; False if they were already joined"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self.unions += 1
+        return True
+
+    def labels(self):
+        """Root of every element, as an array"""
+        return array('i', (self.find(x) for x in range(len(self.parent))))
+
+
+class IndexedHeap:
+    """Binary min-heap of vertices keyed by float, with decrease-key by vertex"""
+
+    __slots__ = ('heap', 'position', 'key')
+
+    def __init__(self, n):
+        self.heap = array('i')
+        self.position = array('i', [-1]) * n
+        self.key = array('d', bytes(8 * n))
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push_or_decrease(self, v, key):
+        """Insert v, or lower its key; returns False if the key would not drop"""
+        i = self.position[v]
+        if i < 0:
+            self.heap.append(v)
+            i = len(self.heap) - 1
+            self.position[v] = i
+        elif key >= self.key[v]:
+            return False
+        self.key[v] = key
+        self._sift_up(i)
+        return True
+
+    def pop(self):
+        heap, position = self.heap, self.position
+        top = heap[0]
+        last = heap.pop()
+        position[top] = -2  # popped for good
+        if heap:
+            heap[0] = last
+            position[last] = 0
+            self._sift_down(0)
+        return top
+
+    def _sift_up(self, i):
+        heap, position, key = self.heap, self.position, self.key
+        v = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            if key[heap[parent]] <= key[v]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i]] = i
+            i = parent
+        heap[i] = v
+        position[v] = i
+
+    def _sift_down(self, i):
+        heap, position, key = self.heap, self.position, self.key
+        n = len(heap)
+        v = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and key[heap[child + 1]] < key[heap[child]]:
+                child += 1
+            if key[heap[child]] >= key[v]:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = v
+        position[v] = i
+
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+# ==================== ALGORITHMS ====================
+# Each takes an undirected EdgeList and returns (chosen edge ids, phases, sets).
+
+def kruskal(edges, deadline, pool=None):
+    """Scan edges by increasing weight, keeping those that join two trees"""
+    started = time.perf_counter()
+    weights = edges.weights
+    order = sorted(range(len(edges)), key=weights.__getitem__) if weights is not None else range(len(edges))
+    phases = [{'phase': 'sort', 'ms': _ms(started)}]
+
+    started = time.perf_counter()
+    sets = DisjointSet(edges.vertices)
+    chosen = array('i')
+    target = edges.vertices - 1
+    scanned = 0
+    for scanned, i in enumerate(order, 1):
+        if sets.union(edges.sources[i], edges.targets[i]):
+            chosen.append(i)
+            if len(chosen) == target:
+                break
+        if not scanned & 0xFFFF:
+            deadline.check(scanned)
+    phases.append({'phase': 'scan', 'ms': _ms(started), 'edges_scanned': scanned})
+    return chosen, phases, sets
+
+
+def prim(edges, deadline, pool=None):
+    """Grow one tree per component from its lowest vertex with an indexed heap"""
+    graph = build_csr(edges, directed=False)
+    offsets, targets, edge_ids = graph.offsets, graph.targets, graph.edge_ids
+    weight = graph.weight
+    heap = IndexedHeap(graph.vertices)
+    via = array('i', [-1]) * graph.vertices
+    chosen = array('i')
+    phases = []
+    trees = decrease_keys = 0
+
+    for root in range(graph.vertices):
+        if heap.position[root] == -2:
+            continue
+        started = time.perf_counter()
+        size = 0
+        heap.push_or_decrease(root, 0.0)
+        while heap:
+            u = heap.pop()
+            size += 1
+            if via[u] >= 0:
+                chosen.append(via[u])
+            for slot in range(offsets[u], offsets[u + 1]):
+                v = targets[slot]
+                if heap.position[v] != -2 and heap.push_or_decrease(v, weight(slot)):
+                    via[v] = edge_ids[slot]
+                    decrease_keys += 1
+            if not size & 0xFFF:
+                deadline.check(len(chosen))
+        trees += 1
+        if trees <= MAX_REPORTED_TREES:
+            phases.append({'phase': 'tree', 'root': root, 'vertices': size, 'ms': _ms(started)})
+    phases.append({'phase': 'summary', 'heap_updates': decrease_keys, 'trees': trees})
+    return chosen, phases, None
+
+
+def cheapest_edges(labels, sources, targets, weights, ids):
+    """Cheapest outgoing edge per component within one chunk of live edges.
+
+    Runs in pool workers. Returns {component: (weight, edge id)}. Chunks
+    list edges in increasing id order, so a strict weight comparison
+    already keeps the lowest id among equal weights.
+    """
+    vertices = len(labels)
+    best_weight = array('d', [float('inf')]) * vertices
+    best_id = array('i', [-1]) * vertices
+    for k in range(len(ids)):
+        a, b = labels[sources[k]], labels[targets[k]]
+        if a == b:
+            continue
+        w = weights[k]
+        if w < best_weight[a]:
+            best_weight[a] = w
+            best_id[a] = ids[k]
+        if w < best_weight[b]:
+            best_weight[b] = w
+            best_id[b] = ids[k]
+    return {c: (best_weight[c], best_id[c]) for c in range(vertices) if best_id[c] >= 0}
+
+
+def boruvka(edges, deadline, pool=None, workers=1):
+    """Per round, every component takes its cheapest outgoing edge.
+
+    Edges that end up inside one component are dropped after each round,
+    so later rounds only scan the edges still joining components.
+    """
+    sets = DisjointSet(edges.vertices)
+    chosen = array('i')
+    phases = []
+    count = len(edges)
+    sources, targets = edges.sources, edges.targets
+    weights = edges.weights if edges.weights is not None else array('d', [1.0]) * count
+    ids = array('i', range(count))
+    labels = array('i', range(edges.vertices))
+    components = edges.vertices
+
+    while ids:
+        started = time.perf_counter()
+        live = len(ids)
+        chunks = max(1, min(workers, live // MIN_CHUNK_EDGES)) if pool is not None else 1
+        if chunks > 1:
+            bounds = [live * c // chunks for c in range(chunks + 1)]
+            futures = [pool.submit(cheapest_edges, labels, sources[lo:hi], targets[lo:hi],
+                                   weights[lo:hi], ids[lo:hi])
+                       for lo, hi in zip(bounds, bounds[1:])]
+            partials = [future.result() for future in futures]
+        else:
+            partials = [cheapest_edges(labels, sources, targets, weights, ids)]
+        scan_ms = _ms(started)
+
+        started = time.perf_counter()
+        best = {}
+        for partial in partials:
+            for component, candidate in partial.items():
+                if component not in best or candidate < best[component]:
+                    best[component] = candidate
+        added = 0
+        for i in sorted({i for _, i in best.values()}):
+            if sets.union(edges.sources[i], edges.targets[i]):
+                chosen.append(i)
+                added += 1
+
+        labels = sets.labels()
+        keep = [labels[a] != labels[b] for a, b in zip(sources, targets)]
+        sources = array('i', compress(sources, keep))
+        targets = array('i', compress(targets, keep))
+        weights = array('d', compress(weights, keep))
+        ids = array('i', compress(ids, keep))
+        phases.append({'phase': 'round', 'round': len(phases) + 1, 'components': components,
+                       'live_edges': live, 'edges_added': added, 'chunks': chunks,
+                       'scan_ms': scan_ms, 'merge_ms': _ms(started)})
+        components -= added
+        deadline.check(len(phases))
+    return chosen, phases, sets
+
+
+MST_ALGORITHMS = {
+    'kruskal': kruskal,
+    'prim': prim,
+    'boruvka': boruvka
+}
+
+
+def run_mst(algorithm, edges, deadline, pool=None, workers=1, include_edges=True):
+    """Run one MST algorithm on an undirected EdgeList and shape the report"""
+    if edges.weights is not None and any(w != w for w in edges.weights):
+        raise ValueError('Edge weights must be numbers')
+    started = time.perf_counter()
+    options = {'workers': workers} if algorithm == 'boruvka' else {}
+    chosen, phases, sets = MST_ALGORITHMS[algorithm](edges, deadline, pool=pool, **options)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    total = sum(edges.weights[i] for i in chosen) if edges.weights is not None else len(chosen)
+    result = {
+        'algorithm': algorithm,
+        'vertices': edges.vertices,
+        'edges': len(edges),
+        'total_weight': total,
+        'tree_edges': len(chosen),
+        'spanning_tree': len(chosen) == edges.vertices - 1,
+        'components': edges.vertices - len(chosen),
+        'phases': phases,
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+    if sets is not None:
+        result['union_find'] = {'finds': sets.finds, 'unions': sets.unions}
+    if include_edges:
+        weight = (lambda i: edges.weights[i]) if edges.weights is not None else (lambda i: 1)
+        result['mst_edges'] = [[edges.sources[i], edges.targets[i], weight(i)] for i in chosen]
+    return result
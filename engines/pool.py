@@ -0,0 +1,65 @@
+"""
+Shared worker process pool for CPU-bound engine work
+
+The pool is created lazily on first use in each server process, so every
+gunicorn worker owns at most one pool and idle workers pay nothing.
+Tasks that belong to one request share a wall-clock expiry (see
+``call_before``), so a task that waited in the queue does not get a fresh
+budget when it finally starts.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engines.steps import ExecutionTimeout
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def mp_context():
+    """Multiprocessing context used for every engine worker process"""
+    # forkserver avoids forking a threaded server process; spawn elsewhere
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def get_pool(max_workers=None):
+    """Return the process pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1,
+                                        mp_context=mp_context())
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the pool's worker processes, if it was ever started"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def call_before(function, args, timeout_ms, expires_at):
+    """Run ``function(*args, remaining_ms)`` in a pool worker with whatever is left before ``expires_at``.
+
+    ``expires_at`` is a time.time() value; ``timeout_ms`` is the request's
+    whole budget, which is what a timeout reports.
+    """
+    remaining_ms = (expires_at - time.time()) * 1000
+    if remaining_ms <= 0:
+        raise ExecutionTimeout(timeout_ms, 0)
+    try:
+        return function(*args, remaining_ms)
+    except ExecutionTimeout as e:
+        raise ExecutionTimeout(timeout_ms, e.steps, e.counts) from None
+
+
+atexit.register(shutdown_pool)
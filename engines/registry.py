@@ -0,0 +1,81 @@
+"""
+Registry of step-generator engines, keyed by catalog category
+
+Turns a request body into ``(steps, state)``: the step generator and the
+mutable object it works on, which doubles as the partial result when a
+run is stopped early.
+"""
+
+from engines.sorting import SORTING_ALGORITHMS, sort_report
+from engines.searching import SEARCHING_ALGORITHMS, search_steps, search_report
+from engines.backtracking import BACKTRACKING_ALGORITHMS, backtracking_report
+from engines.bits import BIT_ALGORITHMS, bit_report
+
+
+def check_array(values, max_size):
+    """Return an error message if values is not a bounded list of numbers"""
+    if not isinstance(values, list):
+        return "'array' must be a list of numbers"
+    if len(values) > max_size:
+        return f"'array' exceeds MAX_ARRAY_SIZE ({max_size})"
+    if any(isinstance(x, bool) or not isinstance(x, (int, float)) for x in values):
+        return "'array' must contain only numbers"
+    return None
+
+
+def check_target(target):
+    """Return an error message if target is not a number"""
+    if isinstance(target, bool) or not isinstance(target, (int, float)):
+        return "'target' must be a number"
+    return None
+
+
+def _sorting_run(algorithm, data, max_array_size):
+    error = check_array(data.get('array'), max_array_size)
+    if error:
+        raise ValueError(error)
+    values = list(data['array'])
+    return SORTING_ALGORITHMS[algorithm](values), values
+
+
+def _searching_run(algorithm, data, max_array_size):
+    error = check_array(data.get('array'), max_array_size) or check_target(data.get('target'))
+    if error:
+        raise ValueError(error)
+    return search_steps(algorithm, data['array'], data['target']), None
+
+
+def _backtracking_run(algorithm, data, max_array_size):
+    if algorithm in ('permutations', 'combinations') and isinstance(data.get('array'), list):
+        # Hand the engine our own copy so its in-place swaps stay observable
+        data = dict(data, array=list(data['array']))
+        return BACKTRACKING_ALGORITHMS[algorithm](data), data['array']
+    return BACKTRACKING_ALGORITHMS[algorithm](data), None
+
+
+def _bit_run(algorithm, data, max_array_size):
+    return BIT_ALGORITHMS[algorithm](data), None
+
+
+# category -> (algorithms, run builder, report shaper)
+STEP_ENGINES = {
+    'sorting': (SORTING_ALGORITHMS, _sorting_run, sort_report),
+    'searching': (SEARCHING_ALGORITHMS, _searching_run, search_report),
+    'backtracking': (BACKTRACKING_ALGORITHMS, _backtracking_run, backtracking_report),
+    'bit': (BIT_ALGORITHMS, _bit_run, bit_report)
+}
+
+
+def has_engine(category, algorithm):
+    """True when the algorithm has a step-generator implementation"""
+    return category in STEP_ENGINES and algorithm in STEP_ENGINES[category][0]
+
+
+def build_run(category, algorithm, data, max_array_size):
+    """Validate a request body; return ``(steps, state)`` for the run"""
+    return STEP_ENGINES[category][1](algorithm, data, max_array_size)
+
+
+def build_report(category, algorithm, result, counts, elapsed_ms):
+    """Shape a finished run the way the category's run endpoint returns it"""
+    return STEP_ENGINES[category][2](algorithm, result, counts, elapsed_ms)
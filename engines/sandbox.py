@@ -0,0 +1,132 @@
+"""
+Sandboxed execution of step-generator runs
+
+Each run happens in its own worker process with three budgets: a
+wall-clock deadline, a step budget and a memory cap. The deadline and
+step budget are cooperative and the memory cap is polled from inside the
+run, so an over-budget run stops cleanly and reports how far it got. A
+hard address-space limit and a parent-side kill after a grace period
+back them up, so the web worker always gets an answer and never dies
+with the run.
+"""
+
+import resource
+import time
+
+from engines.pool import mp_context
+from engines.registry import build_run, build_report
+from engines.steps import (OP_NAMES, FOUND, ExecutionTimeout, StepBudgetExceeded,
+                           MemoryBudgetExceeded, run_steps)
+
+# Statuses reported for runs that did not finish
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'
+STATUS_STEP_BUDGET = 'step_budget'
+STATUS_MEMORY = 'memory'
+STATUS_INVALID = 'invalid'
+STATUS_CRASHED = 'crashed'
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _address_space_bytes():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _apply_memory_limit(max_memory_bytes):
+    """Cap the worker's address space at its current size plus the budget"""
+    current = _address_space_bytes()
+    if current is None:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (current + max_memory_bytes, current + max_memory_bytes))
+    except (ValueError, OSError):
+        pass
+
+
+def _partial(error, state):
+    counts = error.counts or {}
+    return {
+        'steps': error.steps,
+        'counts': {OP_NAMES[op]: count for op, count in counts.items() if count},
+        'solutions_found': counts.get(FOUND, 0),
+        'state': state
+    }
+
+
+def _worker(conn, category, algorithm, data, limits):
+    """Entry point of the sandbox process: run once, send one message"""
+    baseline_rss = _peak_rss_bytes()
+    max_memory = limits['max_memory_mb'] * 1024 * 1024
+    _apply_memory_limit(max_memory)
+    state = None
+    try:
+        steps, state = build_run(category, algorithm, data, limits['max_array_size'])
+        result, counts, elapsed_ms = run_steps(
+            steps, limits['timeout_ms'], max_steps=limits['max_steps'],
+            memory_check=lambda: _peak_rss_bytes() - baseline_rss > max_memory)
+        message = {'status': STATUS_OK,
+                   'report': build_report(category, algorithm, result, counts, elapsed_ms)}
+    except ValueError as e:
+        message = {'status': STATUS_INVALID, 'error': str(e)}
+    except ExecutionTimeout as e:
+        message = {'status': STATUS_TIMEOUT, 'error': str(e), 'partial': _partial(e, state)}
+    except StepBudgetExceeded as e:
+        message = {'status': STATUS_STEP_BUDGET, 'error': str(e), 'partial': _partial(e, state)}
+    except MemoryBudgetExceeded as e:
+        message = {'status': STATUS_MEMORY, 'error': str(e), 'partial': _partial(e, state)}
+    except MemoryError:
+        state = None
+        message = {'status': STATUS_MEMORY, 'error': 'Execution hit the hard memory limit'}
+    try:
+        conn.send(message)
+    except MemoryError:
+        conn.send({'status': STATUS_MEMORY, 'error': 'Result too large for the memory limit'})
+    finally:
+        conn.close()
+
+
+def run_sandboxed(category, algorithm, data, timeout_ms, max_steps, max_memory_mb,
+                  max_array_size, grace_ms=2000):
+    """Run one algorithm in a fresh worker process under all three budgets.
+
+    Always returns a dict with a ``status``; ``report`` on success, otherwise
+    ``error`` and, when the run stopped itself, a ``partial`` snapshot.
+    """
+    limits = {
+        'timeout_ms': timeout_ms,
+        'max_steps': max_steps,
+        'max_memory_mb': max_memory_mb,
+        'max_array_size': max_array_size
+    }
+    context = mp_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_worker, args=(sender, category, algorithm, data, limits),
+                              daemon=True)
+    started = time.perf_counter()
+    process.start()
+    sender.close()
+
+    try:
+        if receiver.poll((timeout_ms + grace_ms) / 1000):
+            message = receiver.recv()
+        else:
+            message = {'status': STATUS_TIMEOUT,
+                       'error': f'Execution was killed after {timeout_ms + grace_ms} ms'}
+    except EOFError:
+        message = {'status': STATUS_CRASHED, 'error': 'Worker process exited without a result'}
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join(1)
+
+    message['wall_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return message
@@ -0,0 +1,188 @@
+"""
+Searching engine for Algorithm Playground
+
+Every search in the ``searching`` catalog section, written as a step
+generator (see engines.steps) that returns the index of the target or -1.
+"""
+
+from math import isqrt
+
+from engines.steps import PROBE, RANGE, run_steps
+
+
+def linear_search(a, target):
+    """Linear search"""
+    for i in range(len(a)):
+        yield (PROBE, i, 0)
+        if a[i] == target:
+            return i
+    return -1
+
+
+def _binary_search(a, target, lo, hi):
+    while lo <= hi:
+        yield (RANGE, lo, hi)
+        mid = (lo + hi) // 2
+        yield (PROBE, mid, 0)
+        if a[mid] == target:
+            return mid
+        if a[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+
+def binary_search(a, target):
+    """Iterative binary search"""
+    return (yield from _binary_search(a, target, 0, len(a) - 1))
+
+
+def jump_search(a, target):
+    """Jump search with sqrt(n) blocks, then a linear scan of one block"""
+    n = len(a)
+    if n == 0:
+        return -1
+    block = max(isqrt(n), 1)
+    prev, step = 0, block
+    while True:
+        last = min(step, n) - 1
+        yield (PROBE, last, 0)
+        if a[last] >= target:
+            break
+        prev, step = step, step + block
+        if prev >= n:
+            return -1
+
+    yield (RANGE, prev, min(step, n) - 1)
+    for i in range(prev, min(step, n)):
+        yield (PROBE, i, 0)
+        if a[i] == target:
+            return i
+        if a[i] > target:
+            break
+    return -1
+
+
+def interpolation_search(a, target):
+    """Interpolation search, estimating the position from the value range"""
+    lo, hi = 0, len(a) - 1
+    while lo <= hi and a[lo] <= target <= a[hi]:
+        yield (RANGE, lo, hi)
+        if a[hi] == a[lo]:
+            pos = lo
+        else:
+            pos = lo + int((target - a[lo]) * (hi - lo) / (a[hi] - a[lo]))
+        yield (PROBE, pos, 0)
+        if a[pos] == target:
+            return pos
+        if a[pos] < target:
+            lo = pos + 1
+        else:
+            hi = pos - 1
+    return -1
+
+
+def exponential_search(a, target):
+    """Exponential search: double the bound, then binary search the range"""
+    n = len(a)
+    if n == 0:
+        return -1
+    yield (PROBE, 0, 0)
+    if a[0] == target:
+        return 0
+    bound = 1
+    while bound < n:
+        yield (PROBE, bound, 0)
+        if a[bound] > target:
+            break
+        bound *= 2
+    return (yield from _binary_search(a, target, bound // 2, min(bound, n - 1)))
+
+
+def ternary_search(a, target):
+    """Ternary search over a sorted array"""
+    lo, hi = 0, len(a) - 1
+    while lo <= hi:
+        yield (RANGE, lo, hi)
+        third = (hi - lo) // 3
+        m1, m2 = lo + third, hi - third
+        yield (PROBE, m1, 0)
+        if a[m1] == target:
+            return m1
+        yield (PROBE, m2, 0)
+        if a[m2] == target:
+            return m2
+        if target < a[m1]:
+            hi = m1 - 1
+        elif target > a[m2]:
+            lo = m2 + 1
+        else:
+            lo, hi = m1 + 1, m2 - 1
+    return -1
+
+
+def fibonacci_search(a, target):
+    """Fibonacci search using Fibonacci numbers as split points"""
+    n = len(a)
+    fib2, fib1 = 0, 1
+    fib = fib2 + fib1
+    while fib < n:
+        fib2, fib1 = fib1, fib
+        fib = fib2 + fib1
+
+    offset = -1
+    while fib > 1:
+        i = min(offset + fib2, n - 1)
+        yield (RANGE, offset + 1, n - 1)
+        yield (PROBE, i, 0)
+        if a[i] < target:
+            fib, fib1 = fib1, fib2
+            fib2 = fib - fib1
+            offset = i
+        elif a[i] > target:
+            fib = fib2
+            fib1 = fib1 - fib2
+            fib2 = fib - fib1
+        else:
+            return i
+    if fib1 and offset + 1 < n:
+        yield (PROBE, offset + 1, 0)
+        if a[offset + 1] == target:
+            return offset + 1
+    return -1
+
+
+SEARCHING_ALGORITHMS = {
+    'linear': linear_search,
+    'binary': binary_search,
+    'jump': jump_search,
+    'interpolation': interpolation_search,
+    'exponential': exponential_search,
+    'ternary': ternary_search,
+    'fibonacci': fibonacci_search
+}
+
+
+def search_steps(algorithm, values, target):
+    """Return the step generator for a search, checking its preconditions"""
+    if algorithm != 'linear' and any(values[i] > values[i + 1] for i in range(len(values) - 1)):
+        raise ValueError(f'{algorithm} search requires a sorted array')
+    return SEARCHING_ALGORITHMS[algorithm](values, target)
+
+
+def search_report(algorithm, index, counts, elapsed_ms):
+    """Shape a finished search for the API"""
+    return {
+        'algorithm': algorithm,
+        'index': index,
+        'found': index != -1,
+        'probes': counts[PROBE],
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+
+
+def run_search(algorithm, values, target, timeout_ms=None):
+    """Search ``values`` for ``target`` and report the result with probe counters"""
+    index, counts, elapsed_ms = run_steps(search_steps(algorithm, values, target), timeout_ms)
+    return search_report(algorithm, index, counts, elapsed_ms)
@@ -0,0 +1,216 @@
+"""
+Segmented prime sieve for prime_sieve
+
+[lo, hi] is sieved one fixed-size segment at a time, so memory is bounded
+by SEGMENT_ODDS whatever the range. Only odd numbers are stored, one
+bytearray cell each (1 = prime): striking a prime's multiples is then a
+single extended-slice assignment in C, which a bit-packed layout cannot
+match from Python. Each segment starts as a copy of a precomputed wheel
+pattern with the multiples of 3, 5, 7, 11 and 13 already struck, so only
+base primes from 17 up are sieved per segment.
+
+Base primes (up to sqrt(hi)) come from a process-wide BasePrimeTable that
+grows on demand and is shared with prime factorization. Large counts can
+be split into contiguous chunks and run in the shared process pool.
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import wait
+from itertools import compress
+from math import isqrt
+
+from engines.steps import Deadline, ExecutionTimeout
+
+# Odd numbers per segment (1 MiB of flags, about 2 million integers)
+SEGMENT_ODDS = 1 << 20
+
+# Chunks handed to pool workers span at least this many integers
+PARALLEL_MIN_SPAN = 1 << 26
+
+WHEEL_PRIMES = (3, 5, 7, 11, 13)
+WHEEL_PERIOD = 3 * 5 * 7 * 11 * 13  # in odd-number steps
+
+_ZEROS = memoryview(bytes(SEGMENT_ODDS))
+
+
+def _wheel_pattern():
+    pattern = bytearray(b'\x01') * WHEEL_PERIOD
+    for p in WHEEL_PRIMES:
+        # odd index j stands for 2j + 1; p | 2j + 1 first at j = (p - 1) / 2
+        pattern[(p - 1) // 2::p] = bytes(len(range((p - 1) // 2, WHEEL_PERIOD, p)))
+    return bytes(pattern * (SEGMENT_ODDS // WHEEL_PERIOD + 2))
+
+
+_WHEEL = _wheel_pattern()
+
+
+# ==================== BASE PRIMES ====================
+
+def simple_sieve(limit):
+    """All primes <= limit, odd-only and unsegmented (for base primes)"""
+    if limit < 2:
+        return array('I')
+    flags = bytearray(b'\x01') * ((limit + 1) // 2)  # flags[j] <-> 2j + 1
+    flags[0] = 0
+    for i in range(1, (isqrt(limit) + 1) // 2):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    primes = array('I', [2])
+    primes.extend(compress(range(1, limit + 1, 2), flags))
+    return primes
+
+
+class BasePrimeTable:
+    """Primes up to a growing limit, extended by doubling and shared between requests"""
+
+    def __init__(self, initial_limit=1 << 16):
+        self.lock = threading.Lock()
+        self.limit = initial_limit
+        self.table = simple_sieve(initial_limit)
+        self.hits = 0
+        self.extensions = 0
+
+    def primes(self, limit):
+        """Primes <= limit (a copy, safe to pickle to pool workers)"""
+        with self.lock:
+            if limit > self.limit:
+                self.limit = max(limit, 2 * self.limit)
+                self.table = simple_sieve(self.limit)
+                self.extensions += 1
+            else:
+                self.hits += 1
+            return self.table[:bisect_right(self.table, limit)]
+
+    def stats(self):
+        with self.lock:
+            return {
+                'limit': self.limit,
+                'primes': len(self.table),
+                'bytes': len(self.table) * self.table.itemsize,
+                'hits': self.hits,
+                'extensions': self.extensions
+            }
+
+
+# ==================== SEGMENTS ====================
+
+def sieve_segment(lo, hi, base):
+    """Flags for the odd numbers in [lo, hi); returns (first odd number, bytearray).
+
+    ``base`` must hold every prime up to sqrt(hi - 1). ``hi - lo`` must not
+    exceed 2 * SEGMENT_ODDS.
+    """
+    first = lo | 1
+    size = max(0, (hi - first + 1) // 2)
+    offset = (first // 2) % WHEEL_PERIOD
+    flags = bytearray(_WHEEL[offset:offset + size])
+    for p in base:
+        if p <= WHEEL_PRIMES[-1]:
+            continue
+        square = p * p
+        if square >= hi:
+            break
+        # first odd multiple of p that is >= max(p*p, first)
+        start = max(square, (first + p - 1) // p * p)
+        if not start & 1:
+            start += p
+        i = (start - first) // 2
+        if i < size:
+            flags[i::p] = _ZEROS[:(size - 1 - i) // p + 1]
+    # The wheel struck its own primes, and 1 is not prime
+    for p in WHEEL_PRIMES:
+        if first <= p < hi:
+            flags[(p - first) // 2] = 1
+    if first == 1 and size:
+        flags[0] = 0
+    return first, flags
+
+
+def _segments(lo, hi):
+    """[lo, hi) split into segment bounds"""
+    step = 2 * SEGMENT_ODDS
+    for start in range(lo, hi, step):
+        yield start, min(start + step, hi)
+
+
+def count_range(lo, hi, base, expires_at=None):
+    """Number of primes in [lo, hi), or None once time.time() passes expires_at; runs in pool workers"""
+    if expires_at is not None and time.time() >= expires_at:
+        return None
+    deadline = Deadline((expires_at - time.time()) * 1000 if expires_at is not None else None)
+    total = 1 if lo <= 2 < hi else 0
+    for position, (a, b) in enumerate(_segments(lo, hi)):
+        total += sieve_segment(a, b, base)[1].count(1)
+        try:
+            deadline.check(position)
+        except ExecutionTimeout:
+            return None
+    return total
+
+
+def prime_batches(lo, hi, base, deadline):
+    """Yield the primes in [lo, hi), one list per segment"""
+    if lo <= 2 < hi:
+        yield [2]
+    for position, (a, b) in enumerate(_segments(lo, hi)):
+        first, flags = sieve_segment(a, b, base)
+        batch = list(compress(range(first, b, 2), flags))
+        if batch:
+            yield batch
+        deadline.check(position)
+
+
+# ==================== RUNS ====================
+
+def count_primes(lo, hi, base_primes, deadline, pool=None, workers=1, sample=0):
+    """Count the primes in [lo, hi]; ``sample`` lists the first few of them"""
+    started = time.perf_counter()
+    end = hi + 1
+    base = base_primes.primes(isqrt(hi))
+    chunks = max(1, min(4 * workers, (end - lo) // PARALLEL_MIN_SPAN)) if pool is not None else 1
+
+    first_primes = []
+    if sample:
+        for batch in prime_batches(lo, end, base, deadline):
+            first_primes.extend(batch[:sample - len(first_primes)])
+            if len(first_primes) >= sample:
+                break
+
+    if chunks > 1:
+        bounds = [lo + (end - lo) * c // chunks for c in range(chunks + 1)]
+        # Workers get the same wall-clock expiry, so chunks that already started
+        # (or could not be cancelled) stop with the request
+        remaining = deadline.deadline - time.perf_counter() if deadline.deadline is not None else None
+        expires_at = None if remaining is None else time.time() + remaining
+        futures = [pool.submit(count_range, a, b, base, expires_at) for a, b in zip(bounds, bounds[1:])]
+        done, pending = wait(futures, timeout=remaining)
+        counts = [future.result() for future in done]
+        if pending or None in counts:
+            for future in pending:
+                future.cancel()
+            raise ExecutionTimeout(deadline.timeout_ms, len(done))
+        count = sum(counts)
+    else:
+        count = 1 if lo <= 2 < end else 0
+        for position, (a, b) in enumerate(_segments(lo, end)):
+            count += sieve_segment(a, b, base)[1].count(1)
+            deadline.check(position)
+
+    result = {
+        'lo': lo,
+        'hi': hi,
+        'count': count,
+        'segments': len(range(lo, end, 2 * SEGMENT_ODDS)),
+        'chunks': chunks,
+        'base_primes': len(base),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+    }
+    if sample:
+        result['primes'] = first_primes
+        result['truncated'] = count > len(first_primes)
+    return result
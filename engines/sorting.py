@@ -0,0 +1,300 @@
+"""
+Sorting engine for Algorithm Playground
+
+Every sort in the ``sorting`` catalog section, written as a step generator
+(see engines.steps) that sorts its list argument in place.
+"""
+
+from engines.steps import COMPARE, SWAP, WRITE, run_steps
+
+# Counting sort allocates one slot per distinct key in [min, max]
+MAX_COUNTING_RANGE = 1_000_000
+
+
+# ==================== COMPARISON SORTS ====================
+
+def bubble_sort(a):
+    """Bubble sort with early exit once a pass makes no swaps"""
+    n = len(a)
+    for end in range(n - 1, 0, -1):
+        swapped = False
+        for i in range(end):
+            yield (COMPARE, i, i + 1)
+            if a[i] > a[i + 1]:
+                a[i], a[i + 1] = a[i + 1], a[i]
+                yield (SWAP, i, i + 1)
+                swapped = True
+        if not swapped:
+            break
+    return a
+
+
+def selection_sort(a):
+    """Selection sort"""
+    n = len(a)
+    for i in range(n - 1):
+        smallest = i
+        for j in range(i + 1, n):
+            yield (COMPARE, smallest, j)
+            if a[j] < a[smallest]:
+                smallest = j
+        if smallest != i:
+            a[i], a[smallest] = a[smallest], a[i]
+            yield (SWAP, i, smallest)
+    return a
+
+
+def insertion_sort(a, lo=0, hi=None):
+    """Insertion sort of a[lo:hi] by shifting larger elements right"""
+    hi = len(a) if hi is None else hi
+    for i in range(lo + 1, hi):
+        key = a[i]
+        j = i - 1
+        while j >= lo:
+            yield (COMPARE, j, j + 1)
+            if a[j] <= key:
+                break
+            a[j + 1] = a[j]
+            yield (WRITE, j + 1, a[j])
+            j -= 1
+        if j + 1 != i:
+            a[j + 1] = key
+            yield (WRITE, j + 1, key)
+    return a
+
+
+def merge_sort(a):
+    """Top-down merge sort using one shared auxiliary buffer"""
+    aux = list(a)
+
+    def sort(lo, hi):
+        if hi - lo < 2:
+            return
+        mid = (lo + hi) // 2
+        yield from sort(lo, mid)
+        yield from sort(mid, hi)
+        aux[lo:hi] = a[lo:hi]
+        i, j = lo, mid
+        for k in range(lo, hi):
+            if i < mid and j < hi:
+                yield (COMPARE, i, j)
+                take_left = aux[i] <= aux[j]
+            else:
+                take_left = i < mid
+            if take_left:
+                a[k] = aux[i]
+                i += 1
+            else:
+                a[k] = aux[j]
+                j += 1
+            yield (WRITE, k, a[k])
+
+    yield from sort(0, len(a))
+    return a
+
+
+def quick_sort(a):
+    """Quick sort with median-of-three pivots and an explicit range stack"""
+    ranges = [(0, len(a) - 1)]
+    while ranges:
+        lo, hi = ranges.pop()
+        if lo >= hi:
+            continue
+
+        # Median of three, moved to hi as the Lomuto pivot
+        mid = (lo + hi) // 2
+        for x, y in ((lo, mid), (lo, hi), (mid, hi)):
+            yield (COMPARE, x, y)
+            if a[y] < a[x]:
+                a[x], a[y] = a[y], a[x]
+                yield (SWAP, x, y)
+        a[mid], a[hi] = a[hi], a[mid]
+        yield (SWAP, mid, hi)
+
+        pivot = a[hi]
+        store = lo
+        for i in range(lo, hi):
+            yield (COMPARE, i, hi)
+            if a[i] < pivot:
+                if i != store:
+                    a[i], a[store] = a[store], a[i]
+                    yield (SWAP, i, store)
+                store += 1
+        if store != hi:
+            a[store], a[hi] = a[hi], a[store]
+            yield (SWAP, store, hi)
+
+        # Push the larger side first so the stack stays O(log n)
+        left, right = (lo, store - 1), (store + 1, hi)
+        if left[1] - left[0] > right[1] - right[0]:
+            ranges.extend((left, right))
+        else:
+            ranges.extend((right, left))
+    return a
+
+
+def heap_sort(a):
+    """Heap sort on an in-place max heap"""
+    n = len(a)
+
+    def sift_down(root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end:
+                yield (COMPARE, child, child + 1)
+                if a[child] < a[child + 1]:
+                    child += 1
+            yield (COMPARE, root, child)
+            if a[root] >= a[child]:
+                return
+            a[root], a[child] = a[child], a[root]
+            yield (SWAP, root, child)
+            root = child
+
+    for root in range(n // 2 - 1, -1, -1):
+        yield from sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        a[0], a[end] = a[end], a[0]
+        yield (SWAP, 0, end)
+        yield from sift_down(0, end)
+    return a
+
+
+def shell_sort(a):
+    """Shell sort with Knuth's 3h+1 gap sequence"""
+    n = len(a)
+    gap = 1
+    while gap < n // 3:
+        gap = 3 * gap + 1
+    while gap >= 1:
+        for i in range(gap, n):
+            key = a[i]
+            j = i
+            while j >= gap:
+                yield (COMPARE, j - gap, j)
+                if a[j - gap] <= key:
+                    break
+                a[j] = a[j - gap]
+                yield (WRITE, j, a[j])
+                j -= gap
+            if j != i:
+                a[j] = key
+                yield (WRITE, j, key)
+        gap //= 3
+    return a
+
+
+# ==================== NON-COMPARISON SORTS ====================
+
+def _require_integers(a, algorithm):
+    if any(not isinstance(x, int) for x in a):
+        raise ValueError(f'{algorithm} sort requires integer values')
+
+
+def counting_sort(a):
+    """Stable counting sort over the key range [min, max]"""
+    _require_integers(a, 'Counting')
+    if not a:
+        return a
+    low, high = min(a), max(a)
+    if high - low >= MAX_COUNTING_RANGE:
+        raise ValueError(f'Counting sort key range must be below {MAX_COUNTING_RANGE}')
+
+    counts = [0] * (high - low + 1)
+    for x in a:
+        counts[x - low] += 1
+    k = 0
+    for offset, count in enumerate(counts):
+        for _ in range(count):
+            a[k] = low + offset
+            yield (WRITE, k, a[k])
+            k += 1
+    return a
+
+
+def radix_sort(a):
+    """LSD radix sort (base 10); negatives are shifted by the minimum"""
+    _require_integers(a, 'Radix')
+    if not a:
+        return a
+    low = min(a)
+    shift = -low if low < 0 else 0
+    largest = max(a) + shift
+
+    exp = 1
+    while largest // exp > 0:
+        buckets = [[] for _ in range(10)]
+        for x in a:
+            buckets[((x + shift) // exp) % 10].append(x)
+        k = 0
+        for bucket in buckets:
+            for x in bucket:
+                a[k] = x
+                yield (WRITE, k, x)
+                k += 1
+        exp *= 10
+    return a
+
+
+def bucket_sort(a):
+    """Bucket sort into n buckets, then insertion sort each bucket in place"""
+    n = len(a)
+    if n < 2:
+        return a
+    low, high = min(a), max(a)
+    if low == high:
+        return a
+
+    buckets = [[] for _ in range(n)]
+    scale = (n - 1) / (high - low)
+    for x in a:
+        buckets[int((x - low) * scale)].append(x)
+
+    k = 0
+    for bucket in buckets:
+        start = k
+        for x in bucket:
+            a[k] = x
+            yield (WRITE, k, x)
+            k += 1
+        yield from insertion_sort(a, start, k)
+    return a
+
+
+SORTING_ALGORITHMS = {
+    'bubble': bubble_sort,
+    'selection': selection_sort,
+    'insertion': insertion_sort,
+    'merge': merge_sort,
+    'quick': quick_sort,
+    'heap': heap_sort,
+    'shell': shell_sort,
+    'counting': counting_sort,
+    'radix': radix_sort,
+    'bucket': bucket_sort
+}
+
+
+def sort_steps(algorithm, values):
+    """Return the step generator that sorts a copy of ``values``"""
+    return SORTING_ALGORITHMS[algorithm](list(values))
+
+
+def sort_report(algorithm, result, counts, elapsed_ms):
+    """Shape a finished sorting run for the API"""
+    return {
+        'algorithm': algorithm,
+        'sorted': result,
+        'comparisons': counts[COMPARE],
+        'swaps': counts[SWAP],
+        'writes': counts[WRITE],
+        'elapsed_ms': round(elapsed_ms, 3)
+    }
+
+
+def run_sort(algorithm, values, timeout_ms=None):
+    """Sort a copy of ``values`` and report the result with operation counters"""
+    result, counts, elapsed_ms = run_steps(sort_steps(algorithm, values), timeout_ms)
+    return sort_report(algorithm, result, counts, elapsed_ms)
@@ -0,0 +1,183 @@
+"""
+Step events and the execution driver shared by the algorithm engines
+
+Algorithms are written as generators that mutate their input and yield
+``(op, a, b)`` step tuples; the generator's return value is the result.
+"""
+
+import time
+
+# ==================== OPCODES ====================
+COMPARE = 1   # compare positions a and b
+SWAP = 2      # swap positions a and b
+WRITE = 3     # write value b into position a
+PROBE = 4     # inspect position a against the search target
+RANGE = 5     # the active search window is now [a, b]
+PLACE = 6     # place value b at slot a
+REMOVE = 7    # take value b back off slot a
+FOUND = 8     # solution number a is complete
+DISCOVER = 9  # vertex a is first reached from b (b == a for a DFS root)
+EDGE = 10     # edge a -> b leads to an already discovered vertex
+FINISH = 11   # vertex a is finished; b is its DFS parent (a for a root)
+
+OP_NAMES = {
+    COMPARE: 'compare',
+    SWAP: 'swap',
+    WRITE: 'write',
+    PROBE: 'probe',
+    RANGE: 'range',
+    PLACE: 'place',
+    REMOVE: 'remove',
+    FOUND: 'found',
+    DISCOVER: 'discover',
+    EDGE: 'edge',
+    FINISH: 'finish'
+}
+
+# How many steps to run between wall-clock checks
+DEADLINE_CHECK_INTERVAL = 4096
+
+
+class ExecutionTimeout(Exception):
+    """Raised when a run exceeds its wall-clock budget"""
+
+    def __init__(self, timeout_ms, steps, counts=None):
+        super().__init__(f'Execution exceeded {timeout_ms} ms after {steps} steps')
+        self.timeout_ms = timeout_ms
+        self.steps = steps
+        self.counts = counts
+
+    def __reduce__(self):
+        # Keep the structured fields when raised inside a worker process
+        return (type(self), (self.timeout_ms, self.steps, self.counts))
+
+
+class StepBudgetExceeded(Exception):
+    """Raised when a run emits more steps than its budget allows"""
+
+    def __init__(self, max_steps, counts=None):
+        super().__init__(f'Execution exceeded the budget of {max_steps} steps')
+        self.max_steps = max_steps
+        self.steps = max_steps
+        self.counts = counts
+
+    def __reduce__(self):
+        return (type(self), (self.max_steps, self.counts))
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a run's memory check reports it is over budget"""
+
+    def __init__(self, steps, counts=None):
+        super().__init__(f'Execution exceeded its memory budget after {steps} steps')
+        self.steps = steps
+        self.counts = counts
+
+    def __reduce__(self):
+        return (type(self), (self.steps, self.counts))
+
+
+class Deadline:
+    """Cooperative wall-clock budget for engines that do not emit steps"""
+
+    __slots__ = ('timeout_ms', 'deadline')
+
+    def __init__(self, timeout_ms=None):
+        self.timeout_ms = timeout_ms
+        self.deadline = time.perf_counter() + timeout_ms / 1000 if timeout_ms else None
+
+    def check(self, work):
+        """Raise ExecutionTimeout (reporting ``work`` units done) once past the deadline"""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise ExecutionTimeout(self.timeout_ms, work)
+
+
+def _named(counts):
+    return {op: counts[op] for op in OP_NAMES}
+
+
+def run_steps(steps, timeout_ms=None, trace=None, max_steps=None, memory_check=None):
+    """Drive a step generator to completion.
+
+    Returns ``(result, counts, elapsed_ms)`` where ``counts`` maps each
+    opcode to the number of times it was emitted. When ``trace`` is given,
+    every step is also passed to ``trace.record``. ``max_steps`` caps the
+    number of steps, and ``memory_check`` is polled alongside the deadline
+    and should return True once the run is over its memory budget. Budget
+    exceptions carry the counts reached so far.
+    """
+    record = trace.record if trace is not None else None
+    counts = [0] * (max(OP_NAMES) + 1)
+    started = time.perf_counter()
+    deadline = started + timeout_ms / 1000 if timeout_ms else None
+    total = 0
+
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        # Only a step beyond the budget fails the run; exactly max_steps is fine
+        if total == max_steps:
+            steps.close()
+            raise StepBudgetExceeded(max_steps, _named(counts))
+        counts[step[0]] += 1
+        total += 1
+        if record is not None:
+            record(step)
+        if total % DEADLINE_CHECK_INTERVAL == 0:
+            if deadline is not None and time.perf_counter() > deadline:
+                steps.close()
+                raise ExecutionTimeout(timeout_ms, total, _named(counts))
+            if memory_check is not None and memory_check():
+                steps.close()
+                raise MemoryBudgetExceeded(total, _named(counts))
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return result, _named(counts), elapsed_ms
+
+
+class StepStream:
+    """Drive a step generator in batches so steps can be sent as they happen.
+
+    Iterating yields lists of at most ``batch_size`` steps; afterwards
+    ``result``, ``counts`` and ``elapsed_ms`` hold what ``run_steps`` returns.
+    Only one batch is held in memory at a time.
+    """
+
+    def __init__(self, steps, batch_size=256, timeout_ms=None):
+        self.steps = steps
+        self.batch_size = batch_size
+        self.timeout_ms = timeout_ms
+        self.result = None
+        self.counts = None
+        self.elapsed_ms = None
+
+    def __iter__(self):
+        counts = [0] * (max(OP_NAMES) + 1)
+        started = time.perf_counter()
+        deadline = started + self.timeout_ms / 1000 if self.timeout_ms else None
+        total = 0
+        batch = []
+
+        while True:
+            try:
+                step = next(self.steps)
+            except StopIteration as stop:
+                self.result = stop.value
+                break
+            counts[step[0]] += 1
+            batch.append(step)
+            if len(batch) >= self.batch_size:
+                total += len(batch)
+                yield batch
+                batch = []
+                if deadline is not None and time.perf_counter() > deadline:
+                    self.steps.close()
+                    raise ExecutionTimeout(self.timeout_ms, total, _named(counts))
+
+        if batch:
+            yield batch
+        self.counts = _named(counts)
+        self.elapsed_ms = (time.perf_counter() - started) * 1000
@@ -0,0 +1,341 @@
+"""
+Persistent suffix array index
+
+An index is built once per text by prefix doubling (ranks of 2k-prefixes
+from ranks of k-prefixes, O(n log n) rounds of sorting) and Kasai's LCP
+pass, then written to a single file and memory-mapped for queries. The
+suffix array and LCP array are read straight out of the mapping, so
+opening an index costs no parsing and queries touch only the pages they
+binary-search through.
+
+File layout (integers little-endian)::
+
+    offset  size  field
+    0       4     magic b'APSA'
+    4       1     format version (1)
+    5       3     reserved (0)
+    8       8     text length n (uint64)
+    16      8     longest repeated substring: start offset (int64, -1 if none)
+    24      8     longest repeated substring: length (uint64)
+    32      n     text bytes, zero-padded to a multiple of 8
+    ...     4n    suffix array (int32)
+    ...     4n    LCP array (int32): lcp[r] = LCP(sa[r - 1], sa[r]), lcp[0] = 0
+
+Indexes are named by a content hash of the text, so building the same
+text twice reuses the file already on disk.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - exercised on installs without NumPy
+    np = None
+    HAVE_NUMPY = False
+
+MAGIC = b'APSA'
+VERSION = 1
+HEADER = struct.Struct('<4sB3xQqQ')
+SUFFIX = '.apsa'
+INDEX_ID = re.compile(r'^[0-9a-f]{24}$')
+
+# Below this length the pure-Python doubling beats NumPy's per-round overhead
+NUMPY_MIN_LENGTH = 4096
+
+DEADLINE_CHECK_MASK = 0xFFFF
+
+# Bytes of the longest repeated substring returned with its length
+REPEAT_PREVIEW_BYTES = 1024
+
+
+# ==================== CONSTRUCTION ====================
+
+def _doubling_python(text, deadline):
+    n = len(text)
+    base = max(n, 256) + 1
+    rank = list(text)
+    sa = list(range(n))
+    k = 1
+    while True:
+        keys = [rank[i] * base + (rank[i + k] + 1 if i + k < n else 0) for i in range(n)]
+        sa.sort(key=keys.__getitem__)
+        rank = [0] * n
+        r = 0
+        for j in range(1, n):
+            if keys[sa[j]] != keys[sa[j - 1]]:
+                r += 1
+            rank[sa[j]] = r
+            if not j & DEADLINE_CHECK_MASK:
+                deadline.check(k)
+        deadline.check(k)
+        if r == n - 1 or k >= n:
+            return array('i', sa)
+        k *= 2
+
+
+def _doubling_numpy(text, deadline):
+    n = len(text)
+    base = max(n, 256) + 1
+    rank = np.frombuffer(text, dtype=np.uint8).astype(np.int64)
+    k = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:] + 1
+        keys = rank * base + second
+        sa = np.argsort(keys, kind='stable')
+        ordered = keys[sa]
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(ordered[1:] != ordered[:-1])))
+        deadline.check(k)
+        if rank[sa[-1]] == n - 1 or k >= n:
+            column = array('i')
+            column.frombytes(sa.astype(np.int32).tobytes())
+            return column
+        k *= 2
+
+
+def suffix_array(text, deadline):
+    """Suffix array of a bytes text by prefix doubling"""
+    if not text:
+        return array('i')
+    if HAVE_NUMPY and len(text) >= NUMPY_MIN_LENGTH:
+        return _doubling_numpy(text, deadline)
+    return _doubling_python(text, deadline)
+
+
+def lcp_array(text, sa, deadline):
+    """Kasai's algorithm: lcp[r] = LCP(sa[r - 1], sa[r]) in O(n)"""
+    n = len(text)
+    rank = array('i', bytes(4 * n))
+    for r, start in enumerate(sa):
+        rank[start] = r
+    lcp = array('i', bytes(4 * n))
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r:
+            j = sa[r - 1]
+            while i + h < n and j + h < n and text[i + h] == text[j + h]:
+                h += 1
+            lcp[r] = h
+            if h:
+                h -= 1
+        else:
+            h = 0
+        if not i & DEADLINE_CHECK_MASK:
+            deadline.check(i)
+    return lcp
+
+
+def index_id(text):
+    return hashlib.sha256(text).hexdigest()[:24]
+
+
+def write_index(path, text, sa, lcp):
+    """Write the index file atomically (temp file + rename)"""
+    n = len(text)
+    best = max(range(n), key=lcp.__getitem__) if n else 0
+    lrs_start, lrs_length = (sa[best], lcp[best]) if n and lcp[best] else (-1, 0)
+    columns = [sa, lcp]
+    if sys.byteorder != 'little':
+        columns = [array('i', c) for c in columns]
+        for column in columns:
+            column.byteswap()
+    directory = os.path.dirname(path)
+    fd, temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, n, lrs_start, lrs_length))
+            f.write(text)
+            f.write(bytes(-n % 8))
+            for column in columns:
+                column.tofile(f)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.unlink(temp)
+        raise
+
+
+# ==================== QUERIES ====================
+
+class SuffixIndex:
+    """A memory-mapped index file"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, lrs_start, lrs_length = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f'{path} is not a version {VERSION} suffix index')
+        self.path = path
+        self.length = n
+        self.lrs = (lrs_start, lrs_length)
+        self.text_offset = HEADER.size
+        start = self.text_offset + n + (-n % 8)
+        self.sa = self._column(start, n)
+        self.lcp = self._column(start + 4 * n, n)
+
+    def _column(self, start, n):
+        view = memoryview(self.map)[start:start + 4 * n]
+        if sys.byteorder == 'little':
+            return view.cast('i')
+        column = array('i', view.tobytes())
+        column.byteswap()
+        return column
+
+    def close(self):
+        if isinstance(self.sa, memoryview):
+            self.sa.release()
+            self.lcp.release()
+        self.map.close()
+
+    def _suffix(self, r, m):
+        start = self.text_offset + self.sa[r]
+        return self.map[start:min(start + m, self.text_offset + self.length)]
+
+    def _range(self, pattern):
+        """[lo, hi) of suffix-array ranks whose suffixes start with pattern"""
+        m = len(pattern)
+        lo, hi = 0, self.length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._suffix(mid, m) < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        first, hi = lo, self.length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._suffix(mid, m) == pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def count(self, pattern):
+        lo, hi = self._range(pattern)
+        return hi - lo
+
+    def find(self, pattern, limit):
+        """Occurrence count and up to ``limit`` of the start offsets, sorted"""
+        lo, hi = self._range(pattern)
+        return hi - lo, sorted(self.sa[lo:min(hi, lo + limit)])
+
+    def longest_repeated(self, max_bytes):
+        start, length = self.lrs
+        if start < 0:
+            return {'length': 0, 'offset': None, 'text': ''}
+        begin = self.text_offset + start
+        text = self.map[begin:begin + min(length, max_bytes)]
+        return {'length': length, 'offset': start, 'text': text.decode('utf-8', 'replace'),
+                'truncated': length > max_bytes}
+
+    def describe(self, handle):
+        return {
+            'index': handle,
+            'length': self.length,
+            'file_bytes': os.path.getsize(self.path),
+            'longest_repeated_length': self.lrs[1]
+        }
+
+
+def run_queries(index, queries, limit, deadline):
+    """Answer [{'type': 'find'|'count'|'longest_repeated', 'pattern': str}, ...]"""
+    results = []
+    for position, query in enumerate(queries):
+        if not isinstance(query, dict):
+            raise ValueError(f'Query {position} must be an object')
+        kind = query.get('type', 'find')
+        if kind == 'longest_repeated':
+            results.append(index.longest_repeated(REPEAT_PREVIEW_BYTES))
+            continue
+        if kind not in ('find', 'count'):
+            raise ValueError(f"Query {position}: unknown type {kind!r}")
+        pattern = query.get('pattern')
+        if not isinstance(pattern, str) or not pattern:
+            raise ValueError(f"Query {position}: 'pattern' must be a non-empty string")
+        needle = pattern.encode('utf-8')
+        if kind == 'count':
+            results.append({'count': index.count(needle)})
+        else:
+            count, offsets = index.find(needle, limit)
+            results.append({'count': count, 'offsets': offsets, 'truncated': count > len(offsets)})
+        deadline.check(position)
+    return results
+
+
+# ==================== STORE ====================
+
+class SuffixIndexStore:
+    """Index files in one directory, with an LRU of open mappings"""
+
+    def __init__(self, directory, max_open=32):
+        self.directory = directory
+        self.max_open = max_open
+        self.open = OrderedDict()
+        self.lock = threading.Lock()
+
+    def path(self, handle):
+        return os.path.join(self.directory, handle + SUFFIX)
+
+    def build(self, text, deadline):
+        """Build (or reuse) the index for text; returns ``(handle, index, stats)``"""
+        handle = index_id(text)
+        stats = {'reused': True}
+        if not os.path.exists(self.path(handle)):
+            os.makedirs(self.directory, exist_ok=True)
+            started = time.perf_counter()
+            sa = suffix_array(text, deadline)
+            sorted_ms = (time.perf_counter() - started) * 1000
+            lcp = lcp_array(text, sa, deadline)
+            write_index(self.path(handle), text, sa, lcp)
+            stats = {
+                'reused': False,
+                'suffix_array_ms': round(sorted_ms, 3),
+                'build_ms': round((time.perf_counter() - started) * 1000, 3),
+                'backend': 'numpy' if HAVE_NUMPY and len(text) >= NUMPY_MIN_LENGTH else 'python'
+            }
+        return handle, self.get(handle), stats
+
+    def get(self, handle):
+        """Open index by handle, or None if there is no such file"""
+        if not INDEX_ID.match(handle):
+            return None
+        with self.lock:
+            index = self.open.get(handle)
+            if index is not None:
+                self.open.move_to_end(handle)
+                return index
+            if not os.path.exists(self.path(handle)):
+                return None
+            index = SuffixIndex(self.path(handle))
+            self.open[handle] = index
+            # Evicted mappings are left to the garbage collector: a request
+            # on another thread may still be reading from one
+            while len(self.open) > self.max_open:
+                self.open.popitem(last=False)
+            return index
+
+    def delete(self, handle):
+        if not INDEX_ID.match(handle):
+            return False
+        with self.lock:
+            self.open.pop(handle, None)
+            try:
+                os.unlink(self.path(handle))
+            except FileNotFoundError:
+                return False
+            return True
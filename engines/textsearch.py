@@ -0,0 +1,324 @@
+"""
+Single-pattern matching over memory-mapped text
+
+naive_match, kmp, boyer_moore and z_algorithm run on any buffer that
+supports ``len`` and integer indexing / slicing over bytes, which
+includes ``mmap.mmap``. None of them copies the whole text: KMP and
+naive matching walk it in fixed-size windows, Boyer-Moore and the Z
+algorithm index it directly, and only pattern-sized tables are kept, so
+memory stays constant however large the corpus is.
+
+Each matcher is a generator of match start offsets (byte offsets);
+``scan_batches`` groups them for incremental responses. The matchers are
+pure Python and scan a few MB/s, so texts above PYTHON_SCAN_MAX_BYTES are
+searched with the buffer's own ``find`` instead, which runs in C at
+memory speed whichever algorithm was asked for.
+"""
+
+import mmap
+import os
+import tempfile
+from array import array
+
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+# Bytes copied out of the mapping per window
+WINDOW_BYTES = 1 << 20
+
+# Positions scanned between wall-clock checks
+DEADLINE_CHECK_MASK = 0xFFFF
+
+SPOOL_CHUNK_BYTES = 1 << 20
+
+# Largest text the pure-Python matchers scan within LARGE_TEXT_TIMEOUT
+PYTHON_SCAN_MAX_BYTES = 64 << 20
+
+
+# ==================== MATCHERS ====================
+
+def naive_match(text, pattern, deadline):
+    """Compare the pattern at every alignment, window by window"""
+    n, m = len(text), len(pattern)
+    first = pattern[0]
+    for start in range(0, n - m + 1, WINDOW_BYTES):
+        window = text[start:start + WINDOW_BYTES + m - 1]
+        for i in range(len(window) - m + 1):
+            if window[i] == first and window[i:i + m] == pattern:
+                yield start + i
+        deadline.check(start)
+
+
+def failure_table(pattern):
+    """KMP prefix function: longest proper border of each pattern prefix"""
+    fail = array('i', bytes(4 * len(pattern)))
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = fail[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        fail[i] = k
+    return fail
+
+
+def kmp(text, pattern, deadline):
+    """Knuth-Morris-Pratt, carrying the automaton state across windows"""
+    m = len(pattern)
+    fail = failure_table(pattern)
+    q = 0
+    for start in range(0, len(text), WINDOW_BYTES):
+        for i, c in enumerate(text[start:start + WINDOW_BYTES]):
+            while q and pattern[q] != c:
+                q = fail[q - 1]
+            if pattern[q] == c:
+                q += 1
+                if q == m:
+                    yield start + i - m + 1
+                    q = fail[q - 1]
+        deadline.check(start)
+
+
+def good_suffix_shifts(pattern):
+    """Strong good-suffix shift for each mismatch position (index m = full match)"""
+    m = len(pattern)
+    shift = array('i', bytes(4 * (m + 1)))
+    border = array('i', bytes(4 * (m + 1)))
+    i, j = m, m + 1
+    border[i] = j
+    while i > 0:
+        while j <= m and pattern[i - 1] != pattern[j - 1]:
+            if not shift[j]:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
+        border[i] = j
+    j = border[0]
+    for i in range(m + 1):
+        if not shift[i]:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+    return shift
+
+
+def boyer_moore(text, pattern, deadline):
+    """Boyer-Moore with bad-character and good-suffix rules, indexing the buffer directly"""
+    n, m = len(text), len(pattern)
+    last = array('i', [-1]) * 256
+    for i, c in enumerate(pattern):
+        last[c] = i
+    shift = good_suffix_shifts(pattern)
+    s = checked = 0
+    while s <= n - m:
+        j = m - 1
+        while j >= 0 and pattern[j] == text[s + j]:
+            j -= 1
+        if j < 0:
+            yield s
+            s += shift[0]
+        else:
+            s += max(shift[j + 1], j - last[text[s + j]])
+        if s - checked > DEADLINE_CHECK_MASK:
+            deadline.check(s)
+            checked = s
+
+
+def z_array(pattern):
+    """Z-function of the pattern (z[0] = len(pattern))"""
+    m = len(pattern)
+    z = array('i', bytes(4 * m))
+    z[0] = m
+    left = right = 0
+    for i in range(1, m):
+        k = min(z[i - left], right - i) if i < right else 0
+        while i + k < m and pattern[k] == pattern[i + k]:
+            k += 1
+        z[i] = k
+        if i + k > right:
+            left, right = i, i + k
+    return z
+
+
+def z_algorithm(text, pattern, deadline):
+    """Z matching without materialising pattern + separator + text.
+
+    Only the pattern's Z-array and the current Z-box over the text are
+    kept: inside the box ``text[left:right] == pattern[:right - left]``,
+    so the pattern's own Z-values bound each text position.
+    """
+    n, m = len(text), len(pattern)
+    zp = z_array(pattern)
+    left = right = 0
+    for i in range(n - m + 1):
+        if not i & DEADLINE_CHECK_MASK:
+            deadline.check(i)
+        if i < right:
+            k = zp[i - left]
+            if k < right - i:
+                continue
+            k = right - i
+        else:
+            k = 0
+        while k < m and text[i + k] == pattern[k]:
+            k += 1
+        left, right = i, i + k
+        if k == m:
+            yield i
+
+
+def find_all(text, pattern, deadline):
+    """Every occurrence, overlapping ones included, by the buffer's find (a C-level search)"""
+    n, m = len(text), len(pattern)
+    for start in range(0, n - m + 1, WINDOW_BYTES):
+        # Only matches starting inside this window fit before ``end``
+        end = min(start + WINDOW_BYTES + m - 1, n)
+        i = text.find(pattern, start, end)
+        while i >= 0:
+            yield i
+            i = text.find(pattern, i + 1, end)
+        deadline.check(start)
+
+
+LARGE_TEXT_ALGORITHMS = {
+    'naive_match': naive_match,
+    'kmp': kmp,
+    'boyer_moore': boyer_moore,
+    'z_algorithm': z_algorithm
+}
+
+
+def choose_matcher(algorithm, size):
+    """The matcher for a text of ``size`` bytes, and the backend name reported for it"""
+    if size > PYTHON_SCAN_MAX_BYTES:
+        return find_all, 'find'
+    return LARGE_TEXT_ALGORITHMS[algorithm], 'python'
+
+
+def scan_batches(algorithm, text, pattern, deadline, batch_size=1000, limit=None):
+    """Yield lists of match offsets as they are found, at most ``limit`` in total"""
+    if not pattern:
+        raise ValueError("'pattern' must not be empty")
+    if len(pattern) > len(text):
+        return
+    batch = []
+    found = 0
+    matcher, _ = choose_matcher(algorithm, len(text))
+    for offset in matcher(text, pattern, deadline):
+        batch.append(offset)
+        found += 1
+        if len(batch) >= batch_size or found == limit:
+            yield batch
+            batch = []
+            if found == limit:
+                return
+    if batch:
+        yield batch
+
+
+# ==================== TEXT SOURCES ====================
+
+class MappedText:
+    """Read-only mapping of a file, usable as a context manager.
+
+    Empty files cannot be mapped, so they are served as ``b''``.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        size = os.fstat(file.fileno()).st_size
+        self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.size = size
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def spool_stream(stream, max_bytes=None):
+    """Copy a readable stream to an anonymous temp file in fixed-size chunks and map it"""
+    spool = tempfile.TemporaryFile()
+    total = 0
+    try:
+        for chunk in iter(lambda: stream.read(SPOOL_CHUNK_BYTES), b''):
+            total += len(chunk)
+            if max_bytes is not None and total > max_bytes:
+                raise ValueError(f'Upload exceeds {max_bytes} bytes')
+            spool.write(chunk)
+        spool.flush()
+        return MappedText(spool)
+    except BaseException:
+        spool.close()
+        raise
+
+
+def spool_multipart(stream, boundary, max_field_bytes, max_bytes=None):
+    """Spool the 'file' part of a multipart body to disk and map it; returns (text, fields).
+
+    The other parts are kept in memory as strings, at most ``max_field_bytes``
+    of them in total, so only the file can be large.
+    """
+    decoder = MultipartDecoder(boundary)
+    spool = tempfile.TemporaryFile()
+    fields = {}
+    part, buffered, field_bytes, total = None, None, 0, 0
+    seen_file = False
+    try:
+        for chunk in _with_end(iter(lambda: stream.read(SPOOL_CHUNK_BYTES), b'')):
+            if chunk is not None:
+                total += len(chunk)
+                if max_bytes is not None and total > max_bytes:
+                    raise ValueError(f'Upload exceeds {max_bytes} bytes')
+            decoder.receive_data(chunk)
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, File) and event.name == 'file' and not seen_file:
+                    part, buffered, seen_file = event, None, True
+                elif isinstance(event, (Field, File)):
+                    part, buffered = event, []
+                elif isinstance(event, Data):
+                    if buffered is None:
+                        spool.write(event.data)
+                    else:
+                        field_bytes += len(event.data)
+                        if field_bytes > max_field_bytes:
+                            raise ValueError(f'Form fields exceed {max_field_bytes} bytes')
+                        buffered.append(event.data)
+                        if not event.more_data:
+                            fields[part.name] = b''.join(buffered).decode('utf-8', 'replace')
+                event = decoder.next_event()
+        if not seen_file:
+            raise ValueError("Multipart uploads need a 'file' part")
+        spool.flush()
+        return MappedText(spool), fields
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _with_end(chunks):
+    """The chunks followed by None, which tells the decoder the body is complete"""
+    yield from chunks
+    yield None
+
+
+def corpus_file(corpus_dir, name):
+    """Open a corpus file by relative name, refusing paths that leave corpus_dir"""
+    if not corpus_dir:
+        raise PermissionError('Server-side corpora are not enabled (CORPUS_DIR is unset)')
+    if not isinstance(name, str) or not name:
+        raise ValueError("'corpus' must be a relative file name")
+    root = os.path.realpath(corpus_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        raise PermissionError(f'Corpus {name} is outside CORPUS_DIR')
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f'Corpus {name} not found')
+    return MappedText(open(path, 'rb'))
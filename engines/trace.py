@@ -0,0 +1,147 @@
+"""
+Compact binary step traces for visualization replays
+
+A trace is stored column-wise so that each step costs one opcode byte plus
+two fixed-width indices, and the whole body can optionally be deflated.
+
+Wire format (all integers little-endian)::
+
+    offset  size  field
+    0       4     magic b'APTR'
+    4       1     format version (1)
+    5       1     index width in bytes: 2 (uint16) or 4 (uint32)
+    6       1     value type: b'q' (int64) or b'd' (float64)
+    7       1     flags: bit 0 set when the body is zlib-compressed
+    8       4     step count N (uint32)
+    12      4     value count V (uint32)
+    16      ...   body
+
+    body (after inflating when flag bit 0 is set):
+        ops     N x uint8          opcode per step (see engines.steps)
+        a       N x index width    first operand per step
+        b       N x index width    second operand per step (0 for writes)
+        values  V x 8 bytes        operand values of WRITE steps, in order
+
+To replay, walk the columns together and take the next entry of ``values``
+whenever the opcode is WRITE. ``decode_trace`` is the reference decoder.
+"""
+
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from engines.steps import OP_NAMES, WRITE
+
+MAGIC = b'APTR'
+VERSION = 1
+FLAG_ZLIB = 0x01
+HEADER = struct.Struct('<4sBBcBII')
+
+_INDEX_TYPECODES = {2: 'H', 4: 'I'}
+
+
+class TraceTooLarge(Exception):
+    """Raised when a run emits more steps than the recorder accepts"""
+
+    def __init__(self, max_steps):
+        super().__init__(f'Trace exceeds {max_steps} steps')
+        self.max_steps = max_steps
+
+
+class TraceRecorder:
+    """Collects step tuples into typed columns as they are emitted"""
+
+    def __init__(self, max_steps=None):
+        self.max_steps = max_steps
+        self.ops = array('B')
+        self.a = array('I')
+        self.b = array('I')
+        self.values = []
+
+    def __len__(self):
+        return len(self.ops)
+
+    def record(self, step):
+        op, a, b = step
+        if self.max_steps is not None and len(self.ops) >= self.max_steps:
+            raise TraceTooLarge(self.max_steps)
+        self.ops.append(op)
+        self.a.append(a)
+        if op == WRITE:
+            self.values.append(b)
+            self.b.append(0)
+        else:
+            self.b.append(b)
+
+    def to_json(self):
+        """Expand the trace into the list-of-dicts form used by the JSON fallback"""
+        values = iter(self.values)
+        steps = []
+        for op, a, b in zip(self.ops, self.a, self.b):
+            if op == WRITE:
+                steps.append({'op': OP_NAMES[op], 'a': a, 'value': next(values)})
+            else:
+                steps.append({'op': OP_NAMES[op], 'a': a, 'b': b})
+        return steps
+
+
+def encode_trace(trace, compress=True):
+    """Pack a TraceRecorder into the binary format.
+
+    Returns ``(payload, encode_ms)``.
+    """
+    started = time.perf_counter()
+    largest = max(max(trace.a, default=0), max(trace.b, default=0))
+    width = 2 if largest <= 0xFFFF else 4
+    integral = all(isinstance(v, int) and -2 ** 63 <= v < 2 ** 63 for v in trace.values)
+    value_type = b'q' if integral else b'd'
+
+    a_col = array(_INDEX_TYPECODES[width], trace.a)
+    b_col = array(_INDEX_TYPECODES[width], trace.b)
+    values = array(value_type.decode(), trace.values)
+    if sys.byteorder != 'little':
+        for column in (a_col, b_col, values):
+            column.byteswap()
+
+    body = b''.join((trace.ops.tobytes(), a_col.tobytes(), b_col.tobytes(), values.tobytes()))
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+    header = HEADER.pack(MAGIC, VERSION, width, value_type, flags, len(trace.ops), len(values))
+    return header + body, (time.perf_counter() - started) * 1000
+
+
+def decode_trace(payload):
+    """Reference decoder: turn an encoded trace back into ``(op, a, b)`` tuples.
+
+    WRITE steps carry their value as ``b``, exactly as the algorithm emitted them.
+    """
+    magic, version, width, value_type, flags, count, value_count = HEADER.unpack_from(payload)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not an Algorithm Playground trace')
+    body = payload[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    ops = array('B', body[:count])
+    offset = count
+    columns = []
+    for _ in range(2):
+        column = array(_INDEX_TYPECODES[width])
+        column.frombytes(body[offset:offset + count * width])
+        columns.append(column)
+        offset += count * width
+    values = array(value_type.decode())
+    values.frombytes(body[offset:offset + value_count * 8])
+    if sys.byteorder != 'little':
+        for column in columns + [values]:
+            column.byteswap()
+
+    steps = []
+    next_value = iter(values)
+    for op, a, b in zip(ops, *columns):
+        steps.append((op, a, next(next_value) if op == WRITE else b))
+    return steps
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.steps import Deadline  # noqa: E402
+
+
+@pytest.fixture
+def expired():
+    """A Deadline that is already past"""
+    deadline = Deadline(1)
+    deadline.deadline -= 1
+    return deadline
+
+
+@pytest.fixture
+def client():
+    """Flask test client for the app"""
+    from app import app
+    app.config['TESTING'] = True
+    return app.test_client()
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from engines.allpairs import HAVE_NUMPY, floyd_warshall
+from engines.steps import Deadline, ExecutionTimeout
+
+
+def test_floyd_warshall_backends_agree():
+    rng = random.Random(10)
+    edges = [[rng.randrange(30), rng.randrange(30), rng.randrange(-2, 30)] for _ in range(120)]
+    results = [floyd_warshall(30, edges, Deadline(), backend='python')]
+    if HAVE_NUMPY:
+        results.append(floyd_warshall(30, edges, Deadline(), backend='numpy'))
+    for result in results:
+        assert result['negative_cycle'] == results[0]['negative_cycle']
+        assert result['distances'] == results[0]['distances']
+
+
+def test_floyd_warshall_validates_backend_and_python_cap():
+    with pytest.raises(ValueError):
+        floyd_warshall(3, [], Deadline(), backend='fortran')
+    with pytest.raises(ValueError):
+        floyd_warshall(400, [], Deadline(), backend='python', max_python_vertices=300)
+    with pytest.raises(ValueError):
+        floyd_warshall(3, [], Deadline(), dtype='int8')
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_floyd_warshall_timeout(backend, expired):
+    if backend == 'numpy' and not HAVE_NUMPY:
+        pytest.skip('NumPy is not installed')
+    with pytest.raises(ExecutionTimeout):
+        floyd_warshall(50, [[0, 1, 1]], expired, backend=backend)
+
+
+def test_floyd_warshall_route(client):
+    graph = {'vertices': 3, 'edges': [[0, 1, 2], [1, 2, 3]]}
+    response = client.post('/api/run/pathfinding/floyd_warshall', json=dict(graph, backend='python'))
+    assert response.json['distances'][0][2] == 5
+    assert client.post('/api/run/pathfinding/floyd_warshall',
+                       json=dict(graph, backend='gpu')).status_code == 400
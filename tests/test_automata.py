@@ -0,0 +1,41 @@
+import json
+import random
+
+import pytest
+
+from engines.automata import AhoCorasick, AutomatonCache, AutomatonScanner, AutomatonTooLarge
+
+
+def test_automaton_matches_naive_search():
+    rng = random.Random(11)
+    patterns = list({''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))) for _ in range(30)})
+    text = ''.join(rng.choice('abcd') for _ in range(2000)).encode()
+    found = AutomatonScanner(AhoCorasick(patterns)).feed(text)
+    expected = sorted((i, k) for k, p in enumerate(patterns) for i in range(len(text))
+                      if text.startswith(p.encode(), i))
+    assert sorted(found) == expected
+
+
+def test_scanner_carries_state_across_chunks():
+    scanner = AutomatonScanner(AhoCorasick(['abc', 'bc'], case_sensitive=False))
+    found = scanner.feed(b'xA') + scanner.feed(b'Bc')
+    assert sorted(found) == [(1, 0), (2, 1)]
+
+
+def test_oversized_automaton_is_refused_before_building():
+    with pytest.raises(AutomatonTooLarge):
+        AhoCorasick(['abcdefgh' * 50], max_table_bytes=1024)
+    cache = AutomatonCache(1024)
+    with pytest.raises(AutomatonTooLarge):
+        cache.compile(['abcdefgh' * 50])
+    assert cache.stats()['automata'] == 0
+
+
+def test_compile_and_search_routes(client):
+    compiled = client.post('/api/string/aho_corasick/automata', json={'patterns': ['he', 'she', 'hers']})
+    assert compiled.status_code in (200, 201)
+    handle = compiled.json['handle']
+    response = client.post(f'/api/string/aho_corasick/automata/{handle}/search', data=b'ushers')
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    assert sorted(map(tuple, lines[0]['matches'])) == [(1, 1), (2, 0), (2, 2)]
+    assert lines[-1]['done'] and lines[-1]['matches'] == 3
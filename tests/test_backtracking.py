@@ -0,0 +1,25 @@
+import pytest
+
+from engines.backtracking import backtracking_steps
+from engines.steps import run_steps
+
+
+def grid_with(value):
+    grid = [[0] * 9 for _ in range(9)]
+    grid[4][4] = value
+    return grid
+
+
+@pytest.mark.parametrize('value', [5.0, 5.5, True, -1, 10, '5', None])
+def test_sudoku_rejects_non_digit_cells(value):
+    with pytest.raises(ValueError):
+        backtracking_steps('sudoku', {'grid': grid_with(value)})
+
+
+def test_sudoku_solves_an_empty_grid():
+    result, _, _ = run_steps(backtracking_steps('sudoku', {'grid': grid_with(5)}))
+    assert result
+
+
+def test_sudoku_route_rejects_float_cells(client):
+    assert client.post('/api/run/backtracking/sudoku', json={'grid': grid_with(5.0)}).status_code == 400
@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.parametrize('body', [
+    {'algorithms': []},
+    {'algorithms': [['quick']]},
+    {'algorithms': [{'name': 'quick'}]},
+    {'algorithms': ['no_such_sort']},
+    {'algorithms': 'quick'},
+    {'algorithms': ['quick'], 'distributions': []},
+    {'algorithms': ['quick'], 'distributions': [['random']]},
+])
+def test_benchmark_rejects_bad_lists(client, body):
+    response = client.post('/api/benchmark', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_benchmark_route(client):
+    response = client.post('/api/benchmark', json={
+        'algorithms': ['insertion'], 'sizes': [8, 16], 'distributions': ['random'], 'repeats': 1
+    })
+    assert response.status_code == 200
+    assert list(response.get_json()['results']) == ['insertion']
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from engines.bignum import (check_bignum_request, decimal_digits, fibonacci, format_result, parse_big_int,
+                            sliding_window_pow)
+from engines.steps import Deadline, ExecutionTimeout
+
+LIMITS = (10 ** 6, 1 << 24, 100000, 2 ** 40)
+
+
+def test_fibonacci_matches_iteration():
+    a, b = 0, 1
+    for n in range(300):
+        assert fibonacci(n) == a
+        assert fibonacci(n, 1000007) == a % 1000007
+        a, b = b, a + b
+
+
+def test_sliding_window_pow_matches_pow():
+    rng = random.Random(6)
+    for window in (None, 1, 4, 8):
+        for _ in range(20):
+            base, exponent, modulus = rng.randrange(10 ** 30), rng.randrange(10 ** 40), rng.randrange(2, 10 ** 30)
+            assert sliding_window_pow(base, exponent, modulus, Deadline(), window)[0] == pow(base, exponent, modulus)
+    assert sliding_window_pow(3, -5, 7, Deadline())[0] == pow(3, -5, 7)
+
+
+def test_sliding_window_pow_timeout(expired):
+    with pytest.raises(ExecutionTimeout):
+        sliding_window_pow(3, 2 ** 4096 - 1, 2 ** 4096 + 1, expired)
+
+
+def test_formats_without_full_conversion():
+    x = 7 ** 5000
+    text = str(x)
+    assert decimal_digits(x)[0] == len(text)
+    ends = format_result(x, 'head_tail', 10)
+    assert (ends['head'], ends['tail'], ends['digits']) == (text[:10], text[-10:], len(text))
+    assert format_result(-x, 'hex')['hex'] == hex(-x)
+    with pytest.raises(ValueError):
+        format_result(x, 'decimal', max_decimal_digits=100)
+
+
+def test_long_decimal_strings_parse():
+    text = '9' * 6000  # beyond int_max_str_digits
+    assert parse_big_int(text, 'n', 10000) == 10 ** 6000 - 1
+    assert parse_big_int('0x1f', 'n', 10) == 31
+    for bad in (True, 1.5, '', '12a', '1' * 11):
+        with pytest.raises(ValueError):
+            parse_big_int(bad, 'n', 10)
+
+
+def test_modpow_cost_bound():
+    ok = {'base': 3, 'exponent': 2 ** 1000, 'modulus': 2 ** 1000 + 7}
+    check_bignum_request('modular_exponentiation', ok, LIMITS)
+    with pytest.raises(ValueError):
+        check_bignum_request('modular_exponentiation', dict(ok, exponent=2 ** 100000, modulus=2 ** 100000 + 1),
+                             LIMITS)
+    with pytest.raises(ValueError):
+        check_bignum_request('fibonacci_matrix', {'n': 10 ** 6, 'mod': 2 ** 200000}, LIMITS)
+
+
+def test_modular_exponentiation_route(client):
+    response = client.post('/api/run/math/modular_exponentiation',
+                           json={'base': 3, 'exponent': 1000, 'modulus': '1000000007', 'format': 'hex'})
+    assert response.status_code == 200
+    assert response.json['hex'] == hex(pow(3, 1000, 1000000007))
+    too_costly = {'base': 3, 'exponent': '0x' + 'f' * 30000, 'modulus': '0x' + 'f' * 30000}
+    assert client.post('/api/run/math/modular_exponentiation', json=too_costly).status_code == 400
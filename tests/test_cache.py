@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.mark.parametrize('path', [
+    '/api/run/math/prime_sieve',
+    '/api/run/math/fibonacci_matrix',
+    '/api/run/dp/lcs',
+    '/api/run/pathfinding/floyd_warshall',
+    '/api/trace/sorting/bubble_sort',
+    '/api/benchmark',
+    '/api/compare',
+])
+@pytest.mark.parametrize('body', [[1], 'text', 7])
+def test_non_object_body_is_rejected(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'The request body must be a JSON object'}
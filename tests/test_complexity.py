@@ -0,0 +1,35 @@
+import math
+
+import pytest
+
+from engines.complexity import check_catalog, fit_models, parse_big_o, sweep_sizes
+
+
+@pytest.mark.parametrize('text, model', [('O(n log n)', 'n log n'), ('O(n²)', 'n^2'), ('O(log₃ n)', 'log n'),
+                                         ('O(√n)', 'sqrt n'), ('O(n+k)', 'n'), ('O(V+E)', None), (None, None)])
+def test_parse_big_o(text, model):
+    assert parse_big_o(text) == model
+
+
+@pytest.mark.parametrize('model, cost', [('n', lambda n: 3 * n), ('n^2', lambda n: n * n / 2),
+                                         ('n log n', lambda n: n * math.log2(n))])
+def test_fit_models_picks_the_generating_model(model, cost):
+    sizes = [64, 128, 256, 512, 1024]
+    assert fit_models(sizes, [cost(n) for n in sizes])[0] == model
+
+
+def test_check_catalog_validates_before_measuring():
+    with pytest.raises(ValueError, match='Unknown category'):
+        check_catalog({}, ['graphs'])
+    with pytest.raises(ValueError, match='max_n'):
+        check_catalog({}, ['sorting'], max_n=10)
+    with pytest.raises(ValueError, match='repeats'):
+        check_catalog({}, ['sorting'], repeats=0)
+    assert sweep_sizes(64, 256) == [64, 128, 256]
+
+
+@pytest.mark.parametrize('args', [['--repeats', '0'], ['--category', 'graphs'], ['--max-n', '10']])
+def test_cli_reports_bad_options(args):
+    from app import app
+    result = app.test_cli_runner().invoke(args=['check-complexity', *args])
+    assert result.exit_code == 2 and 'Error' in result.output
@@ -0,0 +1,148 @@
+import itertools
+import random
+
+import pytest
+
+from engines.dp import DP_ALGORITHMS, HAVE_NUMPY, run_dp
+from engines.steps import Deadline
+
+
+def lcs_table(a, b):
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        row = [0]
+        for j, y in enumerate(b):
+            row.append(prev[j] + 1 if x == y else max(prev[j + 1], row[j]))
+        prev = row
+    return prev[-1]
+
+
+def edit_table(a, b):
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        row = [i]
+        for j, y in enumerate(b, 1):
+            row.append(min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = row
+    return prev[-1]
+
+
+def is_subsequence(s, text):
+    it = iter(text)
+    return all(c in it for c in s)
+
+
+def fewest_coins(coins, amount):
+    best = [0] + [None] * amount
+    for x in range(1, amount + 1):
+        options = [best[x - c] for c in coins if c <= x and best[x - c] is not None]
+        best[x] = min(options) + 1 if options else None
+    return best
+
+
+def pairs(seed, count=40):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 70))),
+               ''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 70))))
+
+
+def apply_script(a, b, script):
+    """Replay an edit script (M/S/I/D) on a, reading inserted and substituted characters from b"""
+    out, i, j = [], 0, 0
+    for op in script:
+        if op in 'MS':
+            assert op == 'S' or a[i] == b[j]
+            out.append(b[j])
+            i, j = i + 1, j + 1
+        elif op == 'I':
+            out.append(b[j])
+            j += 1
+        else:
+            i += 1
+    assert i == len(a)
+    return ''.join(out)
+
+
+@pytest.mark.parametrize('mode', ['rolling', 'hirschberg'])
+def test_lcs_modes_match_full_table(mode):
+    for a, b in pairs(1):
+        result = run_dp('lcs', {'a': a, 'b': b}, mode, Deadline())
+        assert result['length'] == lcs_table(a, b)
+        if mode == 'hirschberg':
+            assert len(result['subsequence']) == result['length']
+            assert is_subsequence(result['subsequence'], a) and is_subsequence(result['subsequence'], b)
+
+
+@pytest.mark.parametrize('mode', ['rolling', 'hirschberg'])
+def test_edit_distance_modes_match_full_table(mode):
+    for a, b in pairs(2):
+        result = run_dp('edit_distance', {'a': a, 'b': b}, mode, Deadline())
+        assert result['distance'] == edit_table(a, b)
+        if mode == 'hirschberg':
+            assert apply_script(a, b, result['operations']) == b
+
+
+KERNEL_MODES = [mode for mode in ('bitparallel', 'wavefront') if mode != 'wavefront' or HAVE_NUMPY]
+
+
+@pytest.mark.parametrize('algorithm, reference', [('lcs', lcs_table), ('edit_distance', edit_table)])
+def test_kernels_match_full_table(algorithm, reference):
+    field = 'length' if algorithm == 'lcs' else 'distance'
+    for a, b in pairs(3):
+        for mode in DP_ALGORITHMS[algorithm][1]:
+            if mode in KERNEL_MODES:
+                assert run_dp(algorithm, {'a': a, 'b': b}, mode, Deadline())[field] == reference(a, b)
+
+
+def test_bitparallel_handles_long_strings():
+    rng = random.Random(13)
+    a = ''.join(rng.choice('ACGT') for _ in range(300))
+    b = ''.join(rng.choice('ACGT') for _ in range(250))
+    assert run_dp('lcs', {'a': a, 'b': b}, 'bitparallel', Deadline())['length'] == lcs_table(a, b)
+    assert run_dp('edit_distance', {'a': a, 'b': b}, 'bitparallel', Deadline())['distance'] == edit_table(a, b)
+
+
+def test_lps_modes_agree():
+    rng = random.Random(3)
+    for _ in range(30):
+        s = ''.join(rng.choice('ab') for _ in range(rng.randint(0, 60)))
+        expected = lcs_table(s, s[::-1])
+        assert run_dp('lps', {'s': s}, 'rolling', Deadline())['length'] == expected
+        for mode in KERNEL_MODES:
+            assert run_dp('lps', {'s': s}, mode, Deadline())['length'] == expected
+
+
+def test_verify_reruns_the_rolling_baseline():
+    result = run_dp('lcs', {'a': 'AGGTAB', 'b': 'GXTXAYB', 'verify': True}, 'bitparallel', Deadline())
+    assert result['length'] == 4 and result['verification']['identical']
+
+
+def test_coin_change_min_coins():
+    for coins in ([3, 7, 11], [4, 6], [17, 40]):
+        result = run_dp('coin_change', {'coins': coins, 'amount': 200}, 'rolling', Deadline())
+        assert result['min_coins'] == fewest_coins(coins, 200)[200]
+
+
+def test_coin_change_ways():
+    result = run_dp('coin_change', {'coins': [1, 2, 5], 'amount': 11, 'objective': 'ways'}, 'rolling', Deadline())
+    assert result['ways'] == 11
+
+
+def test_knapsack_01_matches_brute_force():
+    rng = random.Random(4)
+    for _ in range(20):
+        weights = [rng.randint(0, 12) for _ in range(rng.randint(0, 8))]
+        values = [rng.randint(0, 30) for _ in weights]
+        capacity = rng.randint(0, 40)
+        best = max(sum(v for v, keep in zip(values, mask) if keep)
+                   for mask in itertools.product((0, 1), repeat=len(weights))
+                   if sum(w for w, keep in zip(weights, mask) if keep) <= capacity)
+        data = {'weights': weights, 'values': values, 'capacity': capacity}
+        assert run_dp('knapsack_01', data, 'rolling', Deadline())['max_value'] == best
+
+
+def test_dp_route(client):
+    response = client.post('/api/run/dp/edit_distance', json={'a': 'kitten', 'b': 'sitting', 'mode': 'hirschberg'})
+    assert response.status_code == 200 and response.json['distance'] == 3
+    assert client.post('/api/run/dp/lcs', json={'a': 'ab', 'b': 1}).status_code == 400
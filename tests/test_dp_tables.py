@@ -0,0 +1,128 @@
+from array import array
+
+import pytest
+
+from engines import dp_tables
+from engines.cache import MemoryBackend, ResultCache, SqliteBackend
+from engines.dp_tables import DPTableStore, coin_change, fib, knapsack_unbounded
+from engines.steps import Deadline, ExecutionTimeout
+
+
+def fewest_coins(coins, amount):
+    best = [0] + [None] * amount
+    for x in range(1, amount + 1):
+        options = [best[x - c] for c in coins if c <= x and best[x - c] is not None]
+        best[x] = min(options) + 1 if options else None
+    return best
+
+
+def fibs(count):
+    values = [0, 1]
+    while len(values) < count:
+        values.append(values[-1] + values[-2])
+    return values
+
+
+def test_coin_table_extends_to_the_same_values():
+    params = {'coins': [4, 9, 20]}
+    expected = fewest_coins(params['coins'], 500)
+    table, value, computed = coin_change(None, 100, params, Deadline())
+    assert value == expected[100] and computed == 100
+    table, value, computed = coin_change(table, 500, params, Deadline())
+    assert computed == 400
+    assert [v if v != 2 ** 31 - 2 else None for v in table] == expected
+
+
+def test_coin_table_block_sweep_matches_cell_sweep():
+    # Coins at or above BLOCK_SWEEP_MIN_COIN take the slice path
+    params = {'coins': [17, 40, 97]}
+    _, value, _ = coin_change(None, 3000, params, Deadline())
+    assert value == fewest_coins(params['coins'], 3000)[3000]
+
+
+def test_coin_table_checks_deadline_with_large_coins(expired):
+    with pytest.raises(ExecutionTimeout):
+        coin_change(None, 10 ** 6, {'coins': [65536, 65537]}, expired)
+
+
+def test_knapsack_unbounded_matches_brute_force():
+    items = [[3, 5], [4, 7], [10, 16]]
+    best = [0] * 101
+    for c in range(101):
+        best[c] = max([best[c - w] + v for w, v in items if w <= c] + [0])
+    table, value, _ = knapsack_unbounded(None, 100, {'items': items}, Deadline())
+    assert value == best[100]
+    assert list(table) == best
+    assert isinstance(table, array)
+
+
+@pytest.mark.parametrize('mod', [None, 1000003])
+def test_fib_tables_extend(mod):
+    expected = fibs(10001)
+    table, value, _ = fib(None, 5000, {'mod': mod}, Deadline())
+    assert value == (expected[5000] if mod is None else expected[5000] % mod)
+    _, value, _ = fib(table, 10000, {'mod': mod}, Deadline())
+    assert value == (expected[10000] if mod is None else expected[10000] % mod)
+
+
+def test_store_reuses_and_extends_tables():
+    store = DPTableStore(ResultCache(MemoryBackend(1 << 20)))
+    params = {'coins': [3, 5]}
+    first = store.solve('coin_change', params, 100, Deadline())
+    second = store.solve('coin_change', params, 50, Deadline())
+    third = store.solve('coin_change', params, 200, Deadline())
+    assert not first['table']['hit'] and second['table']['cells_computed'] == 0
+    assert third['table']['covered_before'] == 101 and third['table']['cells_computed'] == 100
+    assert third['value'] == fewest_coins([3, 5], 200)[200]
+
+
+class CountdownDeadline:
+    """Times out on the given check"""
+
+    def __init__(self, checks):
+        self.checks = checks
+
+    def check(self, work):
+        self.checks -= 1
+        if not self.checks:
+            raise ExecutionTimeout(1, work)
+
+
+def test_memory_store_keeps_tables_unserialized():
+    store = DPTableStore(ResultCache(MemoryBackend(1 << 20)))
+    params = {'coins': [3, 5]}
+    store.solve('coin_change', params, 100, Deadline())
+    stored = next(iter(store.cache.backend.entries.values())).body
+    assert isinstance(stored, array)
+    assert store.solve('coin_change', params, 60, Deadline())['value'] == fewest_coins([3, 5], 60)[60]
+    store.solve('coin_change', params, 200, Deadline())
+    # The extension grew a copy; the table other requests may hold is unchanged
+    assert len(stored) == 101
+    assert store.cache.backend.bytes == 201 * stored.itemsize
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+@pytest.mark.parametrize('problem, params, target', [
+    ('coin_change', {'coins': [2, 7]}, 300000),
+    ('coin_change', {'coins': [300, 701]}, 300000),
+    ('fib', {'mod': 1000003}, 60000),
+    ('fib', {'mod': None}, 30000),
+])
+def test_store_keeps_cells_finished_before_timeout(monkeypatch, tmp_path, backend, problem, params, target):
+    monkeypatch.setattr(dp_tables, 'DEADLINE_CHECK_MASK', 0xFFF)
+    cache = SqliteBackend(str(tmp_path / 'tables.db'), 1 << 26) if backend == 'sqlite' else MemoryBackend(1 << 26)
+    store = DPTableStore(ResultCache(cache))
+    with pytest.raises(ExecutionTimeout):
+        store.solve(problem, params, target, CountdownDeadline(3))
+    result = store.solve(problem, params, target, Deadline())
+    assert 0 < result['table']['covered_before'] < target + 1
+    assert result['table']['cells_computed'] == target + 1 - result['table']['covered_before']
+    extend = dp_tables.TABLE_PROBLEMS[problem][0]
+    assert result['value'] == extend(None, target, params, Deadline())[1]
+
+
+def test_dp_tables_route(client):
+    first = client.post('/api/dp/tables/coin_change', json={'coins': [5, 3], 'amount': 7}).json
+    second = client.post('/api/dp/tables/coin_change', json={'coins': [3, 5], 'amount': 29}).json
+    assert (first['value'], second['value']) == (None, 7)
+    assert second['table']['hit'] and second['table']['reused_cells'] >= 8
@@ -0,0 +1,58 @@
+import random
+
+from engines.factor import factor_numbers, is_probable_prime
+from engines.sieve import BasePrimeTable
+from engines.steps import Deadline
+
+BASE = BasePrimeTable()
+
+
+def product(result):
+    n = 1
+    for factor in result['factors']:
+        n *= factor['prime'] ** factor['exponent']
+    for m in result['unfactored']:
+        n *= m
+    return n
+
+
+def test_factorization_is_complete_and_prime():
+    rng = random.Random(5)
+    numbers = [1, 2, 4096, 2 ** 61 - 1, 600851475143] + [rng.randrange(2, 10 ** 15) for _ in range(100)]
+    for result in factor_numbers(numbers, BASE, Deadline()):
+        assert result['complete'] and product(result) == result['n']
+        assert all(is_probable_prime(f['prime']) for f in result['factors'])
+
+
+def test_method_belongs_to_the_split_that_found_the_prime():
+    [cube] = factor_numbers([1000003 ** 3], BASE, Deadline())
+    assert cube['factors'] == [dict(cube['factors'][0], prime=1000003, exponent=3, method='pollard_rho_brent')]
+    [square] = factor_numbers([1000003 ** 2], BASE, Deadline())
+    assert square['factors'][0]['method'] == 'perfect_square'
+    [mixed] = factor_numbers([2 ** 5 * 999983], BASE, Deadline())
+    assert [(f['prime'], f['method']) for f in mixed['factors']] == [(2, 'trial_division'),
+                                                                     (999983, 'miller_rabin')]
+
+
+def test_timeout_lists_only_composite_cofactors(expired):
+    n = (10 ** 19 + 51) * (10 ** 20 + 39) * 1000003 * 999983
+    [result] = factor_numbers([n], BASE, expired)
+    assert not result['complete']
+    assert product(result) == n
+    assert result['unfactored'] and not any(is_probable_prime(m) for m in result['unfactored'])
+
+
+def test_miller_rabin():
+    assert [n for n in range(100) if is_probable_prime(n)] == [n for n in range(2, 100)
+                                                               if all(n % d for d in range(2, n))]
+    assert not is_probable_prime(3215031751)  # strong pseudoprime to bases 2, 3, 5 and 7
+    assert is_probable_prime(2 ** 127 - 1)
+
+
+def test_prime_factorization_route(client):
+    response = client.post('/api/run/math/prime_factorization', json={'n': 1000003 ** 3})
+    assert response.status_code == 200 and response.json['complete']
+    assert response.json['factors'][0]['method'] == 'pollard_rho_brent'
+    big = client.post('/api/run/math/prime_factorization', json={'numbers': [str(2 ** 89 - 1), 12]}).json
+    assert big['results'][0]['factors'][0]['prime'] == str(2 ** 89 - 1)
+    assert client.post('/api/run/math/prime_factorization', json={'n': 0}).status_code == 400
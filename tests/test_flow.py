@@ -0,0 +1,59 @@
+import random
+from array import array
+
+import pytest
+
+from engines.flow import FLOW_METHODS, max_flow
+from engines.graph import EdgeList, build_csr
+
+# The textbook network (CLRS figure 26.1): maximum flow 23
+CLRS = [(0, 1, 16), (0, 2, 13), (1, 3, 12), (2, 1, 4), (2, 4, 14), (3, 2, 9), (3, 5, 20), (4, 3, 7), (4, 5, 4)]
+
+
+def network(vertices, edges):
+    edges = EdgeList(vertices, array('i', [e[0] for e in edges]), array('i', [e[1] for e in edges]),
+                     array('d', [e[2] for e in edges]))
+    return build_csr(edges, directed=True)
+
+
+@pytest.mark.parametrize('method', FLOW_METHODS)
+def test_max_flow_known_network(method):
+    result = max_flow(network(6, CLRS), {'source': 0, 'sink': 5, 'method': method})
+    assert result['max_flow'] == 23
+    capacity = {(u, v): c for u, v, c in CLRS}
+    assert sum(capacity[tuple(e)] for e in result['min_cut_edges']) == 23
+
+
+def test_flow_methods_agree_and_conserve():
+    rng = random.Random(7)
+    for _ in range(30):
+        edges = [(rng.randrange(12), rng.randrange(12), rng.randrange(1, 20)) for _ in range(40)]
+        graph = network(12, edges)
+        flows = set()
+        for method in FLOW_METHODS:
+            result = max_flow(graph, {'source': 0, 'sink': 11, 'method': method})
+            net = [0] * 12
+            for (u, v, c), f in zip(edges, result['edge_flows']):
+                assert 0 <= f <= c
+                net[u] -= f
+                net[v] += f
+            assert net[0] == -result['max_flow'] and net[11] == result['max_flow']
+            assert not any(net[1:11])
+            flows.add(result['max_flow'])
+        assert len(flows) == 1
+
+
+def test_flow_rejects_bad_requests():
+    graph = network(3, [(0, 1, 1), (1, 2, -1)])
+    with pytest.raises(ValueError):
+        max_flow(graph, {'source': 0, 'sink': 0})
+    with pytest.raises(ValueError):
+        max_flow(graph, {'source': 0, 'sink': 2, 'method': 'simplex'})
+    with pytest.raises(ValueError):
+        max_flow(graph, {'source': 0, 'sink': 2})
+
+
+def test_maximum_flow_route(client):
+    body = {'vertices': 6, 'edges': [list(e) for e in CLRS], 'source': 0, 'sink': 5, 'method': 'dinic'}
+    response = client.post('/api/run/graph/maximum_flow', json=body)
+    assert response.status_code == 200 and response.json['max_flow'] == 23
@@ -0,0 +1,42 @@
+import pytest
+
+from engines.grid import GRID_ALGORITHMS, Grid, run_grid_search
+
+MAZE = ['.....',
+        '.###.',
+        '...#.',
+        '.#...']
+
+
+def search(algorithm, **options):
+    grid = Grid.from_rows(MAZE)
+    return run_grid_search(algorithm, grid, grid.cell([0, 0], 'start'), grid.cell([3, 4], 'end'), **options)
+
+
+@pytest.mark.parametrize('algorithm', GRID_ALGORITHMS)
+def test_every_search_reaches_the_goal(algorithm):
+    result = search(algorithm)
+    assert result['found'] and result['path'][0] == [0, 0] and result['path'][-1] == [3, 4]
+    if algorithm != 'dfs':
+        assert result['path_length'] == 7
+
+
+def test_visited_list_is_capped():
+    full = search('bfs')
+    capped = search('bfs', max_visited=3)
+    assert capped['visited'] == full['visited'][:3] and capped['visited_truncated']
+    assert not full['visited_truncated'] and capped['visited_count'] == full['visited_count']
+    assert 'visited' not in search('bfs', include_visited=False)
+
+
+def test_pathfinding_route_caps_visited(client):
+    from app import app
+    limit = app.config['MAX_VISITED_CELLS']
+    app.config['MAX_VISITED_CELLS'] = 5
+    try:
+        body = {'rows': ['.' * 50] * 50, 'start': [0, 0], 'end': [49, 49]}
+        response = client.post('/api/run/pathfinding/bfs', json=body)
+    finally:
+        app.config['MAX_VISITED_CELLS'] = limit
+    assert response.status_code == 200
+    assert len(response.json['visited']) == 5 and response.json['visited_truncated']
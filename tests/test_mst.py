@@ -0,0 +1,69 @@
+import itertools
+import math
+import random
+from array import array
+
+import pytest
+
+from engines.graph import EdgeList
+from engines.mst import MST_ALGORITHMS, run_mst
+from engines.steps import Deadline
+
+
+def edge_list(vertices, edges):
+    return EdgeList(vertices, array('i', [e[0] for e in edges]), array('i', [e[1] for e in edges]),
+                    array('d', [e[2] for e in edges]))
+
+
+def random_edges(rng, vertices, count, weights=range(1, 20)):
+    return [(rng.randrange(vertices), rng.randrange(vertices), rng.choice(weights)) for _ in range(count)]
+
+
+def brute_force_forest_weight(vertices, edges):
+    """Lightest acyclic subset of maximum size, by exhaustive search"""
+    def acyclic(chosen):
+        parent = list(range(vertices))
+
+        def find(x):
+            while parent[x] != x:
+                x = parent[x]
+            return x
+        for u, v, _ in chosen:
+            ru, rv = find(u), find(v)
+            if ru == rv:
+                return None
+            parent[ru] = rv
+        return True
+
+    for size in range(vertices - 1, -1, -1):
+        weights = [sum(e[2] for e in chosen) for chosen in itertools.combinations(edges, size) if acyclic(chosen)]
+        if weights:
+            return min(weights)
+
+
+@pytest.mark.parametrize('algorithm', MST_ALGORITHMS)
+def test_mst_matches_brute_force(algorithm):
+    rng = random.Random(8)
+    for _ in range(25):
+        edges = random_edges(rng, 6, 9, weights=[1, 2, 2, 3, 5])
+        result = run_mst(algorithm, edge_list(6, edges), Deadline())
+        assert result['total_weight'] == brute_force_forest_weight(6, edges)
+        assert result['tree_edges'] + result['components'] == 6
+
+
+def test_mst_algorithms_agree_on_larger_graphs():
+    rng = random.Random(9)
+    edges = random_edges(rng, 500, 3000, weights=range(100))
+    totals = {run_mst(a, edge_list(500, edges), Deadline())['total_weight'] for a in MST_ALGORITHMS}
+    assert len(totals) == 1
+
+
+def test_mst_rejects_nan_weights():
+    with pytest.raises(ValueError):
+        run_mst('kruskal', edge_list(2, [(0, 1, math.nan)]), Deadline())
+
+
+def test_minimum_spanning_tree_route(client):
+    body = {'vertices': 4, 'edges': [[0, 1, 1], [1, 2, 2], [2, 3, 1], [0, 3, 5], [0, 2, 2]]}
+    response = client.post('/api/run/pathfinding/kruskal', json=body)
+    assert response.status_code == 200 and response.json['total_weight'] == 4
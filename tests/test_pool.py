@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from engines.pool import call_before
+from engines.sorting import run_sort
+from engines.steps import ExecutionTimeout
+
+
+def test_call_before_passes_the_remaining_budget():
+    result = call_before(run_sort, ('quick', [3, 1, 2]), 1000, time.time() + 1)
+    assert result['sorted'] == [1, 2, 3]
+
+
+def test_call_before_refuses_after_expiry():
+    with pytest.raises(ExecutionTimeout) as caught:
+        call_before(run_sort, ('quick', [3, 1, 2]), 1000, time.time() - 1)
+    assert caught.value.timeout_ms == 1000
+
+
+def test_call_before_stops_a_running_task_at_expiry():
+    started = time.perf_counter()
+    with pytest.raises(ExecutionTimeout) as caught:
+        call_before(run_sort, ('bubble', list(range(3000, 0, -1))), 5000, time.time() + 0.05)
+    assert time.perf_counter() - started < 1
+    assert caught.value.timeout_ms == 5000 and caught.value.steps > 0
+
+
+def test_compare_route(client):
+    body = {'category': 'sorting', 'algorithms': ['quick', 'merge'], 'array': [5, 2, 9, 1]}
+    response = client.post('/api/compare', json=body)
+    assert response.status_code == 200
+    assert response.json['consistent'] and response.json['output'] == [1, 2, 5, 9]
+    assert set(response.json['results']) == {'quick', 'merge'}
+
+
+def test_compare_route_reports_runs_past_the_shared_deadline(client):
+    from app import app
+    timeout = app.config['ALGORITHM_TIMEOUT']
+    app.config['ALGORITHM_TIMEOUT'] = 50
+    try:
+        body = {'category': 'sorting', 'algorithms': ['bubble', 'selection'], 'array': list(range(3000, 0, -1))}
+        started = time.perf_counter()
+        response = client.post('/api/compare', json=body)
+    finally:
+        app.config['ALGORITHM_TIMEOUT'] = timeout
+    assert response.status_code == 200
+    assert all(result.get('timed_out') for result in response.json['results'].values())
+    assert time.perf_counter() - started < 10
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from engines import sieve
+from engines.sieve import BasePrimeTable, count_primes, prime_batches, simple_sieve
+from engines.steps import Deadline, ExecutionTimeout
+
+BASE = BasePrimeTable()
+
+
+def is_prime(n):
+    return n > 1 and all(n % p for p in range(2, int(n ** 0.5) + 1))
+
+
+@pytest.mark.parametrize('lo, hi', [(0, 0), (0, 2), (2, 2), (0, 100), (14, 14), (90, 97), (98, 100)])
+def test_count_small_ranges(lo, hi):
+    assert count_primes(lo, hi, BASE, Deadline())['count'] == sum(map(is_prime, range(lo, hi + 1)))
+
+
+def test_count_across_segment_boundaries():
+    boundary = 2 * sieve.SEGMENT_ODDS
+    lo, hi = boundary - 5000, 2 * boundary + 5000
+    # The unsegmented sieve is the reference
+    expected = [p for p in simple_sieve(hi) if p >= lo]
+    result = count_primes(lo, hi, BASE, Deadline(), sample=5)
+    assert result['count'] == len(expected)
+    assert result['primes'] == expected[:5]
+
+
+def test_simple_sieve_and_batches_agree():
+    primes = list(simple_sieve(10 ** 5))
+    assert len(primes) == 9592
+    assert [p for batch in prime_batches(0, 10 ** 5 + 1, BASE.primes(317), Deadline()) for p in batch] == primes
+
+
+def test_parallel_chunks_match_serial(monkeypatch):
+    monkeypatch.setattr(sieve, 'PARALLEL_MIN_SPAN', 1 << 18)
+    with ThreadPoolExecutor(2) as pool:
+        result = count_primes(10 ** 6, 3 * 10 ** 6, BASE, Deadline(), pool=pool, workers=2)
+    assert result['chunks'] > 1
+    assert result['count'] == count_primes(10 ** 6, 3 * 10 ** 6, BASE, Deadline())['count']
+
+
+def test_sieve_timeout(expired):
+    with pytest.raises(ExecutionTimeout):
+        count_primes(0, 10 ** 8, BASE, expired)
+
+
+def test_base_prime_table_grows_and_reuses():
+    table = BasePrimeTable(100)
+    assert list(table.primes(30)) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert len(table.primes(1000)) == 168
+    assert table.stats()['extensions'] == 1 and table.stats()['hits'] == 1
+
+
+def test_prime_sieve_route(client):
+    response = client.post('/api/run/math/prime_sieve', json={'lo': 0, 'hi': 100, 'primes': 3, 'parallel': False})
+    assert response.status_code == 200
+    assert response.json['count'] == 25 and response.json['primes'] == [2, 3, 5]
+    assert client.post('/api/run/math/prime_sieve', json={'hi': 100, 'parallel': 'no'}).status_code == 400
+    assert client.post('/api/run/math/prime_sieve', json={'lo': 10, 'hi': 5}).status_code == 400
+
+
+def test_prime_sieve_refuses_spans_that_cannot_finish(client, monkeypatch):
+    monkeypatch.setitem(client.application.config, 'MAX_SIEVE_SPAN_PER_WORKER', 1000)
+    monkeypatch.setitem(client.application.config, 'COMPARE_WORKERS', 2)
+    serial = client.post('/api/run/math/prime_sieve', json={'lo': 0, 'hi': 1000, 'parallel': False})
+    assert serial.status_code == 400 and 'at most 1000' in serial.json['error']
+    assert client.post('/api/run/math/prime_sieve', json={'lo': 1, 'hi': 1000, 'parallel': False}).status_code == 200
+    assert client.post('/api/math/prime_sieve/stream', json={'lo': 0, 'hi': 1000}).status_code == 400
+    # Each worker takes a share of the span
+    assert client.post('/api/run/math/prime_sieve', json={'lo': 0, 'hi': 1999, 'parallel': True}).status_code == 200
+    assert client.post('/api/run/math/prime_sieve', json={'lo': 0, 'hi': 2000, 'parallel': True}).status_code == 400
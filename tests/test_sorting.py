@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from engines.sorting import SORTING_ALGORITHMS, run_sort, sort_steps
+from engines.steps import COMPARE, run_steps
+
+
+def inputs():
+    rng = random.Random(12)
+    yield []
+    yield [4]
+    yield [2, 2, 2]
+    yield list(range(50))
+    yield list(range(50, 0, -1))
+    for _ in range(20):
+        yield [rng.randint(-100, 100) for _ in range(rng.randint(2, 80))]
+
+
+@pytest.mark.parametrize('algorithm', SORTING_ALGORITHMS)
+def test_every_sort_matches_sorted(algorithm):
+    for values in inputs():
+        assert run_sort(algorithm, values)['sorted'] == sorted(values)
+
+
+@pytest.mark.parametrize('algorithm', SORTING_ALGORITHMS)
+def test_input_is_not_mutated(algorithm):
+    values = [3, 1, 2]
+    run_sort(algorithm, values)
+    assert values == [3, 1, 2]
+
+
+def test_counters():
+    ordered = run_sort('bubble', list(range(10)))
+    assert (ordered['comparisons'], ordered['swaps']) == (9, 0)
+    reversed_ = run_sort('bubble', list(range(10, 0, -1)))
+    assert reversed_['swaps'] == 45
+    assert run_sort('counting', [5, 3, 5, 1])['writes'] == 4
+    _, counts, _ = run_steps(sort_steps('insertion', [1, 2, 3]))
+    assert counts[COMPARE] == 2
+
+
+def test_bucket_sort_handles_floats():
+    values = [0.5, -1.25, 3.0, 0.5, 2.75]
+    assert run_sort('bucket', values)['sorted'] == sorted(values)
+
+
+@pytest.mark.parametrize('algorithm', ['counting', 'radix'])
+def test_integer_sorts_reject_floats(algorithm):
+    with pytest.raises(ValueError):
+        run_sort(algorithm, [1.5, 2])
@@ -0,0 +1,36 @@
+import pytest
+
+from engines.sandbox import STATUS_OK, STATUS_STEP_BUDGET, run_sandboxed
+from engines.steps import PLACE, StepBudgetExceeded, run_steps
+
+
+def emit(count):
+    for i in range(count):
+        yield (PLACE, i, i)
+    return 'done'
+
+
+def test_run_steps_allows_exactly_max_steps():
+    result, counts, _ = run_steps(emit(100), max_steps=100)
+    assert result == 'done' and counts[PLACE] == 100
+
+
+def test_run_steps_rejects_one_step_more():
+    with pytest.raises(StepBudgetExceeded) as caught:
+        run_steps(emit(101), max_steps=100)
+    assert caught.value.counts[PLACE] == 100
+
+
+def sandboxed(values, max_steps):
+    return run_sandboxed('sorting', 'bubble', {'array': values}, timeout_ms=10000, max_steps=max_steps,
+                         max_memory_mb=512, max_array_size=10000)
+
+
+def test_sandbox_reports_the_run():
+    outcome = sandboxed([3, 1, 2], 100)
+    assert outcome['status'] == STATUS_OK and outcome['report']['sorted'] == [1, 2, 3]
+
+
+def test_sandbox_stops_at_the_step_budget():
+    outcome = sandboxed(list(range(200, 0, -1)), 50)
+    assert outcome['status'] == STATUS_STEP_BUDGET
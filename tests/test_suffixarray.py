@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from engines import suffixarray
+from engines.steps import Deadline, ExecutionTimeout
+from engines.suffixarray import lcp_array, suffix_array
+
+
+@pytest.mark.parametrize('length', [1, 50, 5000])
+def test_suffix_array_and_lcp(length, monkeypatch):
+    rng = random.Random(length)
+    text = bytes(rng.choice(b'ab') for _ in range(length))
+    expected = sorted(range(length), key=lambda i: text[i:])
+    for numpy_min in (10 ** 9, 1):
+        monkeypatch.setattr(suffixarray, 'NUMPY_MIN_LENGTH', numpy_min)
+        sa = suffix_array(text, Deadline())
+        assert list(sa) == expected
+    lcp = lcp_array(text, sa, Deadline())
+    for r in range(1, min(length, 200)):
+        a, b = text[sa[r - 1]:], text[sa[r]:]
+        assert a[:lcp[r]] == b[:lcp[r]] and a[lcp[r]:lcp[r] + 1] != b[lcp[r]:lcp[r] + 1]
+
+
+def test_suffix_array_timeout(expired):
+    with pytest.raises(ExecutionTimeout):
+        suffixarray._doubling_python(b'ab' * 100000, expired)
+
+
+def test_index_and_query_routes(client):
+    built = client.post('/api/string/suffix_array/index', json={'text': 'banana bandana'})
+    assert built.status_code in (200, 201)
+    handle = built.json['index']
+    queries = [{'type': 'find', 'pattern': 'ana'}, {'type': 'count', 'pattern': 'ban'}]
+    results = client.post(f'/api/string/suffix_array/index/{handle}/query', json={'queries': queries}).json['results']
+    assert sorted(results[0]['offsets']) == [1, 3, 11] and results[1]['count'] == 2
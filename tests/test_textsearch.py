@@ -0,0 +1,61 @@
+import json
+import random
+
+import pytest
+
+from engines import textsearch
+from engines.steps import Deadline
+from engines.textsearch import LARGE_TEXT_ALGORITHMS, find_all, scan_batches, z_algorithm
+
+
+def occurrences(text, pattern):
+    return [i for i in range(len(text) - len(pattern) + 1) if text[i:i + len(pattern)] == pattern]
+
+
+@pytest.mark.parametrize('matcher', list(LARGE_TEXT_ALGORITHMS.values()) + [find_all])
+@pytest.mark.parametrize('pattern', [b'a', b'aa', b'aba', b'abaab', b'bbbb'])
+def test_matchers_find_overlapping_occurrences(matcher, pattern):
+    rng = random.Random(7)
+    text = bytes(rng.choice(b'ab') for _ in range(3000))
+    assert list(matcher(text, pattern, Deadline())) == occurrences(text, pattern)
+
+
+def test_find_all_across_windows(monkeypatch):
+    monkeypatch.setattr(textsearch, 'WINDOW_BYTES', 16)
+    text = b'xyzxyz' * 20
+    assert list(find_all(text, b'zxyzx', Deadline())) == occurrences(text, b'zxyzx')
+
+
+def test_large_texts_are_scanned_with_find(monkeypatch):
+    monkeypatch.setattr(textsearch, 'PYTHON_SCAN_MAX_BYTES', 100)
+    text = b'ab' * 100
+    assert textsearch.choose_matcher('kmp', len(text)) == (find_all, 'find')
+    assert textsearch.choose_matcher('kmp', 100)[1] == 'python'
+    batches = list(scan_batches('kmp', text, b'bab', Deadline(), batch_size=50))
+    assert [len(b) for b in batches] == [50, 49]
+
+
+class CountingDeadline:
+    def __init__(self):
+        self.checked = []
+
+    def check(self, work):
+        self.checked.append(work)
+
+
+def test_z_algorithm_checks_deadline_inside_z_boxes(monkeypatch):
+    monkeypatch.setattr(textsearch, 'DEADLINE_CHECK_MASK', 0xF)
+    # Positions not at a multiple of 5 lie inside a Z-box and are skipped
+    text = b'abcde' * 40
+    deadline = CountingDeadline()
+    assert len(list(z_algorithm(text, b'abcde', deadline))) == 40
+    assert deadline.checked == list(range(0, len(text) - 4, 16))
+
+
+def test_large_text_search_route(client, monkeypatch):
+    monkeypatch.setattr(textsearch, 'PYTHON_SCAN_MAX_BYTES', 1000)
+    for size, backend in [(600, 'python'), (6000, 'find')]:
+        response = client.post('/api/string/boyer_moore/search?pattern=aba', data=b'ab' * (size // 2))
+        lines = [json.loads(line) for line in response.data.splitlines()]
+        assert sum(len(line.get('matches', [])) for line in lines[:-1]) == size // 2 - 1
+        assert lines[-1]['done'] and lines[-1]['backend'] == backend
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.mark.parametrize('query, body', [
+    ('', {'format': 'xml'}),
+    ('', {'format': ['json']}),
+    ('?format=JSON', {}),
+])
+def test_trace_rejects_unknown_formats(client, query, body):
+    response = client.post('/api/trace/sorting/bubble' + query, json=dict(body, array=[3, 1, 2]))
+    assert response.status_code == 400
+    assert response.get_json()['formats'] == ['binary', 'json']
+
+
+def test_trace_formats(client):
+    packed = client.post('/api/trace/sorting/bubble', json={'array': [3, 1, 2]})
+    assert packed.status_code == 200 and packed.mimetype == 'application/octet-stream'
+    listed = client.post('/api/trace/sorting/bubble?format=json', json={'array': [3, 1, 2]})
+    assert listed.status_code == 200 and listed.get_json()['result']